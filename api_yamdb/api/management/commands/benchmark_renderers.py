@@ -0,0 +1,76 @@
+import io
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import resolve
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from api.v1 import renderers
+from reviews.models import Review
+
+PAGES = (
+    '/api/v1/titles/?limit={limit}',
+    '/api/v1/titles/{title_id}/reviews/?limit={limit}',
+    '/api/v1/titles/{title_id}/reviews/{review_id}/comments/?limit={limit}',
+    '/api/v1/genres/?limit={limit}',
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the renderers and parsers of the API with the JSON '
+        'ones of DRF on the pages of the stored data.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=100)
+        parser.add_argument('--repeat', type=int, default=200)
+
+    def handle(self, *args, **options):
+        review = Review.objects.values('pk', 'title_id').order_by('pk').first()
+        if review is None:
+            raise CommandError('No reviews stored, run import_csv first.')
+        pairs = [
+            (JSONRenderer(), JSONParser()),
+            (renderers.OrjsonRenderer(), renderers.OrjsonParser()),
+            (renderers.MessagePackRenderer(), renderers.MessagePackParser()),
+        ]
+        for page in PAGES:
+            url = page.format(
+                limit=options['limit'],
+                title_id=review['title_id'],
+                review_id=review['pk'],
+            )
+            data = self.get_data(url)
+            self.stdout.write(url)
+            for renderer, parser in pairs:
+                content = renderer.render(data)
+                render = self.measure(
+                    renderer.render, options['repeat'], data
+                )
+                parse = self.measure(
+                    lambda: parser.parse(io.BytesIO(content)),
+                    options['repeat'],
+                )
+                self.stdout.write(
+                    f'  {type(renderer).__name__}: {len(content)} bytes, '
+                    f'render {render:.0f} us, parse {parse:.0f} us'
+                )
+
+    def get_data(self, url):
+        """Data of a GET response of the endpoint, before rendering."""
+        path, _, _ = url.partition('?')
+        match = resolve(path)
+        response = match.func(APIRequestFactory().get(url), **match.kwargs)
+        return response.data
+
+    def measure(self, function, repeat, *args):
+        """Microseconds of a call, the best of the repeats."""
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function(*args)
+            best = min(best, time.perf_counter() - start)
+        return best * 1e6
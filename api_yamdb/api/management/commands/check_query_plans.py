@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.http import Http404
+
+from api.v1.query_plans import (
+    ALLOWED_SORTS,
+    find_problems,
+    get_endpoints,
+    get_page_queryset,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Show the query plans of the list endpoints and fail '
+        'on the table scans and temporary sorts.'
+    )
+
+    def handle(self, *args, **options):
+        failed = []
+        for endpoint, url in get_endpoints():
+            if url is None:
+                self.stdout.write(f'{endpoint}: skipped, no reviews stored')
+                continue
+            try:
+                plan = get_page_queryset(url).explain()
+            except Http404:
+                self.stdout.write(f'{endpoint}: skipped, not found')
+                continue
+            problems = find_problems(plan, endpoint in ALLOWED_SORTS)
+            if problems:
+                self.stdout.write(self.style.ERROR(endpoint))
+            elif endpoint in ALLOWED_SORTS:
+                self.stdout.write(self.style.WARNING(
+                    f'{endpoint}: {ALLOWED_SORTS[endpoint]}'
+                ))
+            else:
+                self.stdout.write(self.style.SUCCESS(endpoint))
+            if options['verbosity'] > 1 or problems:
+                self.stdout.write(plan)
+            if problems:
+                failed.append(endpoint)
+        if failed:
+            raise CommandError(
+                f'{len(failed)} endpoints scan tables or sort: '
+                + ', '.join(failed)
+            )
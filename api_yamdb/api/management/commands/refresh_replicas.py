@@ -0,0 +1,40 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api.replicas import refresh_replicas
+
+DEFAULT_INTERVAL = 5
+
+
+class Command(BaseCommand):
+    help = 'Copy the primary database over the replicas.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep refreshing the replicas instead of exiting.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=DEFAULT_INTERVAL,
+            help='Seconds between the refreshes with --loop, keep it '
+                 'shorter than REPLICA_STICKY_TIME.',
+        )
+
+    def handle(self, *args, **options):
+        if not settings.DATABASE_REPLICAS:
+            raise CommandError('DATABASE_REPLICAS is empty.')
+        while True:
+            started = time.perf_counter()
+            refresh_replicas()
+            self.stdout.write(
+                f'{len(settings.DATABASE_REPLICAS)} replicas refreshed in '
+                f'{time.perf_counter() - started:.2f} s'
+            )
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from api.v1.throttling import get_stats
+
+
+class Command(BaseCommand):
+    help = 'Show the requests allowed and rejected by the auth throttles.'
+
+    def handle(self, *args, **options):
+        for (scope, key_type), counters in get_stats().items():
+            self.stdout.write(
+                f'{scope} by {key_type}: {counters["allowed"]} allowed, '
+                f'{counters["rejected"]} rejected'
+            )
@@ -0,0 +1,72 @@
+"""
+Reads from the replica databases.
+
+Views with ReplicaReadMixin switch the reads of their safe requests
+to one of settings.DATABASE_REPLICAS, everything else reads from and
+writes to the primary. A replica lags behind by up to the interval of
+refresh_replicas, so a user who has just written reads the primary
+for REPLICA_STICKY_TIME seconds and sees the own changes. The time is
+kept in the primary database, whichever process serves the next read.
+
+The replicas are SQLite copies of the primary made with the backup API,
+any database kept in sync by other means fits the router as well.
+"""
+import random
+from contextvars import ContextVar
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils import timezone
+
+from api.v1.cache import REPLICAS_SCOPE, invalidate
+from users.models import PrimaryRead
+
+replica_reads = ContextVar('replica_reads', default=False)
+
+
+def stick_to_primary(user_id):
+    PrimaryRead.objects.using(DEFAULT_DB_ALIAS).update_or_create(
+        user_id=user_id,
+        defaults={'until': timezone.now() + timedelta(
+            seconds=settings.REPLICA_STICKY_TIME
+        )},
+    )
+
+
+def is_sticky(user_id):
+    return PrimaryRead.objects.using(DEFAULT_DB_ALIAS).filter(
+        user_id=user_id, until__gt=timezone.now()
+    ).exists()
+
+
+def refresh_replicas():
+    """Copy the primary database over every replica."""
+    source = connections[DEFAULT_DB_ALIAS]
+    source.ensure_connection()
+    for alias in settings.DATABASE_REPLICAS:
+        target = connections[alias]
+        target.ensure_connection()
+        source.connection.backup(target.connection)
+    # Responses read from the replicas before are outdated.
+    invalidate(REPLICAS_SCOPE)
+
+
+class ReplicaRouter:
+    """Sends the reads marked by replica_reads to a random replica."""
+
+    def db_for_read(self, model, **hints):
+        if replica_reads.get() and settings.DATABASE_REPLICAS:
+            return random.choice(settings.DATABASE_REPLICAS)
+        return None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replicas hold the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        # The replicas get the schema with the copy.
+        return db == DEFAULT_DB_ALIAS
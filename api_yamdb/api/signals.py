@@ -0,0 +1,119 @@
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_save, pre_delete
+)
+from django.dispatch import receiver
+
+from api.v1.authentication import mark_claims_changed
+from api.v1.cache import (
+    AUTHORS_SCOPE,
+    CATEGORIES_SCOPE,
+    GENRES_SCOPE,
+    comments_scope,
+    invalidate,
+    invalidate_titles,
+    reviews_scope,
+)
+from reviews.models import (
+    Category, Comment, Genre, GenreTitle, Review, Title
+)
+from users.models import UserYamDb
+
+
+def invalidate_on_commit(*scopes):
+    transaction.on_commit(lambda: [invalidate(scope) for scope in scopes])
+
+
+def mark_claims_changed_on_commit(user_id):
+    transaction.on_commit(lambda: mark_claims_changed(user_id))
+
+
+def invalidate_titles_on_commit(title_ids):
+    title_ids = list(title_ids)
+    transaction.on_commit(lambda: invalidate_titles(title_ids))
+
+
+@receiver(post_save, sender=Title)
+def title_saved(sender, instance, **kwargs):
+    invalidate_titles_on_commit([instance.pk])
+
+
+@receiver(post_delete, sender=Title)
+def title_deleted(sender, instance, **kwargs):
+    invalidate_titles_on_commit([instance.pk])
+    invalidate_on_commit(reviews_scope(instance.pk))
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def review_changed(sender, instance, **kwargs):
+    invalidate_titles_on_commit([instance.title_id])
+    invalidate_on_commit(
+        reviews_scope(instance.title_id), comments_scope(instance.pk)
+    )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(sender, instance, **kwargs):
+    invalidate_on_commit(comments_scope(instance.review_id))
+
+
+@receiver(post_save, sender=GenreTitle)
+@receiver(post_delete, sender=GenreTitle)
+def genre_title_changed(sender, instance, **kwargs):
+    invalidate_titles_on_commit([instance.title_id])
+
+
+@receiver(m2m_changed, sender=GenreTitle)
+def title_genres_changed(sender, instance, action, reverse, pk_set,
+                         **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        invalidate_titles_on_commit([instance.pk])
+    elif pk_set:
+        invalidate_titles_on_commit(pk_set)
+    else:
+        invalidate_titles_on_commit(
+            instance.title_genre.values_list('pk', flat=True)
+        )
+
+
+@receiver(post_save, sender=Genre)
+def genre_saved(sender, instance, **kwargs):
+    invalidate_titles_on_commit(
+        instance.title_genre.values_list('pk', flat=True)
+    )
+    invalidate_on_commit(GENRES_SCOPE)
+
+
+@receiver(post_delete, sender=Genre)
+def genre_deleted(sender, instance, **kwargs):
+    invalidate_on_commit(GENRES_SCOPE)
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def category_changed(sender, instance, **kwargs):
+    invalidate_titles_on_commit(
+        instance.title_category.values_list('pk', flat=True)
+    )
+    invalidate_on_commit(CATEGORIES_SCOPE)
+
+
+@receiver(post_save, sender=UserYamDb)
+def user_saved(sender, instance, created, **kwargs):
+    loaded_username = getattr(instance, '_loaded_username', None)
+    if not created and instance.username != loaded_username:
+        invalidate_on_commit(AUTHORS_SCOPE)
+    instance._loaded_username = instance.username
+    claims = instance.get_claims()
+    if not created and claims != getattr(instance, '_loaded_claims', None):
+        mark_claims_changed_on_commit(instance.pk)
+    instance._loaded_claims = claims
+
+
+@receiver(post_delete, sender=UserYamDb)
+def user_deleted(sender, instance, **kwargs):
+    mark_claims_changed_on_commit(instance.pk)
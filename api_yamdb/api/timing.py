@@ -0,0 +1,140 @@
+"""
+Timing of the requests.
+
+RequestTimingMiddleware counts the queries of every database and their
+time with execute wrappers, so DEBUG is not needed, and splits the rest
+of the request into:
+
+- view: the time the view spends outside SQL: authentication,
+  throttling, cache lookups, filtering, paging and serializing;
+- render: the time the renderer of a DRF response takes outside SQL.
+
+The figures go to the Server-Timing header and to a JSON line of the
+api.timing logger. REQUEST_TIMING_SAMPLE_RATE of the requests also log
+every query with its time.
+"""
+import json
+import logging
+import random
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+def to_ms(seconds):
+    return round(seconds * 1000, 3)
+
+
+class RequestTimer:
+    """Queries and times of a request, in seconds."""
+
+    def __init__(self, sampled=False):
+        self.start = time.perf_counter()
+        self.total = None
+        self.queries = 0
+        self.sql = 0.0
+        # Query list of a sampled request.
+        self.query_list = [] if sampled else None
+        # (clock, SQL time) at the start and the end of the view
+        # and at the end of the rendering.
+        self.marks = {}
+        self.spans = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.queries += 1
+            self.sql += duration
+            if self.query_list is not None:
+                self.query_list.append({
+                    'database': context['connection'].alias,
+                    'sql': sql,
+                    'ms': to_ms(duration),
+                })
+
+    def mark(self, name):
+        self.marks[name] = (time.perf_counter(), self.sql)
+
+    def get_span(self, start, end):
+        """Time between two marks without the SQL in between."""
+        if start not in self.marks or end not in self.marks:
+            return None
+        (start_clock, start_sql), (end_clock, end_sql) = (
+            self.marks[start], self.marks[end]
+        )
+        return (end_clock - start_clock) - (end_sql - start_sql)
+
+    def stop(self):
+        self.total = time.perf_counter() - self.start
+        self.spans = {
+            'view': self.get_span('view', 'view_end'),
+            'render': self.get_span('view_end', 'render_end'),
+        }
+
+    def get_header(self):
+        metrics = [f'db;dur={to_ms(self.sql)};desc="{self.queries} queries"']
+        metrics += [
+            f'{name};dur={to_ms(span)}'
+            for name, span in self.spans.items() if span is not None
+        ]
+        metrics.append(f'total;dur={to_ms(self.total)}')
+        return ', '.join(metrics)
+
+    def get_record(self, request, response):
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'queries': self.queries,
+            'db_ms': to_ms(self.sql),
+        }
+        for name, span in self.spans.items():
+            record[f'{name}_ms'] = None if span is None else to_ms(span)
+        record['total_ms'] = to_ms(self.total)
+        if self.query_list is not None:
+            record['query_list'] = self.query_list
+        return record
+
+
+class RequestTimingMiddleware:
+    """Server-Timing header and a log line for every request."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        rate = settings.REQUEST_TIMING_SAMPLE_RATE
+        timer = request.timer = RequestTimer(
+            sampled=bool(rate) and random.random() < rate
+        )
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+            response = self.get_response(request)
+        timer.stop()
+        response['Server-Timing'] = timer.get_header()
+        if logger.isEnabledFor(logging.INFO):
+            record = timer.get_record(request, response)
+            logger.info(
+                json.dumps(record, ensure_ascii=False),
+                extra={'timing': record},
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.timer.mark('view')
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered right after this hook.
+        request.timer.mark('view_end')
+        response.add_post_render_callback(
+            lambda response: request.timer.mark('render_end')
+        )
+        return response
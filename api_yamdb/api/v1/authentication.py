@@ -0,0 +1,78 @@
+import time
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from users.models import UserYamDb
+
+
+def get_claims_changed_key(user_id):
+    return f'auth:claims-changed:{user_id}'
+
+
+def mark_claims_changed(user_id):
+    """
+    Remember that the role or name of the user changed.
+    Tokens issued before are checked against the database
+    until the last of them expires.
+    """
+    cache.set(
+        get_claims_changed_key(user_id),
+        int(time.time()),
+        int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()) + 1,
+    )
+
+
+def claims_changed_since(user_id, issued_at):
+    changed = cache.get(get_claims_changed_key(user_id))
+    return changed is not None and changed >= issued_at
+
+
+class RoleAccessToken(AccessToken):
+    """Access token carrying the fields the permissions are checked on."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for field in UserYamDb.CLAIM_FIELDS:
+            token[field] = getattr(user, field)
+        return token
+
+
+class RoleTokenAuthentication(JWTAuthentication):
+    """
+    Builds request.user from the claims of the token without a query.
+    The other fields of the user are deferred and load on access.
+    Tokens without the claims, or issued before the user was changed,
+    are checked against the database.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if (
+            user_id is None
+            or any(
+                field not in validated_token
+                for field in UserYamDb.CLAIM_FIELDS
+            )
+            or claims_changed_since(user_id, validated_token['iat'])
+        ):
+            return super().get_user(validated_token)
+        known = {
+            field: validated_token[field] for field in UserYamDb.CLAIM_FIELDS
+        }
+        known[api_settings.USER_ID_FIELD] = user_id
+        known['is_active'] = True
+        # from_db() expects the values in the order of the model fields.
+        field_names = [
+            field.attname for field in UserYamDb._meta.concrete_fields
+            if field.attname in known
+        ]
+        return UserYamDb.from_db(
+            DEFAULT_DB_ALIAS,
+            field_names,
+            [known[name] for name in field_names],
+        )
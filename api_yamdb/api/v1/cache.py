@@ -0,0 +1,114 @@
+import time
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from rest_framework import status
+from rest_framework.response import Response
+
+from reviews.models import CacheGeneration
+
+TITLES_LIST_SCOPE = 'titles:list'
+CATEGORIES_SCOPE = 'categories'
+GENRES_SCOPE = 'genres'
+AUTHORS_SCOPE = 'authors'
+REPLICAS_SCOPE = 'replicas'
+IMPORTS_SCOPE = 'imports'
+
+
+def title_scope(title_id):
+    return f'titles:{title_id}'
+
+
+def reviews_scope(title_id):
+    return f'reviews:{title_id}'
+
+
+def comments_scope(review_id):
+    return f'comments:{review_id}'
+
+
+def get_generations(scopes):
+    """
+    Version stamps of the scopes: the time of their last change in
+    nanoseconds, 0 for the scopes never changed. Cached responses and
+    ETags of older generations are stale.
+    The stamps are read from the primary, the replicas may lag.
+    """
+    generations = dict(
+        CacheGeneration.objects.using(DEFAULT_DB_ALIAS).filter(
+            scope__in=scopes
+        ).values_list('scope', 'generation')
+    )
+    return [generations.get(scope, 0) for scope in scopes]
+
+
+def with_global_scopes(scopes):
+    """
+    The scopes, the one changed by each bulk import of import_csv
+    and the one changed by each refresh of the replicas while the reads
+    may come from them.
+    """
+    scopes = (*scopes, IMPORTS_SCOPE)
+    if settings.DATABASE_REPLICAS:
+        return (*scopes, REPLICAS_SCOPE)
+    return scopes
+
+
+def invalidate(scope):
+    """Move the scope to a new generation, later than any before."""
+    now = time.time_ns()
+    generations = CacheGeneration.objects.using(DEFAULT_DB_ALIAS)
+    updated = generations.filter(scope=scope).update(
+        generation=Greatest(F('generation') + 1, now)
+    )
+    if updated:
+        return
+    try:
+        with transaction.atomic(using=DEFAULT_DB_ALIAS):
+            generations.create(scope=scope, generation=now)
+    except IntegrityError:
+        # Created by a concurrent request.
+        invalidate(scope)
+
+
+def invalidate_titles(title_ids):
+    """Drop cached lists and the detail pages of the given works."""
+    invalidate(TITLES_LIST_SCOPE)
+    for title_id in set(title_ids):
+        invalidate(title_scope(title_id))
+
+
+def get_response_key(request, scope):
+    params = sorted(
+        (key, value)
+        for key, values in request.query_params.lists()
+        for value in values
+    )
+    location = f'{request.get_host()}{request.path}?{params}'
+    generations = ':'.join(
+        map(str, get_generations(with_global_scopes((scope,))))
+    )
+    return (
+        f'{scope}:{generations}:'
+        f'{md5(location.encode("utf-8")).hexdigest()}'
+    )
+
+
+def cached_response(request, scope, get_response, store=True):
+    """
+    Serve the request from the cache of the scope,
+    or build the response and keep its data for the next requests
+    unless store is false.
+    """
+    key = get_response_key(request, scope)
+    data = cache.get(key)
+    if data is not None:
+        return Response(data)
+    response = get_response()
+    if store and response.status_code == status.HTTP_200_OK:
+        cache.set(key, response.data, settings.TITLES_CACHE_TIMEOUT)
+    return response
@@ -0,0 +1,124 @@
+"""
+Model serializers with the field introspection and the representation
+worked out once per class.
+
+ModelSerializer.get_fields() inspects the model for every serializer
+instance; here its result is kept per class and every instance gets
+copies of the fields to bind. to_representation() walks the readable
+fields with a try/except and a None check per field and value; here
+a function doing just that for the fields of the class is generated
+on first use. The columns of the model are read straight from the
+attributes, the other fields keep their own get_attribute(). Mappings
+of validated data still go through the DRF implementation.
+"""
+import copy
+from collections import OrderedDict
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from rest_framework import relations, serializers
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
+
+# Fields whose copies would share bound children.
+DEEP_COPIED = (serializers.BaseSerializer, relations.ManyRelatedField)
+
+
+def is_column(field, model):
+    """Whether the field shows a concrete non-relation model field."""
+    if (
+        isinstance(field, (
+            serializers.BaseSerializer,
+            relations.RelatedField,
+            relations.ManyRelatedField,
+            serializers.SerializerMethodField,
+        ))
+        or field.source == '*'
+        or len(field.source_attrs) != 1
+        or not field.source_attrs[0].isidentifier()
+    ):
+        return False
+    try:
+        model_field = model._meta.get_field(field.source_attrs[0])
+    except FieldDoesNotExist:
+        return False
+    return model_field.concrete and not model_field.is_relation
+
+
+@lru_cache(maxsize=None)
+def compile_representation(layout):
+    """
+    Factory of the representation function for a layout:
+    (field name, attribute or None) per readable field.
+    """
+    lines = ['def make(fields):']
+    for index, (name, attribute) in enumerate(layout):
+        lines.append(f'    rep{index} = fields[{index}].to_representation')
+        if attribute is None:
+            lines.append(f'    get{index} = fields[{index}].get_attribute')
+    lines += ['    def to_representation(instance):', '        ret = {}']
+    for index, (name, attribute) in enumerate(layout):
+        if attribute is not None:
+            lines += [
+                f'        value = instance.{attribute}',
+                f'        ret[{name!r}] = '
+                f'None if value is None else rep{index}(value)',
+            ]
+            continue
+        lines += [
+            '        try:',
+            f'            value = get{index}(instance)',
+            '        except SkipField:',
+            '            pass',
+            '        else:',
+            '            check = (',
+            '                value.pk if isinstance(value, PKOnlyObject)',
+            '                else value',
+            '            )',
+            f'            ret[{name!r}] = '
+            f'None if check is None else rep{index}(value)',
+        ]
+    lines += ['        return ret', '    return to_representation']
+    namespace = {'SkipField': SkipField, 'PKOnlyObject': PKOnlyObject}
+    exec('\n'.join(lines), namespace)
+    return namespace['make']
+
+
+class CompiledModelSerializer(serializers.ModelSerializer):
+    """ModelSerializer with the fields and representation cached."""
+    _fields_by_class = {}
+
+    def get_fields(self):
+        cls = type(self)
+        fields = self._fields_by_class.get(cls)
+        if fields is None:
+            fields = self._fields_by_class[cls] = super().get_fields()
+        return OrderedDict(
+            (
+                name,
+                copy.deepcopy(field) if isinstance(field, DEEP_COPIED)
+                else copy.copy(field),
+            )
+            for name, field in fields.items()
+        )
+
+    def to_representation(self, instance):
+        if not isinstance(instance, models.Model):
+            # Validated data of an unsaved serializer.
+            return super().to_representation(instance)
+        represent = self.__dict__.get('_compiled_representation')
+        if represent is None:
+            fields = list(self._readable_fields)
+            model = self.Meta.model
+            layout = tuple(
+                (
+                    field.field_name,
+                    field.source_attrs[0] if is_column(field, model)
+                    else None,
+                )
+                for field in fields
+            )
+            represent = compile_representation(layout)(fields)
+            self._compiled_representation = represent
+        return represent(instance)
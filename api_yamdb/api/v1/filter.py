@@ -1,6 +1,24 @@
+import re
+
 import django_filters
+from django.db import connection
+from django.db.models import Q
+from django_filters.constants import EMPTY_VALUES
+from rest_framework.filters import BaseFilterBackend, SearchFilter
+
+from reviews.models import Genre, Title, normalize_name
+
+# Sorts after any other character, a prefix match becomes
+# the index range [prefix, prefix + PREFIX_END).
+PREFIX_END = '\U0010ffff'
 
-from reviews.models import Title
+
+class NormalizedNameFilter(django_filters.CharFilter):
+    """Exact match of a name compared in the normalized form."""
+    def filter(self, qs, value):
+        if value in EMPTY_VALUES:
+            return qs
+        return super().filter(qs, normalize_name(value))
 
 
 class TitleFilters(django_filters.FilterSet):
@@ -9,15 +27,102 @@ class TitleFilters(django_filters.FilterSet):
         field_name='category__slug',
         lookup_expr='iexact',
     )
+    genre = django_filters.CharFilter(method='filter_genre')
+    name = NormalizedNameFilter(
+        field_name='name_normalized',
+        lookup_expr='exact',
+    )
+
+    class Meta:
+        model = Title
+        fields = ('name', 'year', 'genre', 'category')
+
+    def filter_genre(self, queryset, name, value):
+        """
+        The slug is compared case-insensitively in a subquery,
+        so the links of the genre are searched by their index
+        instead of checking the slug of every link.
+        """
+        return queryset.filter(
+            genre__in=Genre.objects.filter(slug__iexact=value)
+        )
+
+
+class TopTitleFilters(django_filters.FilterSet):
+    """Filtration of the leaderboard, by the category kept in the ranking."""
+    category = django_filters.CharFilter(
+        field_name='ranking__category__slug',
+    )
     genre = django_filters.CharFilter(
         field_name='genre__slug',
-        lookup_expr='iexact',
-    )
-    name = django_filters.CharFilter(
-        field_name='name',
-        lookup_expr='iexact',
     )
 
     class Meta:
         model = Title
-        fields = ('name', 'year', 'genre', 'category')
+        fields = ('genre', 'category')
+
+
+class TitleSearchFilter(BaseFilterBackend):
+    """
+    Relevance search over names and descriptions of works.
+    On SQLite it uses the FTS5 index and orders by bm25,
+    matches in the name weigh more than in the description.
+    """
+    search_param = 'search'
+    name_weight = 10.0
+    description_weight = 1.0
+
+    def get_terms(self, request):
+        query = request.query_params.get(self.search_param, '')
+        query = query.replace('ё', 'е').replace('Ё', 'Е')
+        return re.findall(r'\w+', query)
+
+    def filter_queryset(self, request, queryset, view):
+        if self.search_param not in request.query_params:
+            return queryset
+        terms = self.get_terms(request)
+        if not terms:
+            return queryset.none()
+        if connection.vendor != 'sqlite':
+            for term in terms:
+                queryset = queryset.filter(
+                    Q(name__icontains=term) | Q(description__icontains=term)
+                )
+            return queryset
+        # Every term is quoted, so user input is never parsed
+        # as FTS5 syntax, and matched as a prefix.
+        match = ' '.join(f'"{term}"*' for term in terms)
+        return queryset.extra(
+            tables=['reviews_title_fts'],
+            where=[
+                'reviews_title_fts.rowid = reviews_title.id',
+                'reviews_title_fts MATCH %s',
+            ],
+            params=[match],
+            select={
+                'search_rank': 'bm25(reviews_title_fts, %s, %s)',
+            },
+            select_params=[self.name_weight, self.description_weight],
+            order_by=['search_rank'],
+        )
+
+
+class NormalizedNameSearchFilter(SearchFilter):
+    """
+    Search by the beginning of a name, in any case.
+    The query is compared with the normalized columns in search_fields
+    as an index range instead of LIKE.
+    """
+    def filter_queryset(self, request, queryset, view):
+        search_fields = self.get_search_fields(view, request)
+        query = request.query_params.get(self.search_param, '').strip()
+        if not search_fields or not query:
+            return queryset
+        prefix = normalize_name(query)
+        conditions = Q()
+        for field in search_fields:
+            conditions |= Q(**{
+                f'{field}__gte': prefix,
+                f'{field}__lt': prefix + PREFIX_END,
+            })
+        return queryset.filter(conditions)
@@ -1,10 +1,161 @@
-from rest_framework import viewsets, mixins
-from rest_framework.filters import SearchFilter
+from functools import partial
 
+from django.conf import settings
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import status, viewsets, mixins
+from rest_framework.permissions import SAFE_METHODS
+
+from api.replicas import is_sticky, replica_reads, stick_to_primary
+from api.v1.cache import (
+    TITLES_LIST_SCOPE,
+    cached_response,
+    get_generations,
+    title_scope,
+    with_global_scopes,
+)
+from api.v1.filter import NormalizedNameSearchFilter
+from api.v1.optimization import optimize_queryset
 from api.v1.permissions import (IsAdminOrReadOnly,)
 
 
+class OptimizedQuerysetMixin:
+    """
+    Loads the relations used by the serializer together with the objects.
+    Columns are limited with only() for read requests.
+    """
+    def filter_queryset(self, queryset):
+        return optimize_queryset(
+            super().filter_queryset(queryset),
+            self.get_serializer_class(),
+            restrict_fields=self.request.method in SAFE_METHODS,
+        )
+
+
+class FastReadMixin:
+    """
+    Serves the list action with fast_read_serializer_class,
+    from values_list() rows, while settings.FAST_READ_SERIALIZERS is on.
+    """
+    fast_read_serializer_class = None
+
+    def use_fast_read(self):
+        return (
+            settings.FAST_READ_SERIALIZERS
+            and self.action == 'list'
+            and self.fast_read_serializer_class is not None
+        )
+
+    def get_serializer(self, *args, **kwargs):
+        if self.use_fast_read():
+            return self.fast_read_serializer_class(*args, **kwargs)
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.use_fast_read():
+            return self.fast_read_serializer_class.get_rows(queryset)
+        return queryset
+
+
+class ReplicaReadMixin:
+    """
+    Reads of the safe requests go to the replicas,
+    unless the user has written a moment ago.
+    """
+    def dispatch(self, request, *args, **kwargs):
+        token = replica_reads.set(False)
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            replica_reads.reset(token)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if not settings.DATABASE_REPLICAS:
+            return
+        user_id = request.user.pk
+        if request.method not in SAFE_METHODS:
+            if user_id is not None:
+                stick_to_primary(user_id)
+        elif user_id is None or not is_sticky(user_id):
+            replica_reads.set(True)
+
+
+class ConditionalListMixin:
+    """
+    Answers list requests with 304 Not Modified
+    while the version stamps of the resource stay the same.
+    """
+    version_scopes = ()
+
+    def get_version_scopes(self):
+        return self.version_scopes
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        scopes = self.get_version_scopes()
+        if not scopes:
+            return handler(request, *args, **kwargs)
+        generations = get_generations(with_global_scopes(scopes))
+        etag = '"{}-{}"'.format(
+            '-'.join(map(str, generations)),
+            request.accepted_renderer.format,
+        )
+        last_modified = max(generations) // 10 ** 9
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (
+            status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED
+        ):
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+
+class ConditionalGetMixin(ConditionalListMixin):
+    """Conditional GET for both list and detail requests."""
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class CachedTitleResponseMixin:
+    """
+    Serves title lists and details from the response cache.
+    Entries are dropped by the signal handlers in api.signals.
+    Responses read from a replica are not kept: the replica may miss
+    a change the current generation of the scope already includes.
+    """
+    def list(self, request, *args, **kwargs):
+        return cached_response(
+            request,
+            TITLES_LIST_SCOPE,
+            partial(super().list, request, *args, **kwargs),
+            store=not replica_reads.get(),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return cached_response(
+            request,
+            title_scope(kwargs[self.lookup_field]),
+            partial(super().retrieve, request, *args, **kwargs),
+            store=not replica_reads.get(),
+        )
+
+
 class CreateListDestroyMixin(
+    ReplicaReadMixin,
+    ConditionalListMixin,
+    OptimizedQuerysetMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     mixins.DestroyModelMixin,
@@ -12,6 +163,6 @@ class CreateListDestroyMixin(
 ):
     """Custom mixin for Create, List, Delete operations"""
     permission_classes = (IsAdminOrReadOnly,)
-    filter_backends = (SearchFilter,)
-    search_fields = ('name',)
+    filter_backends = (NormalizedNameSearchFilter,)
+    search_fields = ('name_normalized',)
     lookup_field = 'slug'
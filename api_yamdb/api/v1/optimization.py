@@ -0,0 +1,124 @@
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import relations, serializers
+
+
+class QueryPlan:
+    """
+    Relations and columns a serializer reads from a model.
+    Built once per serializer class and applied to every queryset.
+    """
+    def __init__(self, model):
+        self.model = model
+        self.select_related = []
+        self.prefetch_related = []
+        self.only = []
+        self.exact = True
+
+    def apply(self, queryset, restrict_fields=True):
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        for path, plan in self.prefetch_related:
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    path,
+                    queryset=plan.apply(plan.model._default_manager.all()),
+                )
+            )
+        if restrict_fields and self.exact:
+            queryset = queryset.only(*self.only)
+        return queryset
+
+
+def get_model_field(field, model):
+    """Model field behind a serializer field, None for anything else."""
+    if (
+        field.source == '*'
+        or len(field.source_attrs) != 1
+        or isinstance(field, serializers.SerializerMethodField)
+    ):
+        return None
+    try:
+        return model._meta.get_field(field.source_attrs[0])
+    except FieldDoesNotExist:
+        return None
+
+
+def collect_fields(serializer, model, plan, prefix=''):
+    """Walk the readable serializer fields and record what they touch."""
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        model_field = get_model_field(field, model)
+        if model_field is None:
+            plan.exact = False
+            continue
+        path = prefix + model_field.name
+        if not model_field.is_relation:
+            plan.only.append(path)
+        elif model_field.many_to_many or model_field.one_to_many:
+            plan.prefetch_related.append(
+                (path, collect_related(field, model_field))
+            )
+        else:
+            collect_single_related(field, model_field, plan, path)
+
+
+def collect_single_related(field, model_field, plan, path):
+    """Record a forward foreign key or a one-to-one relation."""
+    if isinstance(field, serializers.BaseSerializer):
+        plan.select_related.append(path)
+        plan.only.append(path)
+        collect_fields(field, model_field.related_model, plan, f'{path}__')
+    elif isinstance(field, relations.SlugRelatedField):
+        plan.select_related.append(path)
+        plan.only.extend((path, f'{path}__{field.slug_field}'))
+    elif isinstance(field, relations.PrimaryKeyRelatedField):
+        plan.only.append(path)
+    else:
+        plan.select_related.append(path)
+        plan.exact = False
+
+
+def collect_related(field, model_field):
+    """Plan for the queryset of a to-many relation."""
+    plan = QueryPlan(model_field.related_model)
+    if model_field.one_to_many:
+        plan.only.append(model_field.field.name)
+    if isinstance(field, serializers.ListSerializer):
+        collect_fields(field.child, plan.model, plan)
+    elif isinstance(field, relations.ManyRelatedField):
+        child = field.child_relation
+        if isinstance(child, relations.SlugRelatedField):
+            plan.only.append(child.slug_field)
+        elif not isinstance(child, relations.PrimaryKeyRelatedField):
+            plan.exact = False
+    else:
+        plan.exact = False
+    return plan
+
+
+@lru_cache(maxsize=None)
+def get_query_plan(serializer_class):
+    serializer = serializer_class()
+    plan = QueryPlan(serializer.Meta.model)
+    # Foreign keys are cheap to load and are read by related managers
+    # and signal handlers even when the serializer does not show them.
+    plan.only.extend(
+        field.name for field in plan.model._meta.concrete_fields
+        if field.is_relation
+    )
+    collect_fields(serializer, plan.model, plan)
+    return plan
+
+
+def optimize_queryset(queryset, serializer_class, restrict_fields=True):
+    """
+    Add the select_related, prefetch_related and only() calls
+    the serializer needs to render a page in a constant number of queries.
+    """
+    if not hasattr(getattr(serializer_class, 'Meta', None), 'model'):
+        return queryset
+    return get_query_plan(serializer_class).apply(queryset, restrict_fields)
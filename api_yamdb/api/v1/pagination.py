@@ -0,0 +1,149 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from functools import reduce
+from operator import and_, or_
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class CursorLimitOffsetPagination(LimitOffsetPagination):
+    """
+    Limit/offset pagination with an opt-in keyset mode.
+    Passing the cursor parameter (empty for the first page) switches
+    the request to keyset pages ordered by the view's cursor_ordering,
+    without COUNT(*) and without scanning the skipped rows.
+    """
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_ordering = getattr(view, 'cursor_ordering', None)
+        self.use_cursor = bool(
+            self.cursor_ordering
+            and self.cursor_query_param in request.query_params
+        )
+        if not self.use_cursor:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.limit = self.get_limit(request)
+        position, reverse = self.decode_cursor(request, queryset)
+        queryset = queryset.order_by(*self.get_ordering(reverse))
+        if position is not None:
+            queryset = queryset.filter(
+                self.get_keyset_filter(position, reverse)
+            )
+        page = list(queryset[:self.limit + 1])
+        has_more = len(page) > self.limit
+        page = page[:self.limit]
+        if reverse:
+            page.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, position is not None
+        self.next_position = None
+        self.previous_position = None
+        if has_next:
+            self.next_position = (
+                self.get_position(page[-1]) if page else position
+            )
+        if has_previous:
+            self.previous_position = (
+                self.get_position(page[0]) if page else position
+            )
+        return page
+
+    def get_paginated_response(self, data):
+        if not self.use_cursor:
+            return super().get_paginated_response(data)
+        return Response({
+            'next': self.get_cursor_link(self.next_position, False),
+            'previous': self.get_cursor_link(self.previous_position, True),
+            'results': data,
+        })
+
+    def get_ordering(self, reverse):
+        ordering = []
+        for field in self.cursor_ordering:
+            descending = field.startswith('-')
+            if descending == reverse:
+                ordering.append(field.lstrip('-'))
+            else:
+                ordering.append('-' + field.lstrip('-'))
+        return ordering
+
+    def get_keyset_filter(self, position, reverse):
+        """Rows strictly after the position in the requested direction."""
+        conditions = []
+        for index, field in enumerate(self.get_ordering(reverse)):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            equal = [
+                Q(**{prev.lstrip('-'): value})
+                for prev, value in zip(self.cursor_ordering[:index], position)
+            ]
+            conditions.append(reduce(
+                and_, equal, Q(**{f'{name}__{lookup}': position[index]})
+            ))
+        return reduce(or_, conditions)
+
+    def get_position(self, instance):
+        position = []
+        for field in self.cursor_ordering:
+            value = getattr(instance, field.lstrip('-'))
+            if hasattr(value, 'isoformat'):
+                value = value.isoformat()
+            position.append(value)
+        return position
+
+    def get_field(self, queryset, name):
+        """Model field or annotation the ordering field reads."""
+        annotation = queryset.query.annotations.get(name)
+        if annotation is not None:
+            return annotation.output_field
+        return queryset.model._meta.get_field(name)
+
+    def decode_cursor(self, request, queryset):
+        encoded = request.query_params[self.cursor_query_param]
+        if not encoded:
+            return None, False
+        try:
+            cursor = json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+            position, reverse = cursor['p'], bool(cursor['r'])
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if (
+            not isinstance(position, list)
+            or len(position) != len(self.cursor_ordering)
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            position = [
+                self.get_field(queryset, field.lstrip('-')).to_python(value)
+                for field, value in zip(self.cursor_ordering, position)
+            ]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        if None in position:
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def encode_cursor(self, position, reverse):
+        cursor = json.dumps({'p': position, 'r': int(reverse)})
+        return urlsafe_b64encode(cursor.encode('utf-8')).decode('ascii')
+
+    def get_cursor_link(self, position, reverse):
+        if position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.offset_query_param)
+        return replace_query_param(
+            url,
+            self.cursor_query_param,
+            self.encode_cursor(position, reverse),
+        )
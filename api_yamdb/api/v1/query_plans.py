@@ -0,0 +1,95 @@
+"""
+Query plans of the list endpoints.
+
+Every endpoint is resolved to its view and the queryset of its page is
+built the way a GET request would build it, then SQLite is asked for
+EXPLAIN QUERY PLAN. A scan of a table without an index or an index
+that does not cover the ORDER BY (USE TEMP B-TREE) grows with the table
+and is reported. An ordered walk over an index (SCAN ... USING INDEX)
+stops after the page and is fine.
+"""
+import re
+from urllib.parse import parse_qs
+
+from django.urls import resolve
+from rest_framework.test import APIRequestFactory
+
+from reviews.models import Review
+
+ENDPOINTS = (
+    '/api/v1/categories/',
+    '/api/v1/categories/?search=фильм',
+    '/api/v1/genres/',
+    '/api/v1/genres/?search=драма',
+    '/api/v1/titles/',
+    '/api/v1/titles/?cursor=',
+    '/api/v1/titles/?year=2000',
+    '/api/v1/titles/?name=матрица',
+    '/api/v1/titles/?genre=drama',
+    '/api/v1/titles/?category=movie',
+    '/api/v1/titles/?search=матрица',
+    '/api/v1/titles/top/',
+    '/api/v1/titles/top/?category=movie',
+    '/api/v1/titles/top/?genre=drama',
+    '/api/v1/titles/trending/',
+    '/api/v1/titles/{title_id}/similar/',
+    '/api/v1/titles/{title_id}/reviews/',
+    '/api/v1/titles/{title_id}/reviews/?cursor=',
+    '/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+    '/api/v1/titles/{title_id}/reviews/{review_id}/comments/?cursor=',
+    '/api/v1/users/',
+    '/api/v1/users/?search=admin',
+)
+# Sorting is expected where the filter picks a bounded set of rows.
+ALLOWED_SORTS = {
+    '/api/v1/categories/?search=фильм': 'sorts the prefix matches',
+    '/api/v1/genres/?search=драма': 'sorts the prefix matches',
+    '/api/v1/titles/?name=матрица': 'sorts the works of one name',
+    '/api/v1/titles/?genre=drama': 'sorts the works of one genre',
+    '/api/v1/titles/?search=матрица': 'sorts the full-text matches',
+    '/api/v1/titles/top/?genre=drama': 'sorts the works of one genre',
+}
+SCAN = re.compile(r'\bSCAN (TABLE )?\w+$')
+SORT = re.compile(r'\bUSE TEMP B-TREE FOR (ORDER BY|GROUP BY|DISTINCT)')
+
+
+def get_endpoints():
+    """The endpoints with the ids of a stored review and its work."""
+    review = Review.objects.values('pk', 'title_id').order_by('pk').first()
+    for endpoint in ENDPOINTS:
+        if '{' in endpoint and review is None:
+            yield endpoint, None
+        elif review is None:
+            yield endpoint, endpoint
+        else:
+            yield endpoint, endpoint.format(
+                title_id=review['title_id'], review_id=review['pk']
+            )
+
+
+def get_page_queryset(url):
+    """Queryset of the first page of a GET request to the list endpoint."""
+    path, _, query = url.partition('?')
+    match = resolve(path)
+    view = match.func.cls(**match.func.initkwargs)
+    view.action_map = match.func.actions
+    view.args = ()
+    view.kwargs = match.kwargs
+    view.format_kwarg = None
+    view.request = view.initialize_request(APIRequestFactory().get(url))
+    queryset = view.filter_queryset(view.get_queryset())
+    paginator = view.paginator
+    if paginator is None:
+        return queryset
+    if 'cursor' in parse_qs(query, keep_blank_values=True):
+        queryset = queryset.order_by(*view.cursor_ordering)
+    return queryset[:paginator.get_limit(view.request) or paginator.max_limit]
+
+
+def find_problems(plan, allow_sort=False):
+    """Lines of an EXPLAIN QUERY PLAN output that grow with the tables."""
+    problems = (SCAN,) if allow_sort else (SCAN, SORT)
+    return [
+        line.strip() for line in plan.splitlines()
+        if any(problem.search(line.strip()) for problem in problems)
+    ]
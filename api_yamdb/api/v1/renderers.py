@@ -0,0 +1,165 @@
+"""
+Renderers and parsers of the API.
+
+OrjsonRenderer writes the same bytes as the JSONRenderer of DRF with
+orjson: datetimes, decimals, lazy strings and the rest of what orjson
+does not know natively go through the encoder of DRF. orjson writes
+some floats differently from json (1e+16 as 1e16, 2.5e-05 as 0.000025),
+such output and whatever orjson refuses (integers over 64 bits, keys
+that are not strings, surrogates) is rendered by JSONRenderer instead.
+So is data with NaN or an infinity, orjson writes them as null while
+JSONRenderer refuses them. Pretty printed responses are left to
+JSONRenderer too.
+
+MessagePack is negotiated with Accept: application/msgpack and sent
+with Content-Type: application/msgpack.
+"""
+import re
+
+import msgpack
+import orjson
+from django.conf import settings
+from rest_framework import parsers, renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.utils import encoders, json
+
+OPTIONS = (
+    orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+)
+# orjson output of the floats json writes differently: exponents after
+# a digit and the numbers from 0.00001 to 0.0001 written out in full.
+EXPONENT = re.compile(rb'e[-1-9]')
+SMALL_FLOAT = re.compile(rb'0\.0000')
+DIGITS = frozenset(b'0123456789')
+FLOAT_STARTS = frozenset(b':,[-')
+# orjson reads the integers out of 64 bits as floats, json as integers.
+# Digits are translated to zeros to find runs of them.
+ZEROS = bytes(48 if byte in DIGITS else 32 for byte in range(256))
+LONG_INTEGER = b'0' * 19
+# Skipped at once by the search for NaN and the infinities.
+SCALARS = frozenset((str, int, bool, type(None)))
+# JSONRenderer escapes them to keep the output a subset of JavaScript.
+LINE_SEPARATOR = re.compile(b'\xe2\x80[\xa8\xa9]')
+
+default = encoders.JSONEncoder().default
+
+
+def has_json_floats(content):
+    """Whether orjson wrote a float json would have written otherwise."""
+    for match in EXPONENT.finditer(content):
+        start = match.start()
+        if start and content[start - 1] in DIGITS:
+            return True
+    for match in SMALL_FLOAT.finditer(content):
+        start = match.start()
+        if not start or content[start - 1] in FLOAT_STARTS:
+            return True
+    return False
+
+
+def has_non_finite_floats(data):
+    """Whether the data holds NaN or an infinity."""
+    values = [data]
+    pop, extend = values.pop, values.extend
+    while values:
+        value = pop()
+        if type(value) in SCALARS:
+            continue
+        if isinstance(value, float):
+            # NaN and the infinities give NaN, the other floats 0.
+            if value - value:
+                return True
+        elif isinstance(value, dict):
+            extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            extend(value)
+    return False
+
+
+class OrjsonRenderer(renderers.JSONRenderer):
+    """JSONRenderer with the compact output written by orjson."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            data is None
+            or self.ensure_ascii or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+        try:
+            ret = orjson.dumps(data, default=default, option=OPTIONS)
+        except orjson.JSONEncodeError:
+            ret = None
+        if (
+            ret is None or has_json_floats(ret)
+            or b'null' in ret and has_non_finite_floats(data)
+        ):
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+        if LINE_SEPARATOR.search(ret):
+            ret = ret.replace(
+                b'\xe2\x80\xa8', b'\\u2028'
+            ).replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class OrjsonParser(parsers.JSONParser):
+    """
+    JSONParser reading UTF-8 bodies with orjson.
+    The bodies orjson rejects or may read differently are parsed by json
+    for the same data or the same errors.
+    """
+    renderer_class = OrjsonRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        content = stream.read()
+        if (
+            encoding.lower().replace('_', '-') in ('utf-8', 'utf8')
+            and LONG_INTEGER not in content.translate(ZEROS)
+        ):
+            try:
+                return orjson.loads(content)
+            except orjson.JSONDecodeError:
+                pass
+        try:
+            parse_constant = json.strict_constant if self.strict else None
+            return json.loads(
+                content.decode(encoding), parse_constant=parse_constant
+            )
+        except ValueError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
+
+
+class MessagePackRenderer(renderers.BaseRenderer):
+    """
+    MessagePack for the internal clients.
+    Dates and decimals are strings and floats as in JSON.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=default, use_bin_type=True)
+
+
+class MessagePackParser(parsers.BaseParser):
+    """Parses MessagePack bodies."""
+    media_type = 'application/msgpack'
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(
+                stream.read(), raw=False, strict_map_key=False
+            )
+        except (ValueError, TypeError) as exc:
+            raise ParseError('MessagePack parse error - %s' % str(exc))
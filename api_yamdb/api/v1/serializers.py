@@ -1,28 +1,32 @@
 from django.conf import settings
 from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 from rest_framework import serializers
 
+from api.v1.compiled import CompiledModelSerializer
 from users.validators import validate_username
+from reviews.content_similarity import refresh_content_neighbours
 from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.trending import current_score
 from users.models import UserYamDb
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(CompiledModelSerializer):
     """A serializer for the Category model."""
     class Meta:
-        exclude = ('id',)
+        fields = ('name', 'slug')
         model = Category
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(CompiledModelSerializer):
     """Serializer for the Genre model."""
     class Meta:
-        exclude = ('id',)
+        fields = ('name', 'slug')
         model = Genre
 
 
-class TitleReadSerializer(serializers.ModelSerializer):
+class TitleReadSerializer(CompiledModelSerializer):
     """
     Serializer for the Title model.
     For read operations only.
@@ -44,7 +48,43 @@ class TitleReadSerializer(serializers.ModelSerializer):
         )
 
 
-class TitleWriteSerializer(serializers.ModelSerializer):
+class TopTitleSerializer(TitleReadSerializer):
+    """
+    Serializer for the leaderboard of works.
+    Adds the Bayesian weighted rating the works are ranked by.
+    """
+    weighted_rating = serializers.FloatField(read_only=True)
+
+    class Meta(TitleReadSerializer.Meta):
+        fields = TitleReadSerializer.Meta.fields + ('weighted_rating',)
+
+
+class TrendingTitleSerializer(TitleReadSerializer):
+    """
+    Serializer for the trending works.
+    Adds the decayed review activity the works are ranked by.
+    """
+    trend_score = serializers.SerializerMethodField()
+
+    class Meta(TitleReadSerializer.Meta):
+        fields = TitleReadSerializer.Meta.fields + ('trend_score',)
+
+    def get_trend_score(self, title):
+        return round(current_score(title.trend_log_score), 6)
+
+
+class SimilarTitleSerializer(TitleReadSerializer):
+    """
+    Serializer for the works recommended next to a work.
+    Adds the similarity the works are ordered by.
+    """
+    similarity = serializers.FloatField(read_only=True)
+
+    class Meta(TitleReadSerializer.Meta):
+        fields = TitleReadSerializer.Meta.fields + ('similarity',)
+
+
+class TitleWriteSerializer(CompiledModelSerializer):
     """
     Serializer for the Title model.
     For write operations only.
@@ -65,12 +105,23 @@ class TitleWriteSerializer(serializers.ModelSerializer):
             'name', 'year', 'description', 'genre', 'category'
         )
 
+    def save(self, **kwargs):
+        """
+        Genres are set after the post_save signal,
+        so the content neighbours are refreshed here. The cache
+        scopes the signals bump on commit cover them too.
+        """
+        with transaction.atomic():
+            title = super().save(**kwargs)
+            refresh_content_neighbours(title.pk)
+        return title
+
     def to_representation(self, title):
         serializer = TitleReadSerializer(title)
         return serializer.data
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(CompiledModelSerializer):
     """A serializer for the Review model."""
     author = serializers.SlugRelatedField(
         slug_field='username',
@@ -100,7 +151,7 @@ class ReviewSerializer(serializers.ModelSerializer):
         return data
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(CompiledModelSerializer):
     """A serializer for the Comment model."""
     author = serializers.SlugRelatedField(
         slug_field='username',
@@ -147,7 +198,7 @@ class TokenSerializer(serializers.Serializer):
         )
 
 
-class UserYamDbSerializer(serializers.ModelSerializer):
+class UserYamDbSerializer(CompiledModelSerializer):
     """Serializer for working with the user model."""
     class Meta:
         model = UserYamDb
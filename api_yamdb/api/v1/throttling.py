@@ -0,0 +1,155 @@
+import logging
+import time
+from contextlib import contextmanager
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from rest_framework.throttling import BaseThrottle
+
+logger = logging.getLogger(__name__)
+
+DURATIONS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 60 * 60 * 24}
+OUTCOMES = ('allowed', 'rejected')
+# Seconds a bucket lock is held at most. A request finding the lock
+# taken is rejected at once and told to retry after them.
+LOCK_TIMEOUT = 1
+
+# Used when the shared store is not configured or fails.
+fallback_cache = LocMemCache('throttle-fallback', {})
+
+
+def parse_rate(rate):
+    """'5/min' -> bucket of 5 tokens refilled at 5 tokens per 60 seconds."""
+    count, period = rate.split('/')
+    return int(count), DURATIONS[period[0]]
+
+
+def get_cache():
+    alias = settings.THROTTLE_CACHE
+    if alias not in settings.CACHES:
+        return fallback_cache
+    return caches[alias]
+
+
+def cache_call(method, *args):
+    """Call the shared store, falling back to local memory on errors."""
+    try:
+        return getattr(get_cache(), method)(*args)
+    except Exception:
+        logger.warning('Throttle store failed, using local memory.',
+                       exc_info=True)
+        return getattr(fallback_cache, method)(*args)
+
+
+@contextmanager
+def bucket_lock(bucket_key):
+    """
+    Hold the lock of a bucket, yields whether it was acquired.
+    add() is atomic, so one request at a time reads and writes the
+    bucket; the others do not wait for it. The lock expires by itself
+    if its holder dies.
+    """
+    lock_key = f'{bucket_key}:lock'
+    if not cache_call('add', lock_key, 1, LOCK_TIMEOUT):
+        yield False
+        return
+    try:
+        yield True
+    finally:
+        cache_call('delete', lock_key)
+
+
+def get_stats_key(scope, key_type, outcome):
+    return f'throttle:stats:{scope}:{key_type}:{outcome}'
+
+
+def count(scope, key_type, outcome):
+    key = get_stats_key(scope, key_type, outcome)
+    cache_call('add', key, 0, None)
+    try:
+        cache_call('incr', key)
+    except ValueError:
+        # The counter was evicted between add() and incr().
+        cache_call('set', key, 1, None)
+
+
+def get_stats():
+    """Allowed and rejected requests per endpoint and key type."""
+    stats = {}
+    for scope, buckets in settings.THROTTLE_BUCKETS.items():
+        for key_type in buckets:
+            stats[(scope, key_type)] = {
+                outcome: cache_call(
+                    'get', get_stats_key(scope, key_type, outcome), 0
+                )
+                for outcome in OUTCOMES
+            }
+    return stats
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Token buckets per client key for the endpoint's throttle_scope.
+    THROTTLE_BUCKETS sets a rate for every key type of the scope:
+    'ip' is the client address, other key types are request fields.
+    A request takes a token from each bucket and is rejected
+    when one of them is empty. The client address is REMOTE_ADDR, or
+    the X-Forwarded-For entry of the last of NUM_PROXIES proxies.
+    """
+
+    def get_key(self, request, key_type):
+        if key_type == 'ip':
+            return self.get_ident(request)
+        value = request.data.get(key_type)
+        if not isinstance(value, str) or not value:
+            return None
+        return value.strip().lower()
+
+    def take_token(self, bucket_key, rate):
+        """Take a token, returns the seconds until one is available."""
+        capacity, duration = parse_rate(rate)
+        refill = capacity / duration
+        with bucket_lock(bucket_key) as locked:
+            if not locked:
+                # Another request of the key is being counted.
+                return LOCK_TIMEOUT
+            now = time.time()
+            tokens, updated = cache_call(
+                'get', bucket_key, (capacity, now)
+            )
+            tokens = min(capacity, tokens + (now - updated) * refill)
+            wait = 0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / refill
+            cache_call('set', bucket_key, (tokens, now), duration)
+        return wait
+
+    def allow_request(self, request, view):
+        scope = getattr(view, 'throttle_scope', None)
+        buckets = settings.THROTTLE_BUCKETS.get(scope, {})
+        self.wait_time = 0
+        for key_type, rate in buckets.items():
+            key = self.get_key(request, key_type)
+            if key is None:
+                continue
+            # Hashed, the fields may be long or hold any characters.
+            digest = md5(key.encode('utf-8')).hexdigest()
+            wait = self.take_token(
+                f'throttle:{scope}:{key_type}:{digest}', rate
+            )
+            if wait:
+                self.wait_time = wait
+                count(scope, key_type, 'rejected')
+                logger.info(
+                    'Throttled %s by %s %s', scope, key_type, digest
+                )
+                return False
+            count(scope, key_type, 'allowed')
+        return True
+
+    def wait(self):
+        return self.wait_time
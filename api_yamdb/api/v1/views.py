@@ -1,8 +1,8 @@
 from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
-from django.db.models import Avg
+from django.db.models import F
 from django_filters.rest_framework import DjangoFilterBackend
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from rest_framework.decorators import action
 from rest_framework.permissions import (
@@ -13,10 +13,32 @@ from rest_framework import status, viewsets
 from rest_framework.filters import SearchFilter
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import AccessToken
 
-from api.v1.filter import TitleFilters
-from api.v1.mixins import CreateListDestroyMixin
+from api.v1.authentication import RoleAccessToken
+from api.v1.fast_serializers import (
+    CommentRowSerializer,
+    ReviewRowSerializer,
+    TitleRowSerializer,
+)
+from api.v1.filter import TitleFilters, TitleSearchFilter, TopTitleFilters
+from api.v1.cache import (
+    AUTHORS_SCOPE,
+    CATEGORIES_SCOPE,
+    GENRES_SCOPE,
+    TITLES_LIST_SCOPE,
+    comments_scope,
+    reviews_scope,
+    title_scope,
+)
+from api.v1.mixins import (
+    CachedTitleResponseMixin,
+    ConditionalGetMixin,
+    CreateListDestroyMixin,
+    FastReadMixin,
+    OptimizedQuerysetMixin,
+    ReplicaReadMixin,
+)
+from api.v1.pagination import CursorLimitOffsetPagination
 from api.v1.permissions import (
     IsAdmin,
     IsAdminOrReadOnly,
@@ -29,13 +51,17 @@ from api.v1.serializers import (
     GenreSerializer,
     ReviewSerializer,
     TitleReadSerializer,
+    SimilarTitleSerializer,
     TitleWriteSerializer,
     TokenSerializer,
+    TopTitleSerializer,
+    TrendingTitleSerializer,
     UpdateUserYamDbSerializer,
     UserYamDbSerializer,
 )
-from reviews.models import Category, Genre, Review, Title
-from users.models import UserYamDb
+from api.v1.throttling import TokenBucketThrottle
+from reviews.models import Category, Genre, Review, SimilarTitle, Title
+from users.models import OutgoingEmail, UserYamDb
 
 
 class CategoryViewSet(CreateListDestroyMixin):
@@ -45,6 +71,7 @@ class CategoryViewSet(CreateListDestroyMixin):
     """
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    version_scopes = (CATEGORIES_SCOPE,)
 
 
 class GenreViewSet(CreateListDestroyMixin):
@@ -54,31 +81,128 @@ class GenreViewSet(CreateListDestroyMixin):
     """
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    version_scopes = (GENRES_SCOPE,)
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(
+    ReplicaReadMixin,
+    FastReadMixin,
+    ConditionalGetMixin,
+    CachedTitleResponseMixin,
+    OptimizedQuerysetMixin,
+    viewsets.ModelViewSet,
+):
     """
     Title model representation.
     Processes all requests taking into account access rights.
     """
-    queryset = Title.objects.all().annotate(rating=Avg('reviews__score'))
+    queryset = Title.objects.all()
+    fast_read_serializer_class = TitleRowSerializer
     permission_classes = (IsAdminOrReadOnly,)
-    filter_backends = (DjangoFilterBackend,)
+    filter_backends = (DjangoFilterBackend, TitleSearchFilter)
     filterset_class = TitleFilters
+    pagination_class = CursorLimitOffsetPagination
+    cursor_ordering = ('year', 'name', 'id')
     http_method_names = ('get', 'post', 'patch', 'delete')
 
+    def get_queryset(self):
+        if self.action == 'top':
+            return Title.objects.filter(ranking__isnull=False).annotate(
+                weighted_rating=F('ranking__weighted_rating')
+            ).order_by('-weighted_rating', 'id')
+        if self.action == 'trending':
+            return Title.objects.filter(trend__isnull=False).annotate(
+                trend_log_score=F('trend__log_score')
+            ).order_by('-trend_log_score', 'id')
+        if self.action == 'similar':
+            return self.get_similar_queryset(SimilarTitle.Source.REVIEWS)
+        return super().get_queryset()
+
     def get_serializer_class(self):
+        if self.action == 'top':
+            return TopTitleSerializer
+        if self.action == 'trending':
+            return TrendingTitleSerializer
+        if self.action == 'similar':
+            return SimilarTitleSerializer
         if self.request.method == 'GET':
             return TitleReadSerializer
         return TitleWriteSerializer
 
+    @action(
+        detail=False,
+        url_path='top',
+        filterset_class=TopTitleFilters,
+        cursor_ordering=('-weighted_rating', 'id'),
+    )
+    def top(self, request):
+        """Works by Bayesian weighted rating, from the ranking table."""
+        return self.list(request)
+
+    @action(
+        detail=False,
+        url_path='trending',
+        filter_backends=(),
+        cursor_ordering=('-trend_log_score', 'id'),
+    )
+    def trending(self, request):
+        """Works by recent review activity, from the trend table."""
+        return self.list(request)
+
+    @action(
+        detail=True,
+        url_path='similar',
+        filter_backends=(),
+        pagination_class=None,
+    )
+    def similar(self, request, pk=None):
+        """
+        Works reviewed alike, from the precomputed neighbours.
+        Works without such neighbours get the ones alike by content.
+        """
+        serializer = self.get_serializer(
+            self.filter_queryset(self.get_queryset()), many=True
+        )
+        if not serializer.data:
+            serializer = self.get_serializer(
+                self.filter_queryset(
+                    self.get_similar_queryset(SimilarTitle.Source.CONTENT)
+                ),
+                many=True,
+            )
+        if not serializer.data and not Title.objects.filter(pk=pk).exists():
+            raise Http404
+        return Response(serializer.data)
+
+    def get_similar_queryset(self, source):
+        return Title.objects.filter(
+            similar_to__title_id=self.kwargs['pk'],
+            similar_to__source=source,
+        ).annotate(
+            similarity=F('similar_to__score')
+        ).order_by('-similarity', 'id')
 
-class ReviewViewSet(viewsets.ModelViewSet):
+    def get_version_scopes(self):
+        if self.action == 'retrieve':
+            return (title_scope(self.kwargs['pk']),)
+        return (TITLES_LIST_SCOPE,)
+
+
+class ReviewViewSet(
+    ReplicaReadMixin,
+    FastReadMixin,
+    ConditionalGetMixin,
+    OptimizedQuerysetMixin,
+    viewsets.ModelViewSet,
+):
     """Review Model Representation."""
     serializer_class = ReviewSerializer
+    fast_read_serializer_class = ReviewRowSerializer
     permission_classes = (
         IsAuthorModeratorAdminOrReadOnly,
     )
+    pagination_class = CursorLimitOffsetPagination
+    cursor_ordering = ('pub_date', 'id')
     http_method_names = ('get', 'post', 'patch', 'delete')
 
     def get_title(self):
@@ -90,17 +214,29 @@ class ReviewViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         return self.get_title().reviews.all()
 
+    def get_version_scopes(self):
+        return (reviews_scope(self.kwargs['title_id']), AUTHORS_SCOPE)
+
     def perform_create(self, serializer):
         serializer.save(author=self.request.user, title=self.get_title())
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(
+    ReplicaReadMixin,
+    FastReadMixin,
+    ConditionalGetMixin,
+    OptimizedQuerysetMixin,
+    viewsets.ModelViewSet,
+):
     """Comment model representation."""
     serializer_class = CommentSerializer
+    fast_read_serializer_class = CommentRowSerializer
     permission_classes = (
         IsAuthorModeratorAdminOrReadOnly,
         IsAuthenticatedOrReadOnly
     )
+    pagination_class = CursorLimitOffsetPagination
+    cursor_ordering = ('pub_date', 'id')
     http_method_names = ('get', 'post', 'patch', 'delete')
 
     def get_review(self):
@@ -113,6 +249,9 @@ class CommentViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         return self.get_review().comments.all()
 
+    def get_version_scopes(self):
+        return (comments_scope(self.kwargs['review_id']), AUTHORS_SCOPE)
+
     def perform_create(self, serializer):
         serializer.save(author=self.request.user, review=self.get_review())
 
@@ -122,6 +261,9 @@ class SignUpView(APIView):
     Receive a confirmation code on the transmitted email. Access rights: Available without
     token.
     """
+    throttle_classes = (TokenBucketThrottle,)
+    throttle_scope = 'signup'
+
     def post(self, request):
         serializer = ConfirmationCodeSerializer(data=request.data)
         username = request.data.get('username')
@@ -152,12 +294,12 @@ class SignUpView(APIView):
             )
         user, created = user.get_or_create(username=username, email=email)
         code = default_token_generator.make_token(user)
-        send_mail(
+        # Delivered by the send_emails worker.
+        OutgoingEmail.objects.create(
             subject='Your login code',
             message=code,
             from_email=settings.FROM_EMAIL,
-            recipient_list=[f'{email}'],
-            fail_silently=True,
+            recipient=email,
         )
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -166,6 +308,9 @@ class VerifyCodeView(APIView):
     """
     Receive JWT token in exchange for username and confirmation code.
     """
+    throttle_classes = (TokenBucketThrottle,)
+    throttle_scope = 'token'
+
     def post(self, request):
         serializer = TokenSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -179,14 +324,14 @@ class VerifyCodeView(APIView):
                 {'confirmation_code': 'Invalid confirmation code'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        token = AccessToken.for_user(user)
+        token = RoleAccessToken.for_user(user)
         return Response(
             {'token': str(token)},
             status=status.HTTP_200_OK
         )
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(OptimizedQuerysetMixin, viewsets.ModelViewSet):
     """
     Get a list of all users.
     Access rights: Administrator.
@@ -206,11 +351,13 @@ class UserViewSet(viewsets.ModelViewSet):
         permission_classes=(IsAuthenticated,)
     )
     def get_current_user_info(self, request):
+        # request.user may only hold the fields of the token.
+        user = get_object_or_404(UserYamDb, pk=request.user.pk)
         if request.method == 'GET':
-            serializer = UpdateUserYamDbSerializer(request.user)
+            serializer = UpdateUserYamDbSerializer(user)
             return Response(serializer.data, status=status.HTTP_200_OK)
         serializer = UpdateUserYamDbSerializer(
-            request.user,
+            user,
             data=request.data,
             partial=True,
         )
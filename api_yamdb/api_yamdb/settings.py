@@ -1,3 +1,4 @@
+from datetime import timedelta
 from pathlib import Path
 
 
@@ -26,6 +27,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.timing.RequestTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -60,7 +62,55 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
-    }
+        # Connections are reused by the requests of a thread.
+        'CONN_MAX_AGE': 60,
+    },
+    # A copy of the primary made by refresh_replicas.
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.replica.sqlite3',
+        'CONN_MAX_AGE': 60,
+    },
+}
+
+DATABASE_ROUTERS = ['api.replicas.ReplicaRouter']
+
+# Aliases the safe requests of the API read from. Add 'replica' here
+# once refresh_replicas keeps it up to date.
+DATABASE_REPLICAS = ()
+
+# Seconds a user reads from the primary after a write, longer
+# than the lag of the replicas.
+REPLICA_STICKY_TIME = 15
+
+# Applied to every new SQLite connection, see reviews/sqlite.py.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'busy_timeout': 5000,
+    # Negative sizes are in KiB: 64 MiB of page cache per connection.
+    'cache_size': -64 * 1024,
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'memory',
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Shared by all the server processes, add() and incr() are atomic.
+    # Failures raise instead of returning defaults, so the throttle
+    # falls back to local memory while the server is down.
+    'throttle': {
+        'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+        'LOCATION': '127.0.0.1:11211',
+        'OPTIONS': {
+            'connect_timeout': 0.1,
+            'timeout': 0.1,
+            'retry_attempts': 0,
+            'dead_timeout': 10,
+        },
+    },
 }
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -94,10 +144,32 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.AllowAny',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.v1.authentication.RoleTokenAuthentication',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
     'PAGE_SIZE': 10,
+    # Reverse proxies in front of the server. The throttles trust
+    # X-Forwarded-For only that far, set it when deployed behind one.
+    'NUM_PROXIES': 0,
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.v1.renderers.OrjsonRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+        # application/msgpack for the internal clients.
+        'api.v1.renderers.MessagePackRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.v1.renderers.OrjsonParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+        'api.v1.renderers.MessagePackParser',
+    ],
+}
+
+# Tokens carry the role of the user. A role change is seen at once
+# by the processes sharing the cache, by the others once the tokens
+# issued before it expire.
+SIMPLE_JWT = {
+    'ACCESS_TOKEN_LIFETIME': timedelta(minutes=5),
 }
 
 STATIC_URL = '/static/'
@@ -121,3 +193,40 @@ MAX_LENGTH_ROLE = 20
 SCORE_MIN = 1
 
 SCORE_MAX = 10
+
+# Cached responses are keyed by the generations of their data, stored
+# in the database, so a local cache of every process serves fresh data.
+TITLES_CACHE_TIMEOUT = 60 * 5
+
+# Opt in to serve the lists of works, reviews and comments from
+# values_list() rows instead of the DRF serializers, the output is the same.
+FAST_READ_SERIALIZERS = False
+
+# Share of the requests logging every query with its time, from 0 to 1.
+REQUEST_TIMING_SAMPLE_RATE = 0
+
+# A JSON line per request with its queries and times.
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'api.timing': {'handlers': ['console'], 'level': 'INFO'},
+    },
+}
+
+# Time after which a review counts half as much for the trending works.
+TRENDING_HALF_LIFE = timedelta(days=3)
+
+# Cache alias keeping the throttle buckets and counters, shared by all
+# the processes; local memory is used while it is missing or fails.
+THROTTLE_CACHE = 'throttle'
+
+# Token bucket rates of the unauthenticated auth endpoints,
+# per endpoint and per key: client address or request field.
+THROTTLE_BUCKETS = {
+    'signup': {'ip': '20/min', 'email': '5/hour', 'username': '5/hour'},
+    'token': {'ip': '30/min', 'username': '10/min'},
+}
@@ -0,0 +1,325 @@
+"""
+Similar works by content, for works without reviews to compare.
+
+Two works are compared by the Jaccard index of their genre sets, kept
+as integer bitsets, and by the cosine of the TF-IDF vectors of their
+names and descriptions; the name counts NAME_WEIGHT times.
+
+The vectors are sparse, the full rebuild accumulates the cosines
+of a work over the inverted index of its terms, so it is only compared
+with the works sharing a term or a genre with it.
+
+The term counts of the works and the number of works with each term
+are stored too. Saving a work updates its counts and the frequencies
+of the terms it gained or lost, then compares it with the works found
+through the index of the stored terms and genres only. It is put into
+the lists of its neighbours, the periodic rebuild settles the rest.
+"""
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+from operator import itemgetter
+
+from django.db import transaction
+from django.db.models import F
+
+from reviews.models import (
+    GenreTitle, SimilarTitle, TermFrequency, Title, TitleTerm,
+    normalize_name,
+)
+from reviews.similarity import save_similar_titles
+
+NEIGHBOURS = 10
+GENRE_WEIGHT = 0.5
+NAME_WEIGHT = 2
+# Terms shorter than this or found in more than this share
+# of the works carry no meaning.
+MIN_TERM_LENGTH = 3
+MAX_TERM_LENGTH = 100
+MAX_DOCUMENT_SHARE = 0.5
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def tokenize(text):
+    return [
+        term for term in TOKEN_PATTERN.findall(normalize_name(text))
+        if MIN_TERM_LENGTH <= len(term) <= MAX_TERM_LENGTH
+        and not term.isdigit()
+    ]
+
+
+def count_terms(name, description):
+    return Counter(tokenize(name) * NAME_WEIGHT + tokenize(description))
+
+
+def popcount(bits):
+    return bin(bits).count('1')
+
+
+def jaccard(first, second):
+    union = first | second
+    if not union:
+        return 0.0
+    return popcount(first & second) / popcount(union)
+
+
+def get_bits(bits):
+    while bits:
+        bit = bits & -bits
+        yield bit
+        bits ^= bit
+
+
+def get_idf(frequencies, total):
+    """IDF of the terms found in at most MAX_DOCUMENT_SHARE of the works."""
+    limit = max(1, total * MAX_DOCUMENT_SHARE)
+    return {
+        term: math.log((1 + total) / (1 + frequency)) + 1
+        for term, frequency in frequencies.items()
+        if frequency <= limit
+    }
+
+
+def get_vector(counts, idf):
+    vector = {
+        term: count * idf[term]
+        for term, count in counts.items() if term in idf
+    }
+    norm = math.sqrt(sum(value * value for value in vector.values()))
+    return {term: value / norm for term, value in vector.items()}
+
+
+def get_score(genres, other_genres, cosine):
+    return (
+        GENRE_WEIGHT * jaccard(genres, other_genres)
+        + (1 - GENRE_WEIGHT) * cosine
+    )
+
+
+class ContentIndex:
+    """
+    Genre bitsets and normalized TF-IDF vectors of all the works
+    with the inverted indexes of their genres and terms.
+    """
+
+    def __init__(self):
+        self.genres = defaultdict(int)
+        for title_id, genre_id in GenreTitle.objects.values_list(
+            'title_id', 'genre_id'
+        ).iterator():
+            self.genres[title_id] |= 1 << genre_id
+        self.counts = {
+            title_id: count_terms(name, description)
+            for title_id, name, description in Title.objects.values_list(
+                'id', 'name', 'description'
+            ).iterator()
+        }
+        self.title_ids = list(self.counts)
+        self.frequencies = Counter(
+            term for terms in self.counts.values() for term in terms
+        )
+        idf = get_idf(self.frequencies, len(self.counts))
+        self.vectors = {}
+        self.by_term = defaultdict(list)
+        self.by_genre = defaultdict(list)
+        for title_id, terms in self.counts.items():
+            self.vectors[title_id] = get_vector(terms, idf)
+            for term, weight in self.vectors[title_id].items():
+                self.by_term[term].append((title_id, weight))
+            for bit in get_bits(self.genres[title_id]):
+                self.by_genre[bit].append(title_id)
+
+    def neighbours(self, title_id):
+        """
+        Top similar works of one work. The cosines are accumulated
+        over the shared terms only, as one row of a sparse product.
+        """
+        cosines = defaultdict(float)
+        for term, weight in self.vectors[title_id].items():
+            for other_id, other_weight in self.by_term[term]:
+                cosines[other_id] += weight * other_weight
+        genres = self.genres[title_id]
+        candidates = set(cosines).union(*(
+            self.by_genre[bit] for bit in get_bits(genres)
+        ))
+        candidates.discard(title_id)
+        scores = (
+            (
+                other_id,
+                get_score(genres, self.genres[other_id], cosines[other_id]),
+            )
+            for other_id in candidates
+        )
+        return heapq.nlargest(NEIGHBOURS, scores, key=itemgetter(1))
+
+
+def shift_frequencies(terms, delta):
+    """Count the works with the terms up or down."""
+    terms = list(terms)
+    if not terms:
+        return
+    if delta > 0:
+        TermFrequency.objects.bulk_create(
+            [TermFrequency(term=term) for term in terms],
+            ignore_conflicts=True,
+        )
+    frequencies = TermFrequency.objects.filter(term__in=terms)
+    frequencies.update(documents=F('documents') + delta)
+    frequencies.filter(documents=0).delete()
+
+
+def store_terms(title_id, counts):
+    """Replace the stored term counts of a work and their frequencies."""
+    stored = dict(TitleTerm.objects.filter(
+        title_id=title_id
+    ).values_list('term', 'count'))
+    changed = [
+        term for term, count in counts.items() if stored.get(term) != count
+    ]
+    removed = stored.keys() - counts.keys()
+    TitleTerm.objects.filter(
+        title_id=title_id, term__in=[*changed, *removed]
+    ).delete()
+    TitleTerm.objects.bulk_create([
+        TitleTerm(title_id=title_id, term=term, count=counts[term])
+        for term in changed
+    ])
+    shift_frequencies(counts.keys() - stored.keys(), 1)
+    shift_frequencies(removed, -1)
+
+
+def forget_terms(title_id):
+    """Count a deleted work out of the frequencies of its terms."""
+    shift_frequencies(
+        TitleTerm.objects.filter(
+            title_id=title_id
+        ).values_list('term', flat=True),
+        -1,
+    )
+
+
+def get_stored_neighbours(title_id, counts):
+    """
+    Top similar works of one work from the stored terms. Only the works
+    sharing a weighted term or a genre with it are read.
+    """
+    total = Title.objects.count()
+    frequencies = dict(TermFrequency.objects.filter(
+        term__in=list(counts)
+    ).values_list('term', 'documents'))
+    vector = get_vector(counts, get_idf(frequencies, total))
+    other_counts = defaultdict(dict)
+    if vector:
+        candidate_terms = TitleTerm.objects.filter(
+            title_id__in=TitleTerm.objects.filter(
+                term__in=list(vector)
+            ).exclude(title_id=title_id).values('title_id')
+        )
+        for other_id, term, count in candidate_terms.values_list(
+            'title_id', 'term', 'count'
+        ).iterator():
+            other_counts[other_id][term] = count
+        frequencies.update(TermFrequency.objects.filter(
+            term__in=candidate_terms.values('term')
+        ).values_list('term', 'documents'))
+    idf = get_idf(frequencies, total)
+    cosines = defaultdict(float)
+    for other_id, terms in other_counts.items():
+        other_vector = get_vector(terms, idf)
+        cosines[other_id] = sum(
+            weight * other_vector[term]
+            for term, weight in vector.items() if term in other_vector
+        )
+    other_genres = defaultdict(int)
+    for other_id, genre_id in GenreTitle.objects.filter(
+        title_id__in=GenreTitle.objects.filter(
+            genre_id__in=GenreTitle.objects.filter(
+                title_id=title_id
+            ).values('genre_id')
+        ).values('title_id')
+    ).values_list('title_id', 'genre_id').iterator():
+        other_genres[other_id] |= 1 << genre_id
+    genres = other_genres.pop(title_id, 0)
+    scores = (
+        (
+            other_id,
+            get_score(genres, other_genres[other_id], cosines[other_id]),
+        )
+        for other_id in set(cosines).union(other_genres)
+    )
+    return heapq.nlargest(NEIGHBOURS, scores, key=itemgetter(1))
+
+
+def rebuild_content_neighbours():
+    """Replace the stored terms and the content neighbours of all works."""
+    index = ContentIndex()
+    rows = (
+        SimilarTitle(
+            title_id=title_id,
+            similar_id=other_id,
+            score=score,
+            source=SimilarTitle.Source.CONTENT,
+        )
+        for title_id in index.title_ids
+        for other_id, score in index.neighbours(title_id)
+    )
+    with transaction.atomic():
+        TitleTerm.objects.all().delete()
+        TitleTerm.objects.bulk_create(
+            [
+                TitleTerm(title_id=title_id, term=term, count=count)
+                for title_id, terms in index.counts.items()
+                for term, count in terms.items()
+            ],
+            batch_size=1000,
+        )
+        TermFrequency.objects.all().delete()
+        TermFrequency.objects.bulk_create(
+            [
+                TermFrequency(term=term, documents=documents)
+                for term, documents in index.frequencies.items()
+            ],
+            batch_size=1000,
+        )
+        SimilarTitle.objects.filter(
+            source=SimilarTitle.Source.CONTENT
+        ).delete()
+        return save_similar_titles(rows)
+
+
+def refresh_content_neighbours(title_id):
+    """
+    Store the terms of a saved work, recompute its neighbours and put it
+    into their lists, which keep at most NEIGHBOURS rows.
+    """
+    title = Title.objects.filter(pk=title_id).values_list(
+        'name', 'description'
+    ).first()
+    if title is None:
+        return
+    content = SimilarTitle.objects.filter(source=SimilarTitle.Source.CONTENT)
+    with transaction.atomic():
+        counts = count_terms(*title)
+        store_terms(title_id, counts)
+        neighbours = get_stored_neighbours(title_id, counts)
+        content.filter(title_id=title_id).delete()
+        content.filter(similar_id=title_id).delete()
+        rows = []
+        for other_id, score in neighbours:
+            rows.append(SimilarTitle(
+                title_id=title_id, similar_id=other_id, score=score,
+                source=SimilarTitle.Source.CONTENT,
+            ))
+            rows.append(SimilarTitle(
+                title_id=other_id, similar_id=title_id, score=score,
+                source=SimilarTitle.Source.CONTENT,
+            ))
+        save_similar_titles(rows)
+        for other_id, _ in neighbours:
+            content.filter(
+                title_id=other_id,
+                pk__in=content.filter(title_id=other_id).order_by(
+                    '-score', 'pk'
+                ).values('pk')[NEIGHBOURS:],
+            ).delete()
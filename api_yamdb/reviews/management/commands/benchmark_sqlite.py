@@ -0,0 +1,124 @@
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from reviews.sqlite import apply_pragmas
+
+PROFILES = (
+    ('default', {}),
+    ('SQLITE_PRAGMAS', settings.SQLITE_PRAGMAS),
+)
+TITLES = 100
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure the reads of a scratch SQLite database while reviews '
+        'are written, without and with SQLITE_PRAGMAS.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seconds', type=float, default=3.0)
+        parser.add_argument('--readers', type=int, default=4)
+        parser.add_argument('--rows', type=int, default=100000)
+
+    def handle(self, *args, **options):
+        for name, pragmas in PROFILES:
+            with tempfile.TemporaryDirectory() as directory:
+                path = Path(directory) / 'benchmark.sqlite3'
+                self.fill(path, pragmas, options['rows'])
+                reads, writes, errors = self.run(path, pragmas, options)
+            seconds = options['seconds']
+            self.stdout.write(
+                f'{name}: {reads / seconds:.0f} reads/s, '
+                f'{writes / seconds:.0f} writes/s, {errors} errors'
+            )
+
+    def connect(self, path, pragmas):
+        connection = sqlite3.connect(
+            path, timeout=5, isolation_level=None, check_same_thread=False
+        )
+        apply_pragmas(connection.cursor(), pragmas)
+        return connection
+
+    def fill(self, path, pragmas, rows):
+        connection = self.connect(path, pragmas)
+        connection.executescript(
+            'CREATE TABLE review ('
+            'id INTEGER PRIMARY KEY, title_id INTEGER, score INTEGER, '
+            'text TEXT);'
+            'CREATE INDEX review_title ON review (title_id);'
+        )
+        with connection:
+            connection.execute('BEGIN')
+            connection.executemany(
+                'INSERT INTO review (title_id, score, text) VALUES (?, ?, ?)',
+                ((index % TITLES, index % 10 + 1, 'x' * 200)
+                 for index in range(rows)),
+            )
+        connection.close()
+
+    def count(self, key):
+        with self.lock:
+            self.counts[key] += 1
+
+    def read(self, path, pragmas, number):
+        connection = self.connect(path, pragmas)
+        title_id = number
+        while not self.stop.is_set():
+            title_id = (title_id + 1) % TITLES
+            try:
+                connection.execute(
+                    'SELECT count(*), avg(score) FROM review '
+                    'WHERE title_id = ?',
+                    (title_id,),
+                ).fetchone()
+            except sqlite3.OperationalError:
+                self.count('errors')
+            else:
+                self.count('reads')
+        connection.close()
+
+    def write(self, path, pragmas):
+        connection = self.connect(path, pragmas)
+        while not self.stop.is_set():
+            try:
+                connection.execute('BEGIN IMMEDIATE')
+                connection.execute(
+                    'INSERT INTO review (title_id, score, text) '
+                    'VALUES (?, ?, ?)',
+                    (self.counts['writes'] % TITLES, 5, 'x' * 200),
+                )
+                connection.execute('COMMIT')
+            except sqlite3.OperationalError:
+                connection.rollback()
+                self.count('errors')
+            else:
+                self.count('writes')
+        connection.close()
+
+    def run(self, path, pragmas, options):
+        """One writer and the readers, for the given number of seconds."""
+        self.stop = threading.Event()
+        self.lock = threading.Lock()
+        self.counts = {'reads': 0, 'writes': 0, 'errors': 0}
+        threads = [threading.Thread(
+            target=self.write, args=(path, pragmas)
+        )] + [
+            threading.Thread(target=self.read, args=(path, pragmas, number))
+            for number in range(options['readers'])
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(options['seconds'])
+        self.stop.set()
+        for thread in threads:
+            thread.join()
+        return (
+            self.counts['reads'], self.counts['writes'], self.counts['errors']
+        )
@@ -0,0 +1,19 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.v1.cache import TITLES_LIST_SCOPE, invalidate
+from reviews.content_similarity import rebuild_content_neighbours
+
+
+class Command(BaseCommand):
+    help = 'Recompute the similar works from the genres and descriptions.'
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        count = rebuild_content_neighbours()
+        invalidate(TITLES_LIST_SCOPE)
+        self.stdout.write(self.style.SUCCESS(
+            f'{count} similar works stored in '
+            f'{time.perf_counter() - started:.2f} s'
+        ))
@@ -0,0 +1,113 @@
+import csv
+import gzip
+import json
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from reviews.management.commands.import_csv import (
+    FORMATS,
+    TABLES,
+    get_filename,
+)
+
+DEFAULT_CHUNK_SIZE = 2000
+
+
+def to_text(value):
+    """Value as import_csv reads it back: ISO dates, empty for None."""
+    if value is None:
+        return ''
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def open_output(path, compress):
+    if compress:
+        return gzip.open(path, 'wt', encoding='utf-8', newline='')
+    return open(path, 'w', encoding='utf-8', newline='')
+
+
+class Command(BaseCommand):
+    help = 'Write the tables in the layout import_csv reads.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output-dir',
+            default='export',
+            help='Directory the files are written to.',
+        )
+        parser.add_argument(
+            '--format',
+            choices=FORMATS,
+            default='csv',
+            help='CSV files like static/data or JSON lines, '
+                 'both read by import_csv --format.',
+        )
+        parser.add_argument(
+            '--gzip',
+            action='store_true',
+            help='Compress the files with gzip.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help='Rows fetched from the database at a time.',
+        )
+
+    def export_table(self, path, model, columns, options):
+        """Stream the table into the file without loading it in memory."""
+        started = time.perf_counter()
+        header = list(columns)
+        rows = model._base_manager.order_by('pk').values_list(
+            *(model._meta.get_field(name).attname
+              for name in columns.values())
+        ).iterator(chunk_size=options['chunk_size'])
+        count = 0
+        with open_output(path, options['gzip']) as file:
+            if options['format'] == 'csv':
+                writer = csv.writer(file)
+                writer.writerow(header)
+                for row in rows:
+                    writer.writerow([to_text(value) for value in row])
+                    count += 1
+            else:
+                for row in rows:
+                    file.write(json.dumps(
+                        dict(zip(header, row)),
+                        ensure_ascii=False,
+                        default=to_text,
+                    ))
+                    file.write('\n')
+                    count += 1
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f'{path.name}: {count} rows in {elapsed:.2f} s '
+            f'({count / elapsed if elapsed else count:.0f} rows/s)'
+        )
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be a positive number.')
+        output_dir = Path(options['output_dir'])
+        output_dir.mkdir(parents=True, exist_ok=True)
+        # One transaction, so all the tables come from the same snapshot
+        # and the references between the files stay consistent.
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                # Read committed takes a new snapshot for every query.
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        'SET TRANSACTION ISOLATION LEVEL '
+                        'REPEATABLE READ READ ONLY'
+                    )
+            for filename, model, columns in TABLES:
+                name = get_filename(filename, options['format'])
+                if options['gzip']:
+                    name += '.gz'
+                self.export_table(output_dir / name, model, columns, options)
+        self.stdout.write(self.style.SUCCESS('Data exported successfully'))
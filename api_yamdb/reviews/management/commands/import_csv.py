@@ -1,92 +1,503 @@
 import csv
-from django.core.management.base import BaseCommand
+import gzip
+import io
+import json
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
 
-from reviews.models import Category, Title, Review, Genre, Comment, GenreTitle
+import django
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import (
+    DEFAULT_DB_ALIAS, IntegrityError, connection, connections, transaction
+)
+
+from api.v1.cache import IMPORTS_SCOPE, invalidate
+from reviews.models import (
+    Category,
+    Comment,
+    Genre,
+    GenreTitle,
+    NormalizedNameField,
+    Review,
+    SimilarTitle,
+    TermFrequency,
+    Title,
+    TitleRanking,
+    TitleTerm,
+    TitleTrend,
+    normalize_name,
+)
+from reviews.content_similarity import rebuild_content_neighbours
+from reviews.ranking import rebuild_rankings
+from reviews.trending import rebuild_trends
 from users.models import UserYamDb
 
+DEFAULT_DATA_DIR = settings.BASE_DIR / 'static/data'
+# CSV files like static/data or JSON lines, both written by export_data.
+FORMATS = ('csv', 'jsonl')
+DEFAULT_BATCH_SIZE = 1000
+CHUNK_BYTES = 1 << 20
+KEY_LOOKUP_SIZE = 500
 
-class Command(BaseCommand):
-    def import_category(self):
-        with open('static/data/category.csv', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                Category.objects.create(
-                    id=row['id'], name=row['name'], slug=row['slug']
-                )
+# File, model and the model field each CSV column is loaded into,
+# in the order the foreign keys require.
+TABLES = (
+    ('users.csv', UserYamDb, {
+        'id': 'id',
+        'username': 'username',
+        'email': 'email',
+        'role': 'role',
+        'bio': 'bio',
+        'first_name': 'first_name',
+        'last_name': 'last_name',
+    }),
+    ('category.csv', Category, {'id': 'id', 'name': 'name', 'slug': 'slug'}),
+    ('genre.csv', Genre, {'id': 'id', 'name': 'name', 'slug': 'slug'}),
+    ('titles.csv', Title, {
+        'id': 'id',
+        'name': 'name',
+        'year': 'year',
+        'category': 'category_id',
+        'description': 'description',
+    }),
+    ('genre_title.csv', GenreTitle, {
+        'id': 'id',
+        'title_id': 'title_id',
+        'genre_id': 'genre_id',
+    }),
+    ('review.csv', Review, {
+        'id': 'id',
+        'title_id': 'title_id',
+        'text': 'text',
+        'author': 'author_id',
+        'score': 'score',
+        'pub_date': 'pub_date',
+    }),
+    ('comments.csv', Comment, {
+        'id': 'id',
+        'review_id': 'review_id',
+        'text': 'text',
+        'author': 'author_id',
+        'pub_date': 'pub_date',
+    }),
+)
 
-    def import_comments(self):
-        with open('static/data/comments.csv', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                Comment.objects.create(
-                    id=row['id'],
-                    review_id=row['review_id'],
-                    text=row['text'],
-                    author_id=row['author'],
-                    pub_date=row['pub_date']
-                )
+PLAIN_FIELD_TYPES = {
+    'AutoField',
+    'BigAutoField',
+    'BigIntegerField',
+    'CharField',
+    'EmailField',
+    'ForeignKey',
+    'IntegerField',
+    'PositiveIntegerField',
+    'PositiveSmallIntegerField',
+    'SlugField',
+    'SmallIntegerField',
+    'TextField',
+}
 
-    def import_genre(self):
-        with open('static/data/genre.csv', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                Genre.objects.create(
-                    id=row['id'], name=row['name'], slug=row['slug']
-                )
+# Tables computed from the imported ones, emptied by --truncate.
+# Rankings, trends, the stored terms and the content neighbours
+# are rebuilt after the import, the review neighbours by the
+# similar_titles command.
+DERIVED_MODELS = (
+    SimilarTitle, TermFrequency, TitleRanking, TitleTerm, TitleTrend
+)
+
+# Natural keys matched by --upsert, the other tables use id.
+UPSERT_KEYS = {
+    UserYamDb: 'username',
+    Category: 'slug',
+    Genre: 'slug',
+}
+
+
+class RowParser:
+    """
+    Turns the CSV rows of a table into tuples of database values,
+    one per concrete model field, ready for INSERT.
+    Fields missing from the file get their default,
+    normalized names are computed from the column of their source.
+    """
+    def __init__(self, model, columns, fieldnames):
+        # The connection proxy is resolved once, it is slow per value.
+        self.connection = connections[DEFAULT_DB_ALIAS]
+        names = {
+            name: column for column, name in columns.items()
+            if column in fieldnames
+        }
+        self.fields = []
+        for field in model._meta.concrete_fields:
+            if isinstance(field, NormalizedNameField):
+                column = names.get(field.source)
+            else:
+                column = names.get(field.name, names.get(field.attname))
+            default = None
+            if column is None:
+                default = self.prepare(field, field.get_default())
+            self.fields.append((field, column, default))
+
+    def prepare(self, field, value):
+        return field.get_db_prep_save(value, self.connection)
+
+    def parse(self, row):
+        values = []
+        for field, column, default in self.fields:
+            if column is None:
+                values.append(default)
+                continue
+            value = row[column]
+            if isinstance(field, NormalizedNameField):
+                values.append(normalize_name(value))
+                continue
+            if value == '' and field.null:
+                value = None
+            values.append(self.prepare(field, field.to_python(value)))
+        return tuple(values)
+
+
+def get_filename(filename, file_format):
+    """Name of the file of a table in the format."""
+    return f'{Path(filename).stem}.{file_format}'
+
+
+def find_file(data_dir, filename):
+    """Path of the table file, plain or gzip-compressed."""
+    for path in (data_dir / filename, data_dir / f'{filename}.gz'):
+        if path.is_file():
+            return path
+    return None
+
+
+def is_jsonl(path):
+    return '.jsonl' in path.suffixes
+
+
+def open_text(path):
+    if path.suffix == '.gz':
+        return gzip.open(path, 'rt', encoding='utf-8', newline='')
+    return open(path, encoding='utf-8', newline='')
+
+
+def read_header(path):
+    with open_text(path) as file:
+        if is_jsonl(path):
+            line = file.readline()
+            return list(json.loads(line)) if line.strip() else []
+        return next(csv.reader(file), [])
+
+
+def read_rows(path, parser):
+    """Stream the parsed rows of the file."""
+    with open_text(path) as file:
+        if is_jsonl(path):
+            rows = (json.loads(line) for line in file if line.strip())
+        else:
+            rows = csv.DictReader(file)
+        for row in rows:
+            yield parser.parse(row)
 
-    def import_genre_title(self):
-        with open('static/data/genre_title.csv', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                GenreTitle.objects.create(
-                    id=row['id'], title_id=row['title_id'],
-                    genre_id=row['genre_id']
-                )
 
-    def import_review(self):
-        with open('static/data/review.csv', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                Review.objects.create(
-                    id=row['id'],
-                    title_id=row['title_id'],
-                    text=row['text'],
-                    author_id=row['author'],
-                    score=row['score'],
-                    pub_date=row['pub_date']
+def split_file(path, chunk_bytes=CHUNK_BYTES):
+    """
+    Byte ranges of the rows of the file, cut on record boundaries.
+    A line break ends a record only outside quotes, that is after
+    an even number of quote characters, so quoted multi-line texts
+    are never split.
+    """
+    with open(path, 'rb') as file:
+        file.readline()
+        start = position = file.tell()
+        quotes = 0
+        for line in file:
+            position += len(line)
+            quotes += line.count(b'"')
+            if quotes % 2 == 0 and position - start >= chunk_bytes:
+                yield start, position
+                start = position
+        if position > start:
+            yield start, position
+
+
+def setup_worker():
+    if not apps.ready:
+        django.setup()
+
+
+@lru_cache(maxsize=None)
+def get_parser(model_label, columns, fieldnames):
+    return RowParser(apps.get_model(model_label), dict(columns), fieldnames)
+
+
+def parse_chunk(path, start, end, fieldnames, model_label, columns):
+    """Parse one byte range of a file in a worker process."""
+    parser = get_parser(model_label, columns, fieldnames)
+    with open(path, 'rb') as file:
+        file.seek(start)
+        text = file.read(end - start).decode('utf-8')
+    reader = csv.DictReader(io.StringIO(text, newline=''), fieldnames)
+    return [parser.parse(row) for row in reader]
+
+
+def read_rows_parallel(executor, workers, path, model, columns, fieldnames):
+    """
+    Stream the rows parsed by the worker processes.
+    At most two chunks per worker are in flight at a time.
+    """
+    pending = deque()
+    for start, end in split_file(path):
+        pending.append(executor.submit(
+            parse_chunk, str(path), start, end, tuple(fieldnames),
+            model._meta.label, tuple(columns.items()),
+        ))
+        if len(pending) >= workers * 2:
+            yield from pending.popleft().result()
+    while pending:
+        yield from pending.popleft().result()
+
+
+def iter_batches(rows, batch_size):
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def get_insert_sql(model):
+    quote_name = connection.ops.quote_name
+    fields = model._meta.concrete_fields
+    return 'INSERT INTO {} ({}) VALUES ({})'.format(
+        quote_name(model._meta.db_table),
+        ', '.join(quote_name(field.column) for field in fields),
+        ', '.join(['%s'] * len(fields)),
+    )
+
+
+def insert_rows(model, rows, batch_size):
+    """Write parsed rows with one executemany() call per batch."""
+    sql = get_insert_sql(model)
+    count = 0
+    with connection.cursor() as cursor:
+        for batch in iter_batches(rows, batch_size):
+            cursor.executemany(sql, batch)
+            count += len(batch)
+    return count, count, 0
+
+
+def upsert_rows(model, parser, rows, batch_size):
+    """
+    Insert new rows and update changed ones, matched on the upsert key.
+    Each batch is compared with hashes of the stored rows fetched
+    in bulk, unchanged rows are not written at all.
+    """
+    quote_name = connection.ops.quote_name
+    table = quote_name(model._meta.db_table)
+    key_field = model._meta.get_field(UPSERT_KEYS.get(model, 'id'))
+    key_index = model._meta.concrete_fields.index(key_field)
+    compared = [
+        index for index, (field, column, _) in enumerate(parser.fields)
+        if column is not None and field != key_field and not field.primary_key
+    ]
+    fields = [parser.fields[index][0] for index in compared]
+    # Plain values are loaded as they were prepared, the others
+    # (dates, booleans) are prepared again to compare.
+    converted = [
+        position for position, field in enumerate(fields)
+        if field.get_internal_type() not in PLAIN_FIELD_TYPES
+    ]
+    insert_sql = get_insert_sql(model)
+    update_sql = 'UPDATE {} SET {} WHERE {} = %s'.format(
+        table,
+        ', '.join(f'{quote_name(field.column)} = %s' for field in fields),
+        quote_name(key_field.column),
+    )
+    read = inserted = updated = 0
+    with connection.cursor() as cursor:
+        for batch in iter_batches(rows, batch_size):
+            stored = {}
+            for keys in iter_batches(
+                (row[key_index] for row in batch), KEY_LOOKUP_SIZE
+            ):
+                stored_rows = model._base_manager.filter(
+                    **{f'{key_field.attname}__in': keys}
+                ).values_list(
+                    key_field.attname, *(field.attname for field in fields)
                 )
+                for key, *values in stored_rows:
+                    for position in converted:
+                        values[position] = parser.prepare(
+                            fields[position], values[position]
+                        )
+                    stored[key] = hash(tuple(values))
+            new = []
+            changed = []
+            for row in batch:
+                key = row[key_index]
+                values = tuple(row[index] for index in compared)
+                if key not in stored:
+                    new.append(row)
+                elif stored[key] != hash(values):
+                    changed.append(values + (key,))
+            if new:
+                cursor.executemany(insert_sql, new)
+            if changed:
+                cursor.executemany(update_sql, changed)
+            read += len(batch)
+            inserted += len(new)
+            updated += len(changed)
+    return read, inserted, updated
+
 
-    def import_titles(self):
-        with open('static/data/titles.csv', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                Title.objects.create(
-                    id=row['id'],
-                    name=row['name'],
-                    year=row['year'],
-                    category_id=row['category']
+class Command(BaseCommand):
+    help = (
+        'Load the CSV or JSON lines files from the data directory '
+        'into the database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--data-dir',
+            default=DEFAULT_DATA_DIR,
+            help='Directory with the CSV or JSON lines files.',
+        )
+        parser.add_argument(
+            '--format',
+            choices=FORMATS,
+            default='csv',
+            help='Format of the files, as written by export_data.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Rows sent to the database per executemany() call.',
+        )
+        parser.add_argument(
+            '--truncate',
+            action='store_true',
+            help='Delete the existing rows of the imported tables first.',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Processes parsing the files; rows are still written '
+                 'by this process.',
+        )
+        parser.add_argument(
+            '--upsert',
+            action='store_true',
+            help='Insert new rows and update changed ones instead of '
+                 'failing on existing keys.',
+        )
+
+    def truncate(self):
+        models = [
+            *DERIVED_MODELS, *(model for _, model, _ in reversed(TABLES))
+        ]
+        with transaction.atomic(), connection.cursor() as cursor:
+            for model in models:
+                tables = [
+                    field.remote_field.through._meta.db_table
+                    for field in model._meta.local_many_to_many
+                    if field.remote_field.through._meta.auto_created
+                ]
+                tables.append(model._meta.db_table)
+                for table in tables:
+                    cursor.execute(
+                        f'DELETE FROM {connection.ops.quote_name(table)}'
+                    )
+
+    def import_table(self, rows, path, model, parser, options):
+        started = time.perf_counter()
+        with transaction.atomic():
+            if options['upsert']:
+                count, inserted, updated = upsert_rows(
+                    model, parser, rows, options['batch_size']
                 )
+            else:
+                count, inserted, updated = insert_rows(
+                    model, rows, options['batch_size']
+                )
+        elapsed = time.perf_counter() - started
+        message = (
+            f'{path.name}: {count} rows in {elapsed:.2f} s '
+            f'({count / elapsed if elapsed else count:.0f} rows/s)'
+        )
+        if options['upsert']:
+            message += f', {inserted} new, {updated} changed'
+        self.stdout.write(message)
+
+    def check_options(self, data_dir, options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be a positive number.')
+        if options['workers'] < 1:
+            raise CommandError('--workers must be a positive number.')
+        for filename, _, _ in TABLES:
+            filename = get_filename(filename, options['format'])
+            if find_file(data_dir, filename) is None:
+                raise CommandError(f'File {data_dir / filename} not found.')
 
-    def import_users(self):
-        with open('static/data/users.csv', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                UserYamDb.objects.create(
-                    id=row['id'],
-                    username=row['username'],
-                    email=row['email'],
-                    role=row['role'],
-                    bio=row['bio'],
-                    first_name=row['first_name'],
-                    last_name=row['last_name']
+    def import_data(self, data_dir, options):
+        workers = options['workers']
+        if options['truncate']:
+            self.truncate()
+        if workers > 1:
+            pool = ProcessPoolExecutor(workers, initializer=setup_worker)
+        else:
+            pool = nullcontext()
+        with pool as executor:
+            for filename, model, columns in TABLES:
+                path = find_file(
+                    data_dir, get_filename(filename, options['format'])
                 )
+                fieldnames = read_header(path)
+                parser = RowParser(model, columns, fieldnames)
+                # Compressed files can not be split into byte ranges,
+                # JSON lines are parsed here.
+                if (
+                    executor is None or path.suffix == '.gz'
+                    or is_jsonl(path)
+                ):
+                    rows = read_rows(path, parser)
+                else:
+                    rows = read_rows_parallel(
+                        executor, workers, path, model, columns, fieldnames
+                    )
+                try:
+                    self.import_table(rows, path, model, parser, options)
+                except IntegrityError as error:
+                    raise CommandError(
+                        f'{path.name}: {error}. Use --upsert to update '
+                        'existing rows or --truncate to replace them.'
+                    )
+        Title.objects.recount_ratings()
+        rebuild_rankings()
+        rebuild_trends()
+        rebuild_content_neighbours()
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(
+                no_style(), [model for _, model, _ in TABLES]
+            ):
+                cursor.execute(sql)
 
     def handle(self, *args, **options):
-        self.import_category()
-        self.import_genre()
-        self.import_titles()
-        self.import_genre_title()
-        self.import_users()
-        self.import_review()
-        self.import_comments()
+        data_dir = Path(options['data_dir'])
+        self.check_options(data_dir, options)
+        try:
+            self.import_data(data_dir, options)
+        finally:
+            # Every cached response and ETag predates the imported rows.
+            invalidate(IMPORTS_SCOPE)
         self.stdout.write(self.style.SUCCESS('Data imported successfully'))
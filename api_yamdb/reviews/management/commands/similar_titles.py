@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from api.v1.cache import TITLES_LIST_SCOPE, invalidate
+from reviews.similarity import (
+    DEFAULT_MIN_COMMON,
+    DEFAULT_NEIGHBOURS,
+    rebuild_similar_titles,
+)
+
+
+class Command(BaseCommand):
+    help = 'Recompute the similar works from the review scores.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--neighbours',
+            type=int,
+            default=DEFAULT_NEIGHBOURS,
+            help='Similar works kept for every work.',
+        )
+        parser.add_argument(
+            '--min-common',
+            type=int,
+            default=DEFAULT_MIN_COMMON,
+            help='Reviewers two works need in common to be compared.',
+        )
+
+    def handle(self, *args, **options):
+        if options['neighbours'] < 1 or options['min_common'] < 1:
+            raise CommandError(
+                '--neighbours and --min-common must be positive numbers.'
+            )
+        started = time.perf_counter()
+        with transaction.atomic():
+            count = rebuild_similar_titles(
+                neighbours=options['neighbours'],
+                min_common=options['min_common'],
+            )
+        invalidate(TITLES_LIST_SCOPE)
+        self.stdout.write(self.style.SUCCESS(
+            f'{count} similar works stored in '
+            f'{time.perf_counter() - started:.2f} s'
+        ))
@@ -0,0 +1,21 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.v1.cache import TITLES_LIST_SCOPE, invalidate
+from reviews.trending import rebuild_trends
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the trending works from the recent reviews.'
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        with transaction.atomic():
+            count = rebuild_trends()
+        # The leaderboards are cached with the lists of works.
+        invalidate(TITLES_LIST_SCOPE)
+        self.stdout.write(self.style.SUCCESS(
+            f'{count} works trending in {time.perf_counter() - started:.2f} s'
+        ))
@@ -0,0 +1,37 @@
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def fill_rating_aggregate(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    titles = Title.objects.annotate(
+        total=Sum('reviews__score'),
+        count=Count('reviews'),
+    ).filter(count__gt=0)
+    for title in titles:
+        title.score_sum = title.total
+        title.reviews_count = title.count
+    Title.objects.bulk_update(titles, ('score_sum', 'reviews_count'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_auto_20240208_1558'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='reviews_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Number of reviews'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Sum of review scores'),
+        ),
+        migrations.RunPython(
+            fill_rating_aggregate, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,85 @@
+from django.db import migrations
+
+# Full-text index of works for SQLite (FTS5), an external content table
+# kept in sync with reviews_title by triggers. Ё is indexed as Е so that
+# both spellings match.
+FTS_TEXT = (
+    "replace(replace({0}.name, 'ё', 'е'), 'Ё', 'Е'), "
+    "replace(replace({0}.description, 'ё', 'е'), 'Ё', 'Е')"
+)
+
+TABLE_SQL = """
+    CREATE VIRTUAL TABLE reviews_title_fts USING fts5(
+        name, description,
+        content='reviews_title', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+"""
+
+# SQLite drops the triggers when a migration rebuilds reviews_title,
+# such migrations have to create them again.
+TRIGGERS_SQL = (
+    f"""
+    CREATE TRIGGER reviews_title_fts_insert AFTER INSERT ON reviews_title
+    BEGIN
+        INSERT INTO reviews_title_fts(rowid, name, description)
+        VALUES (new.id, {FTS_TEXT.format('new')});
+    END
+    """,
+    f"""
+    CREATE TRIGGER reviews_title_fts_delete AFTER DELETE ON reviews_title
+    BEGIN
+        INSERT INTO reviews_title_fts(reviews_title_fts, rowid, name,
+                                      description)
+        VALUES ('delete', old.id, {FTS_TEXT.format('old')});
+    END
+    """,
+    f"""
+    CREATE TRIGGER reviews_title_fts_update
+    AFTER UPDATE OF name, description ON reviews_title
+    BEGIN
+        INSERT INTO reviews_title_fts(reviews_title_fts, rowid, name,
+                                      description)
+        VALUES ('delete', old.id, {FTS_TEXT.format('old')});
+        INSERT INTO reviews_title_fts(rowid, name, description)
+        VALUES (new.id, {FTS_TEXT.format('new')});
+    END
+    """,
+)
+
+POPULATE_SQL = f"""
+    INSERT INTO reviews_title_fts(rowid, name, description)
+    SELECT id, {FTS_TEXT.format('reviews_title')} FROM reviews_title
+"""
+
+DROP_TRIGGERS_SQL = (
+    'DROP TRIGGER IF EXISTS reviews_title_fts_insert',
+    'DROP TRIGGER IF EXISTS reviews_title_fts_delete',
+    'DROP TRIGGER IF EXISTS reviews_title_fts_update',
+)
+
+CREATE_SQL = (TABLE_SQL, *TRIGGERS_SQL, POPULATE_SQL)
+
+DROP_SQL = (*DROP_TRIGGERS_SQL, 'DROP TABLE IF EXISTS reviews_title_fts')
+
+
+def run_on_sqlite(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for sql in statements:
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_on_sqlite(CREATE_SQL), run_on_sqlite(DROP_SQL)
+        ),
+    ]
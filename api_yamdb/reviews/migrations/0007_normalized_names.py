@@ -0,0 +1,51 @@
+from importlib import import_module
+
+from django.db import migrations
+
+import reviews.models
+
+MODELS = ('category', 'genre', 'title')
+
+title_fts = import_module('reviews.migrations.0006_title_fts')
+# Adding a column rebuilds reviews_title on SQLite, which drops
+# the triggers of the full-text index.
+restore_fts_triggers = title_fts.run_on_sqlite(
+    title_fts.DROP_TRIGGERS_SQL + title_fts.TRIGGERS_SQL
+)
+
+
+def fill_normalized_names(apps, schema_editor):
+    for model_name in MODELS:
+        model = apps.get_model('reviews', model_name)
+        objects = list(model.objects.only('name'))
+        for obj in objects:
+            obj.name_normalized = reviews.models.normalize_name(obj.name)
+        model.objects.bulk_update(objects, ('name_normalized',), 500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_title_fts'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            migrations.RunPython.noop, restore_fts_triggers
+        ),
+    ] + [
+        migrations.AddField(
+            model_name=model_name,
+            name='name_normalized',
+            field=reviews.models.NormalizedNameField(db_index=True, default='', editable=False, max_length=256, verbose_name='Normalized title'),
+            preserve_default=False,
+        )
+        for model_name in MODELS
+    ] + [
+        migrations.RunPython(
+            fill_normalized_names, migrations.RunPython.noop
+        ),
+        migrations.RunPython(
+            restore_fts_triggers, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 3.2 on 2026-10-18 20:42
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+import django.db.models.deletion
+
+from reviews.ranking import weighted_rating
+
+
+def fill_rankings(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    TitleRanking = apps.get_model('reviews', 'TitleRanking')
+    titles = Title.objects.filter(reviews_count__gt=0)
+    totals = titles.aggregate(
+        score_sum=Sum('score_sum'),
+        reviews_count=Sum('reviews_count'),
+        titles=Count('pk'),
+    )
+    if not totals['titles']:
+        return
+    prior = (
+        totals['score_sum'] / totals['reviews_count'],
+        totals['reviews_count'] / totals['titles'],
+    )
+    TitleRanking.objects.bulk_create(
+        TitleRanking(
+            title_id=title.pk,
+            category_id=title.category_id,
+            weighted_rating=weighted_rating(
+                title.score_sum, title.reviews_count, prior
+            ),
+        )
+        for title in titles
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_normalized_names'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleRanking',
+            fields=[
+                ('title', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='ranking', serialize=False, to='reviews.title', verbose_name='Work')),
+                ('weighted_rating', models.FloatField(verbose_name='Bayesian weighted rating')),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='reviews.category', verbose_name='Category')),
+            ],
+            options={
+                'verbose_name': 'Ranking',
+                'verbose_name_plural': 'Rankings',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='titleranking',
+            index=models.Index(fields=['-weighted_rating', 'title'], name='ranking_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='titleranking',
+            index=models.Index(fields=['category', '-weighted_rating', 'title'], name='ranking_category_rating_idx'),
+        ),
+        migrations.RunPython(fill_rankings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 3.2 on 2026-10-18 20:46
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_title_ranking'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleTrend',
+            fields=[
+                ('title', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='trend', serialize=False, to='reviews.title', verbose_name='Work')),
+                ('log_score', models.FloatField(verbose_name='Logarithm of the decayed activity')),
+            ],
+            options={
+                'verbose_name': 'Trend',
+                'verbose_name_plural': 'Trends',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['pub_date'], name='review_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='titletrend',
+            index=models.Index(fields=['-log_score', 'title'], name='trend_log_score_idx'),
+        ),
+    ]
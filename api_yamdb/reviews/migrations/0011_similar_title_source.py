@@ -0,0 +1,34 @@
+# Generated by Django 3.2 on 2026-10-18 20:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0010_similar_title'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='similartitle',
+            name='unique_similar_title',
+        ),
+        migrations.RemoveIndex(
+            model_name='similartitle',
+            name='similar_title_score_idx',
+        ),
+        migrations.AddField(
+            model_name='similartitle',
+            name='source',
+            field=models.CharField(choices=[('reviews', 'Reviews'), ('content', 'Content')], default='reviews', max_length=10, verbose_name='Computed from'),
+        ),
+        migrations.AddIndex(
+            model_name='similartitle',
+            index=models.Index(fields=['title', 'source', '-score'], name='similar_title_score_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='similartitle',
+            constraint=models.UniqueConstraint(fields=('title', 'similar', 'source'), name='unique_similar_title'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 3.2 on 2026-10-18 21:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0012_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CacheGeneration',
+            fields=[
+                ('scope', models.CharField(max_length=200, primary_key=True, serialize=False, verbose_name='Scope')),
+                ('generation', models.BigIntegerField(default=0, verbose_name='Generation')),
+            ],
+            options={
+                'verbose_name': 'Cache generation',
+                'verbose_name_plural': 'Cache generations',
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 3.2 on 2026-10-18 21:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0013_cache_generation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RankingPrior',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mean_score', models.FloatField(verbose_name='Mean review score')),
+                ('prior_weight', models.FloatField(verbose_name='Average review count of a reviewed work')),
+                ('computed_at', models.DateTimeField(verbose_name='Computed at')),
+            ],
+            options={
+                'verbose_name': 'Ranking prior',
+                'verbose_name_plural': 'Ranking priors',
+            },
+        ),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 3.2 on 2026-10-18 21:32
+
+from collections import Counter
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from reviews.content_similarity import count_terms
+
+
+def fill_terms(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    TitleTerm = apps.get_model('reviews', 'TitleTerm')
+    TermFrequency = apps.get_model('reviews', 'TermFrequency')
+    rows = []
+    frequencies = Counter()
+    for title_id, name, description in Title.objects.values_list(
+        'id', 'name', 'description'
+    ).iterator():
+        counts = count_terms(name, description)
+        frequencies.update(counts.keys())
+        rows.extend(
+            TitleTerm(title_id=title_id, term=term, count=count)
+            for term, count in counts.items()
+        )
+    TitleTerm.objects.bulk_create(rows, batch_size=1000)
+    TermFrequency.objects.bulk_create(
+        [
+            TermFrequency(term=term, documents=documents)
+            for term, documents in frequencies.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0014_ranking_prior'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TermFrequency',
+            fields=[
+                ('term', models.CharField(max_length=100, primary_key=True, serialize=False, verbose_name='Term')),
+                ('documents', models.PositiveIntegerField(default=0, verbose_name='Works with the term')),
+            ],
+            options={
+                'verbose_name': 'Term frequency',
+                'verbose_name_plural': 'Term frequencies',
+            },
+        ),
+        migrations.CreateModel(
+            name='TitleTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=100, verbose_name='Term')),
+                ('count', models.PositiveIntegerField(verbose_name='Count')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='terms', to='reviews.title', verbose_name='Work')),
+            ],
+            options={
+                'verbose_name': 'Term of a work',
+                'verbose_name_plural': 'Terms of the works',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='titleterm',
+            index=models.Index(fields=['term', 'title'], name='title_term_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='titleterm',
+            constraint=models.UniqueConstraint(fields=('title', 'term'), name='unique_title_term'),
+        ),
+        migrations.RunPython(fill_terms, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
 from django.conf import settings
 from django.core.validators import MinValueValidator, MaxValueValidator
 
@@ -6,18 +8,46 @@ from reviews.validators import validate_year
 from users.models import UserYamDb
 
 
-class BaseModel(models.Model):
+def normalize_name(value):
+    """Casefolded name with Ё written as Е, the form names are matched in."""
+    return (value or '').casefold().replace('ё', 'е')
+
+
+class NormalizedNameField(models.CharField):
+    """
+    Indexed copy of another field in the normalized form,
+    filled whenever the object is saved or bulk created.
+    """
+    def __init__(self, *args, source='name', **kwargs):
+        self.source = source
+        kwargs.setdefault('max_length', settings.LEN_TEXT)
+        kwargs.setdefault('db_index', True)
+        kwargs.setdefault('editable', False)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.source != 'name':
+            kwargs['source'] = self.source
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance, add):
+        value = normalize_name(getattr(model_instance, self.source))
+        setattr(model_instance, self.attname, value)
+        return value
+
+
+class NamedModel(models.Model):
     """
     Abstract model.
-    Adds a name and slug to the model.
+    Adds a name and its normalized form used by the filters.
     """
     name = models.CharField(
         verbose_name='Title',
         max_length=settings.LEN_TEXT,
     )
-    slug = models.SlugField(
-        verbose_name='Slug',
-        unique=True,
+    name_normalized = NormalizedNameField(
+        verbose_name='Normalized title',
     )
 
     class Meta:
@@ -27,12 +57,29 @@ class BaseModel(models.Model):
         return self.name
 
 
+class BaseModel(NamedModel):
+    """
+    Abstract model.
+    Adds a name and slug to the model.
+    """
+    slug = models.SlugField(
+        verbose_name='Slug',
+        unique=True,
+    )
+
+    class Meta:
+        abstract = True
+
+
 class Genre(BaseModel):
     """Genres Module."""
     class Meta:
         verbose_name = 'Genre'
         verbose_name_plural = 'Genres'
         ordering = ('name',)
+        indexes = [
+            models.Index(fields=('name',), name='genre_name_idx'),
+        ]
 
 
 class Category(BaseModel):
@@ -41,14 +88,31 @@ class Category(BaseModel):
         verbose_name = 'Category'
         verbose_name_plural = 'Categories'
         ordering = ('name',)
+        indexes = [
+            models.Index(fields=('name',), name='category_name_idx'),
+        ]
 
 
-class Title(models.Model):
+class TitleQuerySet(models.QuerySet):
+    def recount_ratings(self):
+        """Recompute the stored rating aggregate from the reviews table."""
+        reviews = Review.objects.filter(
+            title=OuterRef('pk')
+        ).order_by().values('title')
+        return self.update(
+            score_sum=Coalesce(
+                Subquery(reviews.annotate(total=Sum('score')).values('total')),
+                0,
+            ),
+            reviews_count=Coalesce(
+                Subquery(reviews.annotate(count=Count('pk')).values('count')),
+                0,
+            ),
+        )
+
+
+class Title(NamedModel):
     """A model of the works"""
-    name = models.CharField(
-        verbose_name='Title',
-        max_length=settings.LEN_TEXT,
-    )
     year = models.SmallIntegerField(
         verbose_name='Year of release',
         validators=[validate_year],
@@ -71,14 +135,200 @@ class Title(models.Model):
         null=True,
         related_name='title_category'
     )
+    score_sum = models.PositiveIntegerField(
+        verbose_name='Sum of review scores',
+        default=0,
+        editable=False,
+    )
+    reviews_count = models.PositiveIntegerField(
+        verbose_name='Number of reviews',
+        default=0,
+        editable=False,
+    )
+
+    AGGREGATE_FIELDS = ('score_sum', 'reviews_count')
+
+    objects = TitleQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'Work'
         verbose_name_plural = 'Works'
         ordering = ('year', 'name')
+        indexes = [
+            models.Index(
+                fields=('year', 'name', 'id'),
+                name='title_year_name_id_idx'
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        """
+        Updates leave the rating aggregate alone: it is changed only
+        by the F() increments of the review signals, and the values
+        loaded with the instance may be stale by now.
+        """
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.AGGREGATE_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+    @property
+    def rating(self):
+        """Average review score, None while the work has no reviews."""
+        if not self.reviews_count:
+            return None
+        return self.score_sum // self.reviews_count
+
+
+class TitleRanking(models.Model):
+    """
+    Materialized leaderboard row of a work with reviews.
+    Kept up to date by reviews.ranking.
+    """
+    title = models.OneToOneField(
+        Title,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='ranking',
+        verbose_name='Work',
+    )
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name='+',
+        verbose_name='Category',
+    )
+    weighted_rating = models.FloatField(
+        verbose_name='Bayesian weighted rating',
+    )
+
+    class Meta:
+        verbose_name = 'Ranking'
+        verbose_name_plural = 'Rankings'
+        indexes = [
+            models.Index(
+                fields=('-weighted_rating', 'title'),
+                name='ranking_rating_idx'
+            ),
+            models.Index(
+                fields=('category', '-weighted_rating', 'title'),
+                name='ranking_category_rating_idx'
+            ),
+        ]
 
     def __str__(self):
-        return self.name
+        return f'{self.title_id}: {self.weighted_rating:.2f}'
+
+
+class RankingPrior(models.Model):
+    """
+    Prior of the weighted rating of the leaderboard, a single row kept
+    in the database so every server process and management command
+    ranks with the same one. Kept up to date by reviews.ranking.
+    """
+    mean_score = models.FloatField(
+        verbose_name='Mean review score',
+    )
+    prior_weight = models.FloatField(
+        verbose_name='Average review count of a reviewed work',
+    )
+    computed_at = models.DateTimeField(
+        verbose_name='Computed at',
+    )
+
+    class Meta:
+        verbose_name = 'Ranking prior'
+        verbose_name_plural = 'Ranking priors'
+
+    def __str__(self):
+        return f'{self.mean_score:.2f} x {self.prior_weight:.2f}'
+
+
+class TitleTrend(models.Model):
+    """
+    Rolling aggregate of the recent review activity of a work.
+    Kept up to date by reviews.trending.
+    """
+    title = models.OneToOneField(
+        Title,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='trend',
+        verbose_name='Work',
+    )
+    log_score = models.FloatField(
+        verbose_name='Logarithm of the decayed activity',
+    )
+
+    class Meta:
+        verbose_name = 'Trend'
+        verbose_name_plural = 'Trends'
+        indexes = [
+            models.Index(
+                fields=('-log_score', 'title'),
+                name='trend_log_score_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.title_id}: {self.log_score:.2f}'
+
+
+class SimilarTitle(models.Model):
+    """
+    Precomputed neighbour of a work, the top ones are recommended.
+    Review neighbours are filled by the similar_titles command,
+    content neighbours by reviews.content_similarity.
+    """
+    class Source(models.TextChoices):
+        REVIEWS = 'reviews'
+        CONTENT = 'content'
+
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='similar_titles',
+        verbose_name='Work',
+    )
+    similar = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='similar_to',
+        verbose_name='Similar work',
+    )
+    source = models.CharField(
+        verbose_name='Computed from',
+        max_length=10,
+        choices=Source.choices,
+        default=Source.REVIEWS,
+    )
+    score = models.FloatField(
+        verbose_name='Similarity',
+    )
+
+    class Meta:
+        verbose_name = 'Similar work'
+        verbose_name_plural = 'Similar works'
+        indexes = [
+            models.Index(
+                fields=('title', 'source', '-score'),
+                name='similar_title_score_idx'
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=('title', 'similar', 'source'),
+                name='unique_similar_title'
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.title_id} ~ {self.similar_id}: {self.score:.2f}'
 
 
 class GenreTitle(models.Model):
@@ -94,6 +344,14 @@ class GenreTitle(models.Model):
         related_name='genre_title'
     )
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=('genre', 'title'),
+                name='genre_title_genre_idx'
+            ),
+        ]
+
     def __str__(self):
         return f'{self.title} {self.genre}'
 
@@ -136,6 +394,16 @@ class Review(models.Model):
     class Meta:
         verbose_name = 'Review'
         verbose_name_plural = 'Reviews'
+        indexes = [
+            models.Index(
+                fields=('title', 'pub_date', 'id'),
+                name='review_title_pub_date_idx'
+            ),
+            models.Index(
+                fields=('pub_date',),
+                name='review_pub_date_idx'
+            ),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=('title', 'author',),
@@ -146,6 +414,12 @@ class Review(models.Model):
     def __str__(self):
         return self.text
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_score = instance.__dict__.get('score')
+        return instance
+
 
 class Comment(models.Model):
     """Comment Model."""
@@ -172,6 +446,98 @@ class Comment(models.Model):
     class Meta:
         verbose_name = 'Comment'
         verbose_name_plural = 'Comments'
+        indexes = [
+            models.Index(
+                fields=('review', 'pub_date', 'id'),
+                name='comment_review_pub_date_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.text
+
+
+class TitleTerm(models.Model):
+    """
+    Count of a term in the name and description of a work, the stored
+    content vector. Kept up to date by reviews.content_similarity.
+    """
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='terms',
+        verbose_name='Work',
+    )
+    term = models.CharField(
+        verbose_name='Term',
+        max_length=100,
+    )
+    count = models.PositiveIntegerField(
+        verbose_name='Count',
+    )
+
+    class Meta:
+        verbose_name = 'Term of a work'
+        verbose_name_plural = 'Terms of the works'
+        indexes = [
+            models.Index(
+                fields=('term', 'title'),
+                name='title_term_idx'
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=('title', 'term'),
+                name='unique_title_term'
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.title_id}: {self.term} x {self.count}'
+
+
+class TermFrequency(models.Model):
+    """
+    Number of works with a term, the document frequency of the TF-IDF
+    weights. Kept up to date by reviews.content_similarity.
+    """
+    term = models.CharField(
+        verbose_name='Term',
+        max_length=100,
+        primary_key=True,
+    )
+    documents = models.PositiveIntegerField(
+        verbose_name='Works with the term',
+        default=0,
+    )
+
+    class Meta:
+        verbose_name = 'Term frequency'
+        verbose_name_plural = 'Term frequencies'
+
+    def __str__(self):
+        return f'{self.term}: {self.documents}'
+
+
+class CacheGeneration(models.Model):
+    """
+    Version stamp of a scope of cached API responses and ETags.
+    Kept in the database so every server process and management
+    command sees the same stamp, see api.v1.cache.
+    """
+    scope = models.CharField(
+        verbose_name='Scope',
+        max_length=200,
+        primary_key=True,
+    )
+    generation = models.BigIntegerField(
+        verbose_name='Generation',
+        default=0,
+    )
+
+    class Meta:
+        verbose_name = 'Cache generation'
+        verbose_name_plural = 'Cache generations'
+
+    def __str__(self):
+        return f'{self.scope}: {self.generation}'
@@ -0,0 +1,105 @@
+"""
+Leaderboard of works by Bayesian weighted rating.
+
+A work with few reviews is pulled towards the mean score of all reviews:
+
+    weighted = (prior_weight * mean_score + score_sum)
+               / (prior_weight + reviews_count)
+
+where prior_weight is the average number of reviews of a reviewed work.
+The prior is kept in the database. Only the full rebuild of the
+rank_titles command computes it, so all the rows share one prior;
+they are updated with it as reviews change.
+"""
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from reviews.models import RankingPrior, Title, TitleRanking
+
+PRIOR_ID = 1
+
+
+def compute_prior():
+    """Mean review score and average review count of a reviewed work."""
+    totals = Title.objects.filter(reviews_count__gt=0).aggregate(
+        score_sum=Sum('score_sum'),
+        reviews_count=Sum('reviews_count'),
+        titles=Count('pk'),
+    )
+    if not totals['titles']:
+        return 0.0, 0.0
+    return (
+        totals['score_sum'] / totals['reviews_count'],
+        totals['reviews_count'] / totals['titles'],
+    )
+
+
+def save_prior(prior):
+    mean_score, prior_weight = prior
+    RankingPrior.objects.update_or_create(
+        pk=PRIOR_ID,
+        defaults={
+            'mean_score': mean_score,
+            'prior_weight': prior_weight,
+            'computed_at': timezone.now(),
+        },
+    )
+    return prior
+
+
+def get_prior():
+    """The stored prior, None before the first rebuild."""
+    return RankingPrior.objects.filter(pk=PRIOR_ID).values_list(
+        'mean_score', 'prior_weight'
+    ).first()
+
+
+def weighted_rating(score_sum, reviews_count, prior):
+    mean_score, prior_weight = prior
+    return (
+        (prior_weight * mean_score + score_sum)
+        / (prior_weight + reviews_count)
+    )
+
+
+def update_title_ranking(title_id):
+    """Recompute the row of one work from its stored rating aggregate."""
+    title = Title.objects.filter(pk=title_id).values(
+        'score_sum', 'reviews_count', 'category_id'
+    ).first()
+    if title is None or not title['reviews_count']:
+        TitleRanking.objects.filter(title_id=title_id).delete()
+        return
+    prior = get_prior()
+    if prior is None:
+        # The rebuild stores the first prior and ranks every work.
+        rebuild_rankings()
+        return
+    TitleRanking.objects.update_or_create(
+        title_id=title_id,
+        defaults={
+            'category_id': title['category_id'],
+            'weighted_rating': weighted_rating(
+                title['score_sum'], title['reviews_count'], prior
+            ),
+        },
+    )
+
+
+def rebuild_rankings(batch_size=1000):
+    """Recompute the prior and every row of the table."""
+    prior = save_prior(compute_prior())
+    rankings = [
+        TitleRanking(
+            title_id=title_id,
+            category_id=category_id,
+            weighted_rating=weighted_rating(score_sum, reviews_count, prior),
+        )
+        for title_id, category_id, score_sum, reviews_count
+        in Title.objects.filter(reviews_count__gt=0).values_list(
+            'pk', 'category_id', 'score_sum', 'reviews_count'
+        ).iterator()
+    ]
+    TitleRanking.objects.all().delete()
+    TitleRanking.objects.bulk_create(rankings, batch_size)
+    return len(rankings)
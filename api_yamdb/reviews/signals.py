@@ -0,0 +1,88 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from api.v1.cache import TITLES_LIST_SCOPE, invalidate
+from reviews.content_similarity import forget_terms
+from reviews.models import Review, Title, TitleRanking
+from reviews.ranking import update_title_ranking
+from reviews.trending import update_title_trend
+
+
+def update_title_rating(title_id, score_delta, count_delta=0):
+    """Shift the stored rating aggregate of a work without recounting."""
+    if not score_delta and not count_delta:
+        return
+    Title.objects.filter(pk=title_id).update(
+        score_sum=F('score_sum') + score_delta,
+        reviews_count=F('reviews_count') + count_delta,
+    )
+
+
+def update_title_ranking_on_commit(title_id):
+    # After the commit the work may be gone together with its reviews,
+    # then its row is removed instead of being created again.
+    def update():
+        update_title_ranking(title_id)
+        # The leaderboard cached since the bump of api.signals,
+        # which runs first, holds the old row.
+        invalidate(TITLES_LIST_SCOPE)
+
+    transaction.on_commit(update)
+
+
+def loaded_score(review):
+    """Score the review had in the database before the current change."""
+    score = getattr(review, '_loaded_score', None)
+    return review.score if score is None else score
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        update_title_rating(instance.title_id, instance.score, 1)
+        update_title_trend(
+            instance.title_id, instance.score, instance.pub_date
+        )
+    else:
+        score = loaded_score(instance)
+        update_title_rating(instance.title_id, instance.score - score)
+        if score != instance.score:
+            update_title_trend(
+                instance.title_id, score, instance.pub_date, removed=True
+            )
+            update_title_trend(
+                instance.title_id, instance.score, instance.pub_date
+            )
+    update_title_ranking_on_commit(instance.title_id)
+    instance._loaded_score = instance.score
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    update_title_rating(instance.title_id, -loaded_score(instance), -1)
+    update_title_trend(
+        instance.title_id,
+        loaded_score(instance),
+        instance.pub_date,
+        removed=True,
+    )
+    update_title_ranking_on_commit(instance.title_id)
+
+
+@receiver(post_save, sender=Title)
+def title_saved(sender, instance, created, raw=False, **kwargs):
+    if raw or created:
+        return
+    TitleRanking.objects.filter(title_id=instance.pk).update(
+        category_id=instance.category_id
+    )
+
+
+@receiver(pre_delete, sender=Title)
+def title_deleted(sender, instance, **kwargs):
+    # The stored terms go with the work, their frequencies stay.
+    forget_terms(instance.pk)
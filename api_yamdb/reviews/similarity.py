@@ -0,0 +1,119 @@
+"""
+Item-item collaborative filtering over the review scores.
+
+Works are compared by the adjusted cosine of their score columns:
+every score is centered on the mean score of its author, so a strict
+and a generous reviewer agree when they like the same works more than
+their usual. Similarities resting on few common reviewers are shrunk
+towards zero.
+
+The score matrix is sparse, it is kept as per-author and per-work
+lists and one row of R^T R is accumulated at a time, so the work is
+proportional to the sum of the squared author review counts and the
+memory to the number of reviews.
+"""
+import heapq
+import math
+from collections import defaultdict
+from itertools import islice
+from operator import itemgetter
+
+from reviews.models import Review, SimilarTitle
+
+DEFAULT_NEIGHBOURS = 10
+DEFAULT_MIN_COMMON = 2
+SHRINK = 10
+CHUNK_SIZE = 10000
+
+
+def load_scores(reviews):
+    """
+    Centered scores per author and per work
+    from (author_id, title_id, score) rows.
+    Authors with a single review say nothing about pairs of works.
+    """
+    by_author = defaultdict(list)
+    for author_id, title_id, score in reviews:
+        by_author[author_id].append((title_id, score))
+    author_scores = []
+    by_title = defaultdict(list)
+    for scores in by_author.values():
+        if len(scores) < 2:
+            continue
+        mean = sum(score for _, score in scores) / len(scores)
+        centered = [(title_id, score - mean) for title_id, score in scores]
+        for title_id, value in centered:
+            by_title[title_id].append((len(author_scores), value))
+        author_scores.append(centered)
+    return author_scores, by_title
+
+
+def get_neighbours(title_id, author_scores, by_title, norms,
+                   neighbours, min_common):
+    """Top similar works of one work, from one row of R^T R."""
+    dots = defaultdict(float)
+    common = defaultdict(int)
+    for author, value in by_title[title_id]:
+        for other_id, other_value in author_scores[author]:
+            dots[other_id] += value * other_value
+            common[other_id] += 1
+    norm = norms[title_id]
+    scores = (
+        (
+            other_id,
+            dot / (norm * norms[other_id])
+            * common[other_id] / (common[other_id] + SHRINK),
+        )
+        for other_id, dot in dots.items()
+        if other_id != title_id
+        and common[other_id] >= min_common
+        and dot > 0
+    )
+    return heapq.nlargest(neighbours, scores, key=itemgetter(1))
+
+
+def compute_similar_titles(reviews, neighbours=DEFAULT_NEIGHBOURS,
+                           min_common=DEFAULT_MIN_COMMON):
+    """Yield (title_id, similar_id, score) for every reviewed work."""
+    author_scores, by_title = load_scores(reviews)
+    norms = {
+        title_id: math.sqrt(sum(value * value for _, value in values))
+        for title_id, values in by_title.items()
+    }
+    for title_id in by_title:
+        if not norms[title_id]:
+            continue
+        for similar_id, score in get_neighbours(
+            title_id, author_scores, by_title, norms, neighbours, min_common
+        ):
+            yield title_id, similar_id, score
+
+
+def rebuild_similar_titles(batch_size=1000, **options):
+    """Replace the stored neighbours, returns the number of rows."""
+    SimilarTitle.objects.filter(
+        source=SimilarTitle.Source.REVIEWS
+    ).delete()
+    reviews = Review.objects.values_list(
+        'author_id', 'title_id', 'score'
+    ).iterator(chunk_size=CHUNK_SIZE)
+    return save_similar_titles(
+        (
+            SimilarTitle(title_id=title_id, similar_id=similar_id, score=score)
+            for title_id, similar_id, score
+            in compute_similar_titles(reviews, **options)
+        ),
+        batch_size,
+    )
+
+
+def save_similar_titles(rows, batch_size=1000):
+    """Insert the rows in batches, returns their number."""
+    rows = iter(rows)
+    count = 0
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return count
+        SimilarTitle.objects.bulk_create(batch)
+        count += len(batch)
@@ -0,0 +1,24 @@
+"""
+Setup of the SQLite connections.
+
+Every new connection gets settings.SQLITE_PRAGMAS. In WAL mode the
+readers keep reading the last committed state while a write commits,
+so a review being saved no longer blocks the lists. With
+synchronous=NORMAL the WAL is synced at checkpoints only: a power loss
+may drop the last transactions, but never corrupts the database.
+"""
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+def apply_pragmas(cursor, pragmas):
+    for name, value in pragmas.items():
+        cursor.execute(f'PRAGMA {name} = {value}')
+
+
+@receiver(connection_created)
+def configure_connection(sender, connection, **kwargs):
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            apply_pragmas(cursor, settings.SQLITE_PRAGMAS)
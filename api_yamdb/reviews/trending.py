@@ -0,0 +1,121 @@
+"""
+Trending works by review activity with exponential time decay.
+
+Every review adds score / SCORE_MAX, halved every TRENDING_HALF_LIFE.
+The decay factor is the same for all the works at any moment, so rows
+keep the logarithm of the sum decayed to the fixed EPOCH instead:
+
+    log_score = log(sum(weight * exp(decay * (pub_date - EPOCH))))
+
+The order by log_score never changes with time, a new review only
+touches the row of its work, and the values grow linearly with time,
+so they never overflow.
+"""
+import math
+from collections import defaultdict
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from reviews.models import Review, TitleTrend
+
+EPOCH = datetime(2020, 1, 1, tzinfo=dt_timezone.utc)
+# Contributions that decayed below this share of a fresh review
+# are dropped by the rebuild.
+HORIZON_HALF_LIVES = 10
+
+
+def get_decay():
+    return math.log(2) / settings.TRENDING_HALF_LIFE.total_seconds()
+
+
+def get_log_weight(score, pub_date):
+    """Logarithm of the contribution of a review decayed to EPOCH."""
+    return (
+        math.log(score / settings.SCORE_MAX)
+        + get_decay() * (pub_date - EPOCH).total_seconds()
+    )
+
+
+def current_score(log_score, now=None):
+    """Sum of the decayed contributions of the reviews at this moment."""
+    now = now or timezone.now()
+    return math.exp(log_score - get_decay() * (now - EPOCH).total_seconds())
+
+
+def add_log(log_total, log_value):
+    """log(exp(log_total) + exp(log_value)) without overflow."""
+    high, low = max(log_total, log_value), min(log_total, log_value)
+    return high + math.log1p(math.exp(low - high))
+
+
+def subtract_log(log_total, log_value):
+    """log(exp(log_total) - exp(log_value)), None when nothing is left."""
+    if log_value >= log_total:
+        return None
+    remainder = -math.expm1(log_value - log_total)
+    if remainder < 1e-9:
+        return None
+    return log_total + math.log(remainder)
+
+
+def update_title_trend(title_id, score, pub_date, removed=False):
+    """Add or remove the contribution of one review."""
+    if removed and pub_date < get_horizon_start():
+        # Rebuilds leave such reviews out, there is nothing to remove.
+        return
+    log_weight = get_log_weight(score, pub_date)
+    with transaction.atomic():
+        trend = TitleTrend.objects.select_for_update().filter(
+            title_id=title_id
+        ).first()
+        if trend is None:
+            if removed:
+                return
+            try:
+                with transaction.atomic():
+                    TitleTrend.objects.create(
+                        title_id=title_id, log_score=log_weight
+                    )
+                return
+            except IntegrityError:
+                # A concurrent first review of the work created the row.
+                trend = TitleTrend.objects.select_for_update().get(
+                    title_id=title_id
+                )
+        if removed:
+            trend.log_score = subtract_log(trend.log_score, log_weight)
+        else:
+            trend.log_score = add_log(trend.log_score, log_weight)
+        if trend.log_score is None:
+            trend.delete()
+        else:
+            trend.save(update_fields=('log_score',))
+
+
+def get_horizon_start(now=None):
+    now = now or timezone.now()
+    return now - settings.TRENDING_HALF_LIFE * HORIZON_HALF_LIVES
+
+
+def rebuild_trends(now=None):
+    """Recompute the table from the reviews inside the horizon."""
+    since = get_horizon_start(now)
+    log_scores = defaultdict(lambda: None)
+    for title_id, score, pub_date in Review.objects.filter(
+        pub_date__gte=since
+    ).values_list('title_id', 'score', 'pub_date').iterator():
+        log_weight = get_log_weight(score, pub_date)
+        log_score = log_scores[title_id]
+        log_scores[title_id] = (
+            log_weight if log_score is None
+            else add_log(log_score, log_weight)
+        )
+    TitleTrend.objects.all().delete()
+    TitleTrend.objects.bulk_create(
+        TitleTrend(title_id=title_id, log_score=log_score)
+        for title_id, log_score in log_scores.items()
+    )
+    return len(log_scores)
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import UserYamDb
+from .models import OutgoingEmail, UserYamDb
 
 
 @admin.register(UserYamDb)
@@ -16,3 +16,15 @@ class UserYamDbAdmin(admin.ModelAdmin):
     )
     list_editable = ('role',)
     search_fields = ('username', 'role',)
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        'recipient',
+        'subject',
+        'created',
+        'attempts',
+        'next_attempt_at',
+    )
+    search_fields = ('recipient',)
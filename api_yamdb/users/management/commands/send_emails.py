@@ -0,0 +1,175 @@
+import time
+from datetime import timedelta
+from uuid import uuid4
+
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from users.models import OutgoingEmail
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_RETRY_DELAY = 60
+MAX_RETRY_DELAY = 60 * 60
+DEFAULT_INTERVAL = 5
+# A claimed batch is hidden from the other workers for this long,
+# if the worker dies the emails are picked up again afterwards.
+LEASE = timedelta(minutes=10)
+
+
+def get_retry_delay(attempts, retry_delay):
+    """Exponential backoff: the delay doubles after every failed attempt."""
+    return timedelta(
+        seconds=min(retry_delay * 2 ** (attempts - 1), MAX_RETRY_DELAY)
+    )
+
+
+def get_due_ids(batch_size, now):
+    return list(
+        OutgoingEmail.objects.filter(next_attempt_at__lte=now).order_by(
+            'next_attempt_at', 'id'
+        ).values_list('id', flat=True)[:batch_size]
+    )
+
+
+def lease(ids, now):
+    """
+    Lease the emails still due to this worker with one UPDATE.
+    A concurrent worker that read the same ids finds them leased and
+    takes none of them, so every email is claimed by one worker only,
+    also on SQLite where SELECT ... FOR UPDATE is not available.
+    """
+    token = uuid4().hex
+    OutgoingEmail.objects.filter(
+        id__in=ids, next_attempt_at__lte=now
+    ).update(next_attempt_at=now + LEASE, claimed_by=token)
+    return list(
+        OutgoingEmail.objects.filter(claimed_by=token).order_by('id')
+    )
+
+
+def claim_batch(batch_size):
+    """Take the due emails and lease them to this worker."""
+    now = timezone.now()
+    ids = get_due_ids(batch_size, now)
+    if not ids:
+        return []
+    return lease(ids, now)
+
+
+def deliver(emails):
+    """
+    Send the emails over one backend connection.
+    Returns the ids of the sent emails and the errors of the others.
+    """
+    sent = []
+    failed = {}
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as error:
+        return sent, {email.id: error for email in emails}
+    try:
+        for email in emails:
+            message = EmailMessage(
+                subject=email.subject,
+                body=email.message,
+                from_email=email.from_email,
+                to=[email.recipient],
+                connection=connection,
+            )
+            try:
+                message.send()
+            except Exception as error:
+                failed[email.id] = error
+                # The connection may be broken, the next email
+                # gets a new one.
+                connection.close()
+                connection.open()
+            else:
+                sent.append(email.id)
+    except Exception as error:
+        for email in emails:
+            if email.id not in sent:
+                failed.setdefault(email.id, error)
+    finally:
+        connection.close()
+    return sent, failed
+
+
+class Command(BaseCommand):
+    help = 'Deliver the emails waiting in the outbox.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Emails sent over one backend connection.',
+        )
+        parser.add_argument(
+            '--max-attempts',
+            type=int,
+            default=DEFAULT_MAX_ATTEMPTS,
+            help='Failed deliveries after which an email is given up.',
+        )
+        parser.add_argument(
+            '--retry-delay',
+            type=int,
+            default=DEFAULT_RETRY_DELAY,
+            help='Seconds before the first retry, doubled for each next one.',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep polling the outbox instead of exiting when it is '
+                 'drained.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=DEFAULT_INTERVAL,
+            help='Seconds between polls of an empty outbox with --loop.',
+        )
+
+    def record_failures(self, emails, failed, options):
+        now = timezone.now()
+        for email in emails:
+            if email.id not in failed:
+                continue
+            email.attempts += 1
+            email.last_error = str(failed[email.id])
+            if email.attempts >= options['max_attempts']:
+                email.next_attempt_at = None
+                self.stderr.write(f'Giving up on {email}: {email.last_error}')
+            else:
+                email.next_attempt_at = now + get_retry_delay(
+                    email.attempts, options['retry_delay']
+                )
+        OutgoingEmail.objects.bulk_update(
+            [email for email in emails if email.id in failed],
+            ('attempts', 'last_error', 'next_attempt_at'),
+        )
+
+    def send_batch(self, options):
+        emails = claim_batch(options['batch_size'])
+        if not emails:
+            return 0
+        sent, failed = deliver(emails)
+        OutgoingEmail.objects.filter(id__in=sent).delete()
+        self.record_failures(emails, failed, options)
+        self.stdout.write(f'{len(sent)} sent, {len(failed)} failed')
+        return len(emails)
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be a positive number.')
+        if options['max_attempts'] < 1:
+            raise CommandError('--max-attempts must be a positive number.')
+        while True:
+            while self.send_batch(options):
+                pass
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,37 @@
+# Generated by Django 3.2 on 2026-10-18 20:36
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_auto_20240208_1558'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutgoingEmail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.CharField(max_length=256, verbose_name='Subject')),
+                ('message', models.TextField(verbose_name='Message')),
+                ('from_email', models.EmailField(max_length=254, verbose_name='Sender')),
+                ('recipient', models.EmailField(max_length=254, verbose_name='Recipient')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Queued at')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Delivery attempts')),
+                ('next_attempt_at', models.DateTimeField(blank=True, default=django.utils.timezone.now, help_text='Empty once the delivery is given up.', null=True, verbose_name='Next attempt')),
+                ('last_error', models.TextField(blank=True, verbose_name='Last error')),
+            ],
+            options={
+                'verbose_name': 'Outgoing email',
+                'verbose_name_plural': 'Outbox',
+                'ordering': ('next_attempt_at', 'id'),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='outgoingemail',
+            index=models.Index(fields=['next_attempt_at', 'id'], name='outbox_next_attempt_idx'),
+        ),
+    ]
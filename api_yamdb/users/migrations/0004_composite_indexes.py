@@ -0,0 +1,17 @@
+# Generated by Django 3.2 on 2026-10-18 20:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_outgoing_email'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='useryamdb',
+            index=models.Index(fields=['last_name', 'first_name'], name='user_name_idx'),
+        ),
+    ]
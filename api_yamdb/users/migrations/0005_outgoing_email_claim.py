@@ -0,0 +1,18 @@
+# Generated by Django 3.2 on 2026-10-18 21:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outgoingemail',
+            name='claimed_by',
+            field=models.CharField(blank=True, db_index=True, help_text='Token of the send_emails claim that leased the email.', max_length=32, verbose_name='Claim'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 3.2 on 2026-10-18 21:51
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_outgoing_email_claim'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PrimaryRead',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to='users.useryamdb', verbose_name='User')),
+                ('until', models.DateTimeField(verbose_name='Reads the primary until')),
+            ],
+            options={
+                'verbose_name': 'Primary read',
+                'verbose_name_plural': 'Primary reads',
+            },
+        ),
+    ]
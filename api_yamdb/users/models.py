@@ -2,6 +2,7 @@ from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.contrib.auth.validators import UnicodeUsernameValidator
 from django.db import models
+from django.utils import timezone
 
 from users.validators import validate_username
 
@@ -11,6 +12,9 @@ class UserYamDb(AbstractUser):
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ('first_name', 'last_name', 'username')
 
+    # Carried by the access token, permissions are checked on them.
+    CLAIM_FIELDS = ('username', 'role', 'is_staff', 'is_superuser')
+
     class UserRole(models.TextChoices):
         ADMIN = 'admin'
         USER = 'user'
@@ -44,6 +48,25 @@ class UserYamDb(AbstractUser):
         verbose_name = 'User'
         verbose_name_plural = 'Users'
         ordering = ('last_name', 'first_name')
+        indexes = [
+            models.Index(
+                fields=('last_name', 'first_name'),
+                name='user_name_idx'
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_username = instance.__dict__.get('username')
+        instance._loaded_claims = instance.get_claims()
+        return instance
+
+    def get_claims(self):
+        return tuple(
+            self.__dict__.get(field)
+            for field in (*self.CLAIM_FIELDS, 'is_active')
+        )
 
     @property
     def is_admin(self):
@@ -58,3 +81,90 @@ class UserYamDb(AbstractUser):
     @property
     def is_user(self):
         return self.role == self.UserRole.USER.value
+
+
+class OutgoingEmail(models.Model):
+    """
+    Email waiting in the outbox.
+    Delivered by the send_emails command, a row is deleted once sent.
+    """
+    subject = models.CharField(
+        verbose_name='Subject',
+        max_length=settings.LEN_TEXT,
+    )
+    message = models.TextField(
+        verbose_name='Message',
+    )
+    from_email = models.EmailField(
+        verbose_name='Sender',
+        max_length=settings.MAX_LENGTH_EMAIL,
+    )
+    recipient = models.EmailField(
+        verbose_name='Recipient',
+        max_length=settings.MAX_LENGTH_EMAIL,
+    )
+    created = models.DateTimeField(
+        verbose_name='Queued at',
+        auto_now_add=True,
+    )
+    attempts = models.PositiveSmallIntegerField(
+        verbose_name='Delivery attempts',
+        default=0,
+    )
+    next_attempt_at = models.DateTimeField(
+        verbose_name='Next attempt',
+        default=timezone.now,
+        null=True,
+        blank=True,
+        help_text='Empty once the delivery is given up.',
+    )
+    last_error = models.TextField(
+        verbose_name='Last error',
+        blank=True,
+    )
+    claimed_by = models.CharField(
+        verbose_name='Claim',
+        max_length=32,
+        blank=True,
+        db_index=True,
+        help_text='Token of the send_emails claim that leased the email.',
+    )
+
+    class Meta:
+        verbose_name = 'Outgoing email'
+        verbose_name_plural = 'Outbox'
+        ordering = ('next_attempt_at', 'id')
+        indexes = [
+            models.Index(
+                fields=('next_attempt_at', 'id'),
+                name='outbox_next_attempt_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
+
+
+class PrimaryRead(models.Model):
+    """
+    Time until which a user who has just written reads the primary
+    database. Kept in the database so every server process sees it,
+    see api.replicas.
+    """
+    user = models.OneToOneField(
+        UserYamDb,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='+',
+        verbose_name='User',
+    )
+    until = models.DateTimeField(
+        verbose_name='Reads the primary until',
+    )
+
+    class Meta:
+        verbose_name = 'Primary read'
+        verbose_name_plural = 'Primary reads'
+
+    def __str__(self):
+        return f'{self.user_id}: {self.until}'
@@ -0,0 +1,92 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Title
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08RatingAggregate:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_rating(self, client, title_id):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json().get('rating')
+
+    def test_01_rating_follows_review_changes(self, admin_client, user_client,
+                                              moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        assert self.get_rating(admin_client, title_id) is None
+
+        review_id = create_single_review(
+            user_client, title_id, 'first', 3
+        ).json()['id']
+        create_single_review(moderator_client, title_id, 'second', 8)
+        assert self.get_rating(admin_client, title_id) == 5, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'создании отзыва.'
+        )
+
+        response = user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review_id
+            ),
+            data={'score': 10}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_rating(admin_client, title_id) == 9, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'изменении оценки в отзыве.'
+        )
+
+        response = user_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review_id
+            )
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_rating(admin_client, title_id) == 8, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'удалении отзыва.'
+        )
+
+    def test_02_rating_follows_cascade_delete(self, admin_client, user,
+                                              user_client, moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'first', 2)
+        create_single_review(moderator_client, title_id, 'second', 6)
+
+        user.delete()
+        assert self.get_rating(admin_client, title_id) == 6, (
+            'Проверьте, что рейтинг произведения пересчитывается, когда '
+            'отзывы удаляются вместе с автором.'
+        )
+
+    def test_03_title_update_keeps_aggregate(self, admin_client, user_client,
+                                             moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'first', 3)
+
+        title = Title.objects.get(pk=title_id)
+        create_single_review(moderator_client, title_id, 'second', 8)
+        title.description = 'Изменённое описание'
+        title.save()
+
+        title.refresh_from_db()
+        assert (title.score_sum, title.reviews_count) == (11, 2), (
+            'Проверьте, что сохранение произведения не перезаписывает '
+            'рейтинг значениями, загруженными до нового отзыва.'
+        )
+        assert title.description == 'Изменённое описание'
+        assert self.get_rating(admin_client, title_id) == 5
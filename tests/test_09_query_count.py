@@ -0,0 +1,48 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_reviews, create_single_comment
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(context.captured_queries)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09QueryCount:
+
+    def test_01_query_count_does_not_depend_on_page_size(
+            self, admin_client, admin, user_client, user,
+            moderator_client, moderator):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        for client in author_map.values():
+            create_single_comment(
+                client, titles[0]['id'], reviews[0]['id'], 'comment'
+            )
+        urls = (
+            '/api/v1/titles/',
+            '/api/v1/categories/',
+            '/api/v1/genres/',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+            (
+                f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+                f'{reviews[0]["id"]}/comments/'
+            ),
+        )
+        for url in urls:
+            single = count_queries(admin_client, f'{url}?limit=1')
+            full = count_queries(admin_client, f'{url}?limit=10')
+            assert single == full, (
+                f'Проверьте, что GET-запрос к `{url}` выполняет одинаковое '
+                'количество SQL-запросов независимо от размера страницы: '
+                f'{single} для одного объекта и {full} для всех.'
+            )
@@ -0,0 +1,95 @@
+from http import HTTPStatus
+
+import json
+from base64 import urlsafe_b64encode
+
+import pytest
+
+from tests.utils import create_reviews, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10CursorPagination:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def walk(self, client, url):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert 'count' not in data, (
+            'Проверьте, что в режиме курсорной пагинации ответ не содержит '
+            'ключ `count`.'
+        )
+        pages = [data]
+        while data['next']:
+            data = client.get(data['next']).json()
+            pages.append(data)
+        return pages
+
+    def test_01_titles_cursor_pages(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        pages = self.walk(client, f'{self.TITLES_URL}?cursor=&limit=1')
+        ids = [title['id'] for page in pages for title in page['results']]
+        assert ids == [titles[0]['id'], titles[1]['id']], (
+            'Проверьте, что курсорная пагинация для `/api/v1/titles/` '
+            'возвращает все произведения, упорядоченные по году и названию.'
+        )
+        assert pages[0]['previous'] is None
+        previous = client.get(pages[-1]['previous']).json()
+        assert previous['results'] == pages[0]['results'], (
+            'Проверьте, что ссылка `previous` в режиме курсорной пагинации '
+            'ведёт на предыдущую страницу.'
+        )
+
+    def test_02_reviews_cursor_pages(self, admin_client, admin, user_client,
+                                     user, moderator_client, moderator):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        pages = self.walk(admin_client, f'{url}?cursor=&limit=2')
+        assert [len(page['results']) for page in pages] == [2, 1]
+        ids = [review['id'] for page in pages for review in page['results']]
+        assert ids == [review['id'] for review in reviews], (
+            f'Проверьте, что курсорная пагинация для `{url}` возвращает '
+            'все отзывы в порядке публикации.'
+        )
+
+    def test_03_limit_offset_is_default(self, admin_client, client):
+        create_titles(admin_client)
+        data = client.get(self.TITLES_URL).json()
+        assert data['count'] == 2
+
+    def test_04_invalid_cursor(self, admin_client, client):
+        create_titles(admin_client)
+        response = client.get(f'{self.TITLES_URL}?cursor=broken')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_05_malformed_cursor_values(self, admin_client, admin,
+                                        user_client, user):
+        titles, _, _ = create_titles(admin_client)
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        for url, position in (
+            (self.TITLES_URL, ['x', 'abc', 1]),
+            (self.TITLES_URL, [2000, 'abc', None]),
+            (self.TITLES_URL, [[1], 'abc', 1]),
+            (reviews_url, ['not a date', 1]),
+            (reviews_url, ['2024-01-01T00:00:00', 'x']),
+            ('/api/v1/titles/top/', ['x', 1]),
+            ('/api/v1/titles/trending/', [{}, 1]),
+        ):
+            cursor = urlsafe_b64encode(
+                json.dumps({'p': position, 'r': 0}).encode()
+            ).decode()
+            response = admin_client.get(f'{url}?cursor={cursor}')
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                f'Проверьте, что курсор с некорректными значениями {position} '
+                f'для `{url}` возвращает ответ со статусом 404.'
+            )
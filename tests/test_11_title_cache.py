@@ -0,0 +1,67 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import CacheGeneration
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11TitleCache:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def test_01_list_is_cached(self, admin_client, client):
+        create_titles(admin_client)
+        first = client.get(f'{self.TITLES_URL}?genre=comedy')
+        with CaptureQueriesContext(connection) as context:
+            second = client.get(f'{self.TITLES_URL}?genre=comedy')
+        assert second.status_code == HTTPStatus.OK
+        assert second.json() == first.json()
+        assert all(
+            CacheGeneration._meta.db_table in query['sql']
+            for query in context.captured_queries
+        ), (
+            'Проверьте, что повторный GET-запрос к `/api/v1/titles/` '
+            'обслуживается из кэша и читает из базы данных только версии.'
+        )
+
+    def test_02_writes_invalidate_cache(self, admin_client, client,
+                                        user_client):
+        titles, _, _ = create_titles(admin_client)
+        detail_url = self.TITLE_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        assert client.get(detail_url).json()['rating'] is None
+        client.get(self.TITLES_URL)
+
+        create_single_review(user_client, titles[0]['id'], 'text', 7)
+        assert client.get(detail_url).json()['rating'] == 7, (
+            'Проверьте, что кэш произведения сбрасывается при добавлении '
+            'отзыва.'
+        )
+        ratings = {
+            title['id']: title['rating']
+            for title in client.get(self.TITLES_URL).json()['results']
+        }
+        assert ratings[titles[0]['id']] == 7, (
+            'Проверьте, что кэш списка произведений сбрасывается при '
+            'добавлении отзыва.'
+        )
+
+        admin_client.patch(detail_url, data={'genre': ['drama']})
+        genres = client.get(detail_url).json()['genre']
+        assert [genre['slug'] for genre in genres] == ['drama'], (
+            'Проверьте, что кэш произведения сбрасывается при изменении '
+            'жанров.'
+        )
+
+        response = admin_client.delete('/api/v1/categories/films/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert client.get(detail_url).json()['category'] is None, (
+            'Проверьте, что кэш произведения сбрасывается при удалении '
+            'категории.'
+        )
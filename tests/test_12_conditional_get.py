@@ -0,0 +1,84 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import CacheGeneration
+
+from tests.utils import (
+    create_single_comment, create_single_review, create_titles
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12ConditionalGet:
+
+    def check_not_modified(self, client, url):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.has_header('ETag'), (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+            'заголовок `ETag`.'
+        )
+        assert response.has_header('Last-Modified')
+        etag = response['ETag']
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным '
+            '`If-None-Match` возвращает ответ со статусом 304.'
+        )
+        assert all(
+            CacheGeneration._meta.db_table in query['sql']
+            for query in context.captured_queries
+        ), 'Проверьте, что ответ 304 читает только версии данных.'
+        return etag
+
+    def test_01_not_modified_until_changed(self, admin_client, client,
+                                           user_client, moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        review_id = create_single_review(
+            user_client, titles[0]['id'], 'text', 5
+        ).json()['id']
+        comments_url = f'{reviews_url}{review_id}/comments/'
+        urls = ('/api/v1/titles/', '/api/v1/genres/', reviews_url,
+                comments_url)
+        etags = {url: self.check_not_modified(client, url) for url in urls}
+
+        create_single_review(moderator_client, titles[0]['id'], 'text', 9)
+        create_single_comment(
+            user_client, titles[0]['id'], review_id, 'comment'
+        )
+        changed = ('/api/v1/titles/', reviews_url, comments_url)
+        for url in urls:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+            expected = (
+                HTTPStatus.OK if url in changed else HTTPStatus.NOT_MODIFIED
+            )
+            assert response.status_code == expected, (
+                f'Проверьте, что ETag ответа на GET-запрос к `{url}` '
+                'меняется только при изменении данных.'
+            )
+
+    def test_02_versions_are_shared(self, admin_client, client):
+        create_titles(admin_client)
+        url = '/api/v1/genres/'
+        etag = self.check_not_modified(client, url)
+        cache.clear()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что версии данных не хранятся в локальном кэше.'
+        )
+        # A change made by another process or a management command.
+        CacheGeneration.objects.filter(scope='genres').update(
+            generation=CacheGeneration.objects.get(scope='genres').generation
+            + 1
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что ETag меняется, когда данные изменил '
+            'другой процесс.'
+        )
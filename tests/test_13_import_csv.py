@@ -0,0 +1,122 @@
+import csv
+import os
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from reviews.management.commands.import_csv import split_file
+from reviews.models import Comment, Review, SimilarTitle, Title, TitleTerm
+
+from tests.conftest import MANAGE_PATH
+
+DATA_DIR = os.path.join(MANAGE_PATH, 'static', 'data')
+
+
+def count_rows(filename):
+    with open(os.path.join(DATA_DIR, filename), encoding='utf-8') as file:
+        return sum(1 for _ in csv.DictReader(file))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13ImportCsv:
+
+    def test_01_import(self, django_user_model):
+        call_command('import_csv', data_dir=DATA_DIR, batch_size=10)
+        assert Title.objects.count() == count_rows('titles.csv')
+        assert Review.objects.count() == count_rows('review.csv')
+        assert Comment.objects.count() == count_rows('comments.csv')
+        assert django_user_model.objects.count() == count_rows('users.csv')
+
+        review = Review.objects.get(pk=1)
+        assert review.pub_date.year == 2019, (
+            'Проверьте, что при импорте сохраняется дата публикации отзыва.'
+        )
+        title = Title.objects.get(pk=review.title_id)
+        scores = title.reviews.values_list('score', flat=True)
+        assert title.reviews_count == len(scores)
+        assert title.score_sum == sum(scores), (
+            'Проверьте, что после импорта пересчитывается рейтинг '
+            'произведений.'
+        )
+
+    def test_02_truncate(self):
+        call_command('import_csv', data_dir=DATA_DIR)
+        call_command('import_csv', data_dir=DATA_DIR, truncate=True)
+        assert Review.objects.count() == count_rows('review.csv')
+
+    def test_03_parallel_import(self):
+        call_command('import_csv', data_dir=DATA_DIR, workers=2)
+        assert Review.objects.count() == count_rows('review.csv')
+        with open(
+            os.path.join(DATA_DIR, 'review.csv'), encoding='utf-8'
+        ) as file:
+            expected = {
+                int(row['id']): row['text'] for row in csv.DictReader(file)
+            }
+        assert dict(Review.objects.values_list('id', 'text')) == expected, (
+            'Проверьте, что при параллельном импорте тексты отзывов '
+            'сохраняются без искажений.'
+        )
+
+    def test_04_split_file_keeps_quoted_rows(self):
+        path = os.path.join(DATA_DIR, 'review.csv')
+        chunks = list(split_file(path, chunk_bytes=1))
+        assert len(chunks) == count_rows('review.csv'), (
+            'Проверьте, что файл делится на части только по границам '
+            'записей CSV.'
+        )
+
+    def test_05_upsert(self, tmp_path):
+        call_command('import_csv', data_dir=DATA_DIR)
+        for filename in os.listdir(DATA_DIR):
+            with open(os.path.join(DATA_DIR, filename), encoding='utf-8',
+                      newline='') as file:
+                rows = list(csv.reader(file))
+            if filename == 'review.csv':
+                rows[1][4] = '1'
+            with open(tmp_path / filename, 'w', encoding='utf-8',
+                      newline='') as file:
+                csv.writer(file).writerows(rows)
+
+        call_command('import_csv', data_dir=tmp_path, upsert=True)
+        assert Review.objects.count() == count_rows('review.csv')
+        review = Review.objects.get(pk=1)
+        assert review.score == 1, (
+            'Проверьте, что в режиме `--upsert` изменённые строки '
+            'обновляются.'
+        )
+        scores = review.title.reviews.values_list('score', flat=True)
+        assert review.title.score_sum == sum(scores)
+
+    def test_06_cache_invalidated(self, client, tmp_path):
+        call_command('import_csv', data_dir=DATA_DIR)
+        url = '/api/v1/titles/1/'
+        etag = client.get(url)['ETag']
+        for filename in os.listdir(DATA_DIR):
+            with open(os.path.join(DATA_DIR, filename), encoding='utf-8',
+                      newline='') as file:
+                rows = list(csv.reader(file))
+            if filename == 'titles.csv':
+                rows[1][1] = 'Новое название'
+            with open(tmp_path / filename, 'w', encoding='utf-8',
+                      newline='') as file:
+                csv.writer(file).writerows(rows)
+
+        call_command('import_csv', data_dir=tmp_path, upsert=True)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['name'] == 'Новое название', (
+            'Проверьте, что после импорта кеш ответов и ETag '
+            'становятся недействительными.'
+        )
+
+    def test_07_content_index(self):
+        call_command('import_csv', data_dir=DATA_DIR)
+        call_command('import_csv', data_dir=DATA_DIR, truncate=True)
+        assert TitleTerm.objects.exists()
+        assert SimilarTitle.objects.filter(
+            source=SimilarTitle.Source.CONTENT
+        ).exists(), (
+            'Проверьте, что после импорта пересчитываются термины '
+            'и похожие по содержанию произведения.'
+        )
@@ -0,0 +1,81 @@
+import gzip
+import json
+import os
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from reviews.management.commands.export_data import Command
+from reviews.management.commands.import_csv import TABLES
+from reviews.models import Comment, GenreTitle, Review, Title
+
+from tests.conftest import MANAGE_PATH
+
+DATA_DIR = os.path.join(MANAGE_PATH, 'static', 'data')
+
+
+def snapshot():
+    return {
+        model.__name__: list(model.objects.order_by('pk').values())
+        for model in (Title, GenreTitle, Review, Comment)
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14ExportData:
+
+    @pytest.mark.parametrize('file_format', ('csv', 'jsonl'))
+    @pytest.mark.parametrize('compress', (False, True))
+    def test_01_round_trip(self, tmp_path, compress, file_format):
+        call_command('import_csv', data_dir=DATA_DIR)
+        Title.objects.filter(pk=1).update(description='Описание, "в кавычках"')
+        Title.objects.filter(pk=2).update(description='')
+        expected = snapshot()
+
+        call_command(
+            'export_data', output_dir=tmp_path, gzip=compress,
+            format=file_format,
+        )
+        call_command(
+            'import_csv', data_dir=tmp_path, truncate=True,
+            format=file_format,
+        )
+        assert snapshot() == expected, (
+            'Проверьте, что выгрузка `export_data` загружается обратно '
+            'командой `import_csv` без потерь.'
+        )
+
+    def test_02_jsonl(self, tmp_path):
+        call_command('import_csv', data_dir=DATA_DIR)
+        call_command(
+            'export_data', output_dir=tmp_path, format='jsonl', gzip=True
+        )
+        with gzip.open(tmp_path / 'review.jsonl.gz', 'rt') as file:
+            rows = [json.loads(line) for line in file]
+        assert len(rows) == Review.objects.count()
+        assert set(rows[0]) == {
+            'id', 'title_id', 'text', 'author', 'score', 'pub_date'
+        }
+
+    def test_03_single_transaction(self, tmp_path):
+        call_command('import_csv', data_dir=DATA_DIR)
+        export_table = Command.export_table
+        transactions = []
+
+        def record(command, *args, **kwargs):
+            transactions.append(connection.in_atomic_block)
+            return export_table(command, *args, **kwargs)
+
+        commit = mock.patch.object(
+            connection, 'commit', wraps=connection.commit
+        )
+        with mock.patch.object(Command, 'export_table', record), \
+                commit as commit:
+            call_command('export_data', output_dir=tmp_path)
+        assert transactions == [True] * len(TABLES) and (
+            commit.call_count == 1
+        ), (
+            'Проверьте, что `export_data` читает все таблицы в одной '
+            'транзакции.'
+        )
@@ -0,0 +1,52 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15TitleSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def search(self, client, query):
+        response = client.get(self.TITLES_URL, {'search': query})
+        assert response.status_code == HTTPStatus.OK
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_search(self, admin_client, client):
+        titles, categories, genres = create_titles(admin_client)
+        assert self.search(client, 'ТЕРМИНАТ') == ['Терминатор'], (
+            'Проверьте, что параметр `search` эндпоинта `/api/v1/titles/` '
+            'ищет по началу слова в названии без учёта регистра.'
+        )
+        assert self.search(client, 'yippie') == ['Крепкий орешек'], (
+            'Проверьте, что параметр `search` эндпоинта `/api/v1/titles/` '
+            'ищет по описанию произведения.'
+        )
+        assert self.search(client, '"(*') == []
+
+        admin_client.post(self.TITLES_URL, data={
+            'name': 'Back to the Future',
+            'year': 1985,
+            'genre': [genres[1]['slug']],
+            'category': categories[0]['slug'],
+        })
+        assert self.search(client, 'back') == [
+            'Back to the Future', 'Терминатор'
+        ], (
+            'Проверьте, что совпадения в названии произведения ранжируются '
+            'выше совпадений в описании.'
+        )
+
+    def test_02_search_follows_updates(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        admin_client.patch(
+            f'{self.TITLES_URL}{titles[0]["id"]}/', data={'name': 'Ёлки'}
+        )
+        assert self.search(client, 'елки') == ['Ёлки'], (
+            'Проверьте, что поисковый индекс обновляется при изменении '
+            'произведения и не различает «е» и «ё».'
+        )
+        assert self.search(client, 'терминатор') == []
@@ -0,0 +1,82 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Genre, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16NormalizedNames:
+
+    def names(self, client, url, params):
+        response = client.get(url, params)
+        assert response.status_code == HTTPStatus.OK
+        return sorted(item['name'] for item in response.json()['results'])
+
+    def test_01_normalized_on_save(self):
+        category = Category.objects.create(name='Фильм', slug='film')
+        genre = Genre(name='Ёлочные СКАЗКИ', slug='fairy')
+        Genre.objects.bulk_create([genre])
+        title = Title.objects.create(name='ЁЖИК в тумане', year=1975)
+        assert category.name_normalized == 'фильм'
+        assert Genre.objects.get().name_normalized == 'елочные сказки'
+        title.name = 'Ёжик'
+        title.save()
+        title.refresh_from_db()
+        assert title.name_normalized == 'ежик', (
+            'Проверьте, что нормализованное название обновляется '
+            'при сохранении объекта.'
+        )
+
+    def test_02_title_name_filter(self, client):
+        Title.objects.create(name='Ёжик в тумане', year=1975)
+        Title.objects.create(name='Ёжик', year=1975)
+        url = '/api/v1/titles/'
+        assert self.names(client, url, {'name': 'ЕЖИК В ТУМАНЕ'}) == [
+            'Ёжик в тумане'
+        ], (
+            'Проверьте, что фильтр `name` эндпоинта `/api/v1/titles/` '
+            'сравнивает кириллические названия без учёта регистра и ё/е.'
+        )
+        assert self.names(client, url, {'name': 'ёжик'}) == ['Ёжик']
+
+    def test_03_search_by_prefix(self, client):
+        Category.objects.create(name='Фильм', slug='film')
+        Category.objects.create(name='Книга', slug='book')
+        Genre.objects.create(name='Драма', slug='drama')
+        Genre.objects.create(name='Мелодрама', slug='melodrama')
+        assert self.names(
+            client, '/api/v1/categories/', {'search': 'фИЛ'}
+        ) == ['Фильм'], (
+            'Проверьте, что поиск категорий идёт по началу названия '
+            'без учёта регистра.'
+        )
+        assert self.names(
+            client, '/api/v1/genres/', {'search': 'ДРАМА'}
+        ) == ['Драма']
+        assert self.names(client, '/api/v1/genres/', {'search': ''}) == [
+            'Драма', 'Мелодрама'
+        ]
+
+    def test_04_lookup_uses_index(self, client):
+        Genre.objects.create(name='Драма', slug='drama')
+        with CaptureQueriesContext(connection) as context:
+            client.get('/api/v1/genres/', {'search': 'драм'})
+        sql = next(
+            query['sql'] for query in context.captured_queries
+            if 'name_normalized' in query['sql']
+        )
+        assert ' LIKE ' not in sql.upper(), (
+            'Проверьте, что поиск по названию не использует LIKE.'
+        )
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'EXPLAIN QUERY PLAN SELECT id FROM reviews_genre '
+                    'WHERE name_normalized >= %s AND name_normalized < %s',
+                    ['драм', 'драм\U0010ffff'],
+                )
+                plan = ' '.join(str(row[-1]) for row in cursor.fetchall())
+            assert 'INDEX' in plan.upper()
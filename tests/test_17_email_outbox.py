@@ -0,0 +1,174 @@
+import socketserver
+import threading
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.utils import timezone
+
+from users.management.commands.send_emails import (
+    claim_batch,
+    get_due_ids,
+    lease,
+)
+from users.models import OutgoingEmail
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough of SMTP to accept the messages of the smtp backend."""
+
+    def reply(self, line):
+        self.wfile.write(f'{line}\r\n'.encode('ascii'))
+
+    def handle(self):
+        self.server.connections += 1
+        self.reply('220 localhost')
+        for line in self.rfile:
+            command = line.decode('ascii').strip().upper()
+            if command.startswith('DATA'):
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                lines = []
+                for data_line in self.rfile:
+                    if data_line == b'.\r\n':
+                        break
+                    lines.append(data_line)
+                self.server.messages.append(b''.join(lines).decode('utf-8'))
+                self.reply('250 OK')
+            elif command.startswith('QUIT'):
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('250 OK')
+
+
+@pytest.fixture
+def smtp_server(settings):
+    server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), SMTPHandler)
+    server.daemon_threads = True
+    server.connections = 0
+    server.messages = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    settings.EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+    settings.EMAIL_HOST = '127.0.0.1'
+    settings.EMAIL_PORT = server.server_address[1]
+    settings.EMAIL_TIMEOUT = 5
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17EmailOutbox:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    def test_01_signup_queues_email(self, client):
+        data = {'email': 'outbox@yamdb.fake', 'username': 'outbox'}
+        client.post(self.URL_SIGNUP, data=data)
+        email = OutgoingEmail.objects.get()
+        assert email.recipient == data['email'], (
+            'Проверьте, что при регистрации письмо с кодом подтверждения '
+            'записывается в очередь на отправку.'
+        )
+        assert email.attempts == 0
+        assert email.next_attempt_at <= timezone.now()
+        assert not mail.outbox, (
+            'Проверьте, что письмо не отправляется во время запроса.'
+        )
+
+    def test_02_worker_sends_batch_over_one_connection(self, smtp_server):
+        for index in range(5):
+            OutgoingEmail.objects.create(
+                subject='Your login code',
+                message=f'code-{index}',
+                from_email='from@example.com',
+                recipient=f'user{index}@yamdb.fake',
+            )
+        call_command('send_emails', batch_size=10)
+        assert len(smtp_server.messages) == 5, (
+            'Проверьте, что команда `send_emails` отправляет письма '
+            'из очереди.'
+        )
+        assert smtp_server.connections == 1, (
+            'Проверьте, что письма одной пачки отправляются через одно '
+            'соединение.'
+        )
+        assert not OutgoingEmail.objects.exists()
+
+    def test_03_worker_retries_with_backoff(self, settings, smtp_server):
+        email = OutgoingEmail.objects.create(
+            subject='Your login code',
+            message='code',
+            from_email='from@example.com',
+            recipient='retry@yamdb.fake',
+        )
+        port = settings.EMAIL_PORT
+        settings.EMAIL_PORT = 1
+        call_command('send_emails', retry_delay=60)
+        email.refresh_from_db()
+        assert email.attempts == 1
+        assert email.last_error
+        delay = email.next_attempt_at - timezone.now()
+        assert timedelta(seconds=50) < delay <= timedelta(seconds=60), (
+            'Проверьте, что после неудачной отправки письмо откладывается '
+            'на время задержки.'
+        )
+
+        call_command('send_emails', retry_delay=60)
+        email.refresh_from_db()
+        assert email.attempts == 1, (
+            'Проверьте, что письмо не отправляется повторно раньше времени.'
+        )
+
+        OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+        call_command('send_emails', retry_delay=60)
+        email.refresh_from_db()
+        assert email.attempts == 2
+        delay = email.next_attempt_at - timezone.now()
+        assert timedelta(seconds=110) < delay <= timedelta(seconds=120), (
+            'Проверьте, что задержка растёт с каждой неудачной попыткой.'
+        )
+
+        settings.EMAIL_PORT = port
+        OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+        call_command('send_emails')
+        assert not OutgoingEmail.objects.exists()
+        assert len(smtp_server.messages) == 1
+
+    def test_04_worker_gives_up(self, settings):
+        settings.EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+        settings.EMAIL_HOST = '127.0.0.1'
+        settings.EMAIL_PORT = 1
+        OutgoingEmail.objects.create(
+            subject='Your login code',
+            message='code',
+            from_email='from@example.com',
+            recipient='lost@yamdb.fake',
+        )
+        call_command('send_emails', max_attempts=1)
+        email = OutgoingEmail.objects.get()
+        assert email.next_attempt_at is None, (
+            'Проверьте, что после исчерпания попыток письмо больше '
+            'не отправляется.'
+        )
+
+    def test_05_one_worker_claims_an_email(self):
+        for index in range(3):
+            OutgoingEmail.objects.create(
+                subject='Your login code',
+                message=f'code-{index}',
+                from_email='from@example.com',
+                recipient=f'claim{index}@yamdb.fake',
+            )
+        now = timezone.now()
+        # Both workers read the same due emails, the first one leases them.
+        due = get_due_ids(10, now)
+        first = claim_batch(10)
+        assert len(first) == 3
+        assert lease(due, now) == [], (
+            'Проверьте, что письмо, взятое одним обработчиком, '
+            'не достаётся другому.'
+        )
+        assert claim_batch(10) == []
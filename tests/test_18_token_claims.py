@@ -0,0 +1,100 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from reviews.models import Title
+
+
+def get_token_client(user):
+    response = APIClient().post('/api/v1/auth/token/', data={
+        'username': user.username,
+        'confirmation_code': default_token_generator.make_token(user),
+    })
+    assert response.status_code == HTTPStatus.OK
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {response.json()["token"]}')
+    return client
+
+
+def count_user_queries(client, method, url, **kwargs):
+    with CaptureQueriesContext(connection) as context:
+        response = getattr(client, method)(url, **kwargs)
+    queries = [
+        query['sql'] for query in context.captured_queries
+        if 'FROM "users_useryamdb"' in query['sql']
+    ]
+    return response, len(queries)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18TokenClaims:
+
+    USERS_URL = '/api/v1/users/'
+
+    def test_01_permissions_without_user_query(self, admin, user):
+        client = get_token_client(admin)
+        response, queries = count_user_queries(
+            client, 'get', f'{self.USERS_URL}{user.username}/'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert queries == 1, (
+            'Проверьте, что права администратора проверяются по токену '
+            'без запроса пользователя к базе данных.'
+        )
+
+    def test_02_role_change_takes_effect(self, admin_client, user):
+        client = get_token_client(user)
+        response = client.get(self.USERS_URL)
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+        admin_client.patch(
+            f'{self.USERS_URL}{user.username}/', data={'role': 'admin'}
+        )
+        response = client.get(self.USERS_URL)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение роли пользователя учитывается '
+            'для уже выданных токенов.'
+        )
+
+        admin_client.patch(
+            f'{self.USERS_URL}{user.username}/', data={'role': 'user'}
+        )
+        response = client.get(self.USERS_URL)
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+    def test_03_deleted_user_is_rejected(self, admin_client, user):
+        client = get_token_client(user)
+        admin_client.delete(f'{self.USERS_URL}{user.username}/')
+        response = client.get(f'{self.USERS_URL}me/')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что токен удалённого пользователя не принимается.'
+        )
+
+    def test_04_token_user_writes(self, user):
+        client = get_token_client(user)
+        response = client.get(f'{self.USERS_URL}me/')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['bio'] == user.bio
+        response = client.patch(
+            f'{self.USERS_URL}me/', data={'first_name': 'Иван'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        user.refresh_from_db()
+        assert user.first_name == 'Иван'
+        assert user.bio == 'user bio', (
+            'Проверьте, что изменение профиля не затирает другие поля.'
+        )
+
+        title = Title.objects.create(name='Терминатор', year=1984)
+        response = client.post(
+            f'/api/v1/titles/{title.id}/reviews/',
+            data={'text': 'Отлично', 'score': 9},
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['author'] == user.username, (
+            'Проверьте, что пользователь из токена сохраняется автором отзыва.'
+        )
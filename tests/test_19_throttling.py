@@ -0,0 +1,129 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from api.v1.throttling import TokenBucketThrottle, fallback_cache, get_stats
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19Throttling:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    URL_TOKEN = '/api/v1/auth/token/'
+
+    def signup(self, client, index):
+        return client.post(self.URL_SIGNUP, data={
+            'email': 'bot@yamdb.fake',
+            'username': f'bot{index}',
+        })
+
+    def test_01_signup_by_email(self, client, settings, caplog,
+                                django_assert_num_queries):
+        settings.THROTTLE_BUCKETS = {
+            'signup': {'ip': '100/min', 'email': '3/hour'},
+        }
+        for index in range(3):
+            assert self.signup(client, index).status_code != (
+                HTTPStatus.TOO_MANY_REQUESTS
+            )
+        with django_assert_num_queries(0), caplog.at_level(
+            logging.INFO, logger='api.v1.throttling'
+        ):
+            response = self.signup(client, 3)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            f'Проверьте, что эндпоинт `{self.URL_SIGNUP}` ограничивает '
+            'частоту запросов с одним email до обращения к базе данных.'
+        )
+        assert int(response['Retry-After']) > 0
+        assert 'Throttled signup by email' in caplog.text
+        assert 'bot@yamdb.fake' not in caplog.text, (
+            'Проверьте, что в журнал пишется хеш email, а не сам адрес.'
+        )
+        response = client.post(self.URL_SIGNUP, data={
+            'email': 'other@yamdb.fake', 'username': 'other',
+        })
+        assert response.status_code == HTTPStatus.OK
+
+    def test_02_token_by_ip(self, client, settings):
+        settings.THROTTLE_BUCKETS = {'token': {'ip': '2/min'}}
+        data = {'username': 'nobody', 'confirmation_code': '1'}
+        statuses = [
+            client.post(self.URL_TOKEN, data=data).status_code
+            for _ in range(3)
+        ]
+        assert statuses == [
+            HTTPStatus.NOT_FOUND,
+            HTTPStatus.NOT_FOUND,
+            HTTPStatus.TOO_MANY_REQUESTS,
+        ], (
+            f'Проверьте, что эндпоинт `{self.URL_TOKEN}` ограничивает '
+            'частоту запросов с одного адреса.'
+        )
+        response = client.post(
+            self.URL_TOKEN, data=data, HTTP_X_FORWARDED_FOR='10.0.0.3'
+        )
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что заголовок X-Forwarded-For без прокси '
+            'не сбрасывает ограничение.'
+        )
+        response = client.post(
+            self.URL_TOKEN, data=data, REMOTE_ADDR='10.0.0.2'
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_03_fallback_and_stats(self, client, settings):
+        settings.THROTTLE_CACHE = 'missing'
+        settings.THROTTLE_BUCKETS = {'signup': {'email': '1/hour'}}
+        fallback_cache.clear()
+        self.signup(client, 0)
+        response = self.signup(client, 1)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что без общего хранилища ограничение работает '
+            'в памяти процесса.'
+        )
+        assert get_stats() == {
+            ('signup', 'email'): {'allowed': 1, 'rejected': 1},
+        }
+        call_command('throttle_stats')
+
+    def test_04_concurrent_tokens(self, settings, monkeypatch):
+        settings.THROTTLE_CACHE = 'missing'
+        fallback_cache.clear()
+        get = fallback_cache.get
+
+        def slow_get(*args, **kwargs):
+            # Widens the window between reading and writing a bucket.
+            value = get(*args, **kwargs)
+            time.sleep(0.005)
+            return value
+
+        monkeypatch.setattr(fallback_cache, 'get', slow_get)
+        throttle = TokenBucketThrottle()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            waits = list(executor.map(
+                lambda _: throttle.take_token('bucket:race', '5/hour'),
+                range(40),
+            ))
+        waits += [
+            throttle.take_token('bucket:race', '5/hour') for _ in range(10)
+        ]
+        assert sum(wait == 0 for wait in waits) == 5, (
+            'Проверьте, что одновременные запросы не берут из корзины '
+            'больше токенов, чем в ней есть.'
+        )
+
+    def test_05_locked_bucket(self, settings):
+        settings.THROTTLE_CACHE = 'missing'
+        fallback_cache.clear()
+        fallback_cache.add('bucket:busy:lock', 1, 60)
+        started = time.monotonic()
+        wait = TokenBucketThrottle().take_token('bucket:busy', '5/hour')
+        assert wait > 0
+        assert time.monotonic() - started < 0.1, (
+            'Проверьте, что запрос к занятой корзине отклоняется сразу, '
+            'без ожидания.'
+        )
@@ -0,0 +1,138 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.utils import timezone
+
+from reviews.models import (
+    Category, Genre, RankingPrior, Review, Title, TitleRanking
+)
+from reviews.ranking import get_prior, weighted_rating
+
+
+@pytest.fixture
+def ranked_titles(django_user_model):
+    users = [
+        django_user_model.objects.create_user(
+            username=f'reviewer{index}', email=f'reviewer{index}@yamdb.fake'
+        )
+        for index in range(6)
+    ]
+    film = Category.objects.create(name='Фильм', slug='film')
+    book = Category.objects.create(name='Книга', slug='book')
+    drama = Genre.objects.create(name='Драма', slug='drama')
+    single = Title.objects.create(name='Один отзыв', year=2000, category=film)
+    popular = Title.objects.create(name='Популярный', year=2000, category=film)
+    popular.genre.add(drama)
+    weak = Title.objects.create(name='Слабый', year=2000, category=book)
+    Title.objects.create(name='Без отзывов', year=2000, category=book)
+    Review.objects.create(title=single, author=users[0], text='.', score=10)
+    for user in users:
+        Review.objects.create(title=popular, author=user, text='.', score=9)
+    for user in users[:3]:
+        Review.objects.create(title=weak, author=user, text='.', score=3)
+    return single, popular, weak
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20TopTitles:
+
+    TOP_URL = '/api/v1/titles/top/'
+
+    def names(self, client, params=None):
+        response = client.get(self.TOP_URL, params or {})
+        assert response.status_code == HTTPStatus.OK
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_weighted_order(self, client, ranked_titles):
+        call_command('rank_titles')
+        assert self.names(client) == ['Популярный', 'Один отзыв', 'Слабый'], (
+            f'Проверьте, что `{self.TOP_URL}` упорядочивает произведения '
+            'по байесовскому рейтингу и не показывает произведения '
+            'без отзывов.'
+        )
+        assert self.names(client, {'category': 'book'}) == ['Слабый']
+        assert self.names(client, {'genre': 'drama'}) == ['Популярный']
+
+    def test_02_updated_with_reviews(self, client, ranked_titles,
+                                     django_user_model):
+        single, popular, weak = ranked_titles
+        for index in range(6):
+            Review.objects.create(
+                title=single,
+                author=django_user_model.objects.create_user(
+                    username=f'fan{index}', email=f'fan{index}@yamdb.fake'
+                ),
+                text='.',
+                score=10,
+            )
+        assert self.names(client)[0] == 'Один отзыв', (
+            'Проверьте, что рейтинг обновляется при добавлении отзывов.'
+        )
+        Review.objects.filter(title=weak).delete()
+        assert not TitleRanking.objects.filter(title=weak).exists()
+        popular.delete()
+        assert self.names(client) == ['Один отзыв']
+
+    def test_03_category_change(self, client, ranked_titles):
+        single, popular, weak = ranked_titles
+        weak.category = Category.objects.get(slug='film')
+        weak.save()
+        assert self.names(client, {'category': 'film'})[-1] == 'Слабый'
+
+    def test_04_cursor_pages(self, client, ranked_titles):
+        call_command('rank_titles')
+        response = client.get(self.TOP_URL, {'cursor': '', 'limit': 2})
+        data = response.json()
+        names = [title['name'] for title in data['results']]
+        response = client.get(data['next'])
+        names += [title['name'] for title in response.json()['results']]
+        assert names == ['Популярный', 'Один отзыв', 'Слабый']
+        assert response.json()['results'][0]['weighted_rating'] < 9
+
+    def test_05_shared_prior(self, ranked_titles,
+                             django_assert_num_queries):
+        call_command('rank_titles')
+        prior = RankingPrior.objects.get()
+        assert (prior.mean_score, prior.prior_weight) == (
+            pytest.approx(73 / 10), pytest.approx(10 / 3)
+        )
+        cache.clear()
+        with django_assert_num_queries(1):
+            assert get_prior() == (prior.mean_score, prior.prior_weight), (
+                'Проверьте, что априорная оценка рейтинга хранится в базе '
+                'данных и видна всем процессам.'
+            )
+
+    def test_06_prior_from_rebuild_only(self, ranked_titles,
+                                        django_user_model):
+        single, popular, weak = ranked_titles
+        call_command('rank_titles')
+        RankingPrior.objects.update(
+            computed_at=timezone.now() - timedelta(days=1)
+        )
+        prior = get_prior()
+        weak_rating = TitleRanking.objects.get(title=weak).weighted_rating
+        Review.objects.create(
+            title=popular,
+            author=django_user_model.objects.create_user(
+                username='late', email='late@yamdb.fake'
+            ),
+            text='.',
+            score=1,
+        )
+        assert get_prior() == prior, (
+            'Проверьте, что априорная оценка пересчитывается только '
+            'при полном пересчёте рейтинга.'
+        )
+        popular.refresh_from_db()
+        assert TitleRanking.objects.get(
+            title=popular
+        ).weighted_rating == pytest.approx(weighted_rating(
+            popular.score_sum, popular.reviews_count, prior
+        ))
+        assert TitleRanking.objects.get(
+            title=weak
+        ).weighted_rating == weak_rating
@@ -0,0 +1,121 @@
+from datetime import timedelta
+from http import HTTPStatus
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import QuerySet
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from reviews.models import Review, Title, TitleTrend
+from reviews.trending import add_log, get_log_weight, update_title_trend
+
+
+@pytest.fixture
+def reviewers(django_user_model):
+    return [
+        django_user_model.objects.create_user(
+            username=f'reviewer{index}', email=f'reviewer{index}@yamdb.fake'
+        )
+        for index in range(3)
+    ]
+
+
+def review(title, author, score=10):
+    return Review.objects.create(
+        title=title, author=author, text='.', score=score
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21Trending:
+
+    TRENDING_URL = '/api/v1/titles/trending/'
+
+    def names(self, client):
+        response = client.get(self.TRENDING_URL)
+        assert response.status_code == HTTPStatus.OK
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_recent_activity(self, client, reviewers):
+        busy = Title.objects.create(name='Обсуждаемый', year=2000)
+        quiet = Title.objects.create(name='Тихий', year=2000)
+        Title.objects.create(name='Без отзывов', year=2000)
+        for author in reviewers:
+            review(busy, author)
+        review(quiet, reviewers[0])
+        assert self.names(client) == ['Обсуждаемый', 'Тихий'], (
+            f'Проверьте, что `{self.TRENDING_URL}` упорядочивает '
+            'произведения по недавней активности отзывов.'
+        )
+        score = client.get(self.TRENDING_URL).json()['results'][0][
+            'trend_score'
+        ]
+        assert score == pytest.approx(3, rel=1e-3)
+
+    def test_02_decay(self, client, reviewers):
+        old = Title.objects.create(name='Старый', year=2000)
+        fresh = Title.objects.create(name='Свежий', year=2000)
+        for author in reviewers:
+            review(old, author)
+        review(fresh, reviewers[0], score=5)
+        Review.objects.filter(title=old).update(
+            pub_date=timezone.now() - timedelta(days=9)
+        )
+        call_command('trend_titles')
+        assert self.names(client) == ['Свежий', 'Старый'], (
+            'Проверьте, что вклад отзывов убывает со временем.'
+        )
+        Review.objects.filter(title=old).update(
+            pub_date=timezone.now() - timedelta(days=60)
+        )
+        call_command('trend_titles')
+        assert self.names(client) == ['Свежий']
+
+    def test_03_updates_and_deletes(self, client, reviewers):
+        first = Title.objects.create(name='Первый', year=2000)
+        second = Title.objects.create(name='Второй', year=2000)
+        first_review = review(first, reviewers[0], score=2)
+        review(second, reviewers[0], score=4)
+        assert self.names(client) == ['Второй', 'Первый']
+        first_review.score = 9
+        first_review.save()
+        assert self.names(client) == ['Первый', 'Второй'], (
+            'Проверьте, что изменение оценки учитывается в трендах.'
+        )
+        first_review.delete()
+        assert not TitleTrend.objects.filter(title=first).exists()
+        assert self.names(client) == ['Второй']
+
+    def test_04_constant_queries(self, client, reviewers):
+        def count_queries():
+            with CaptureQueriesContext(connection) as context:
+                client.get(self.TRENDING_URL)
+            return len(context.captured_queries)
+
+        title = Title.objects.create(name='Первый', year=2000)
+        review(title, reviewers[0])
+        expected = count_queries()
+        for index in range(5):
+            title = Title.objects.create(name=f'Другой {index}', year=2000)
+            review(title, reviewers[1])
+        assert count_queries() == expected
+
+    def test_05_concurrent_first_reviews(self, reviewers):
+        title = Title.objects.create(name='Первый', year=2000)
+        review(title, reviewers[0])
+        before = TitleTrend.objects.get(title=title).log_score
+        pub_date = timezone.now()
+
+        # The row of the other first review is not seen by the lookup.
+        with mock.patch.object(QuerySet, 'first', return_value=None):
+            update_title_trend(title.pk, 10, pub_date)
+
+        assert TitleTrend.objects.get(title=title).log_score == (
+            pytest.approx(add_log(before, get_log_weight(10, pub_date)))
+        ), (
+            'Проверьте, что одновременные первые отзывы о произведении '
+            'не приводят к ошибке и оба учитываются в трендах.'
+        )
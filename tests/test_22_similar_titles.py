@@ -0,0 +1,64 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Review, SimilarTitle, Title
+from reviews.similarity import compute_similar_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22SimilarTitles:
+
+    def test_01_neighbours(self):
+        # Authors 1-3 like A and B and dislike C, author 4 likes C only.
+        reviews = [
+            (1, 'A', 9), (1, 'B', 10), (1, 'C', 2),
+            (2, 'A', 8), (2, 'B', 9), (2, 'C', 3),
+            (3, 'A', 10), (3, 'B', 9), (3, 'C', 1),
+            (4, 'C', 9), (4, 'D', 2),
+            (5, 'E', 7),
+        ]
+        similar = {}
+        for title, other, score in compute_similar_titles(reviews):
+            similar.setdefault(title, []).append(other)
+            assert 0 < score <= 1
+        assert similar['A'] == ['B'], (
+            'Проверьте, что похожими считаются произведения, которые '
+            'одни и те же авторы оценивают одинаково.'
+        )
+        assert similar['B'] == ['A']
+        assert 'E' not in similar
+
+    def test_02_endpoint(self, client, django_user_model):
+        users = [
+            django_user_model.objects.create_user(
+                username=f'reviewer{index}', email=f'r{index}@yamdb.fake'
+            )
+            for index in range(3)
+        ]
+        first, second, third = (
+            Title.objects.create(name=name, year=2000)
+            for name in ('Первый', 'Второй', 'Третий')
+        )
+        for user in users:
+            for title, score in ((first, 9), (second, 9), (third, 2)):
+                Review.objects.create(
+                    title=title, author=user, text='.', score=score
+                )
+        call_command('similar_titles')
+        url = f'/api/v1/titles/{first.id}/similar/'
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что эндпоинт `{url}` доступен без токена.'
+        )
+        data = response.json()
+        assert [title['name'] for title in data] == ['Второй']
+        assert data[0]['similarity'] == pytest.approx(
+            SimilarTitle.objects.get(title=first).score
+        )
+
+        response = client.get(f'/api/v1/titles/{third.id}/similar/')
+        assert response.json() == []
+        response = client.get('/api/v1/titles/999/similar/')
+        assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,121 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.content_similarity import jaccard, tokenize
+from reviews.models import (
+    Category, Genre, SimilarTitle, TermFrequency, Title, TitleTerm
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23ContentSimilarity:
+
+    URL_TITLES = '/api/v1/titles/'
+
+    def test_01_helpers(self):
+        assert tokenize('Ёжик в тумане, 1975') == ['ежик', 'тумане']
+        assert jaccard(0b0110, 0b0011) == pytest.approx(1 / 3)
+        assert jaccard(0, 0) == 0
+
+    def create_titles(self, admin_client):
+        Category.objects.create(name='Фильм', slug='movie')
+        for slug in ('drama', 'space', 'comedy'):
+            Genre.objects.create(name=slug, slug=slug)
+        titles = (
+            ('Звёздный путь', 'Экипаж корабля летит к далёким звёздам.',
+             ['space', 'drama']),
+            ('Звёздные войны', 'Повстанцы сражаются с империей у звёзд.',
+             ['space']),
+            ('Любовь и голуби', 'Деревенская история о семье.',
+             ['comedy']),
+        )
+        ids = []
+        for name, description, genre in titles:
+            response = admin_client.post(self.URL_TITLES, data={
+                'name': name,
+                'year': 1980,
+                'description': description,
+                'genre': genre,
+                'category': 'movie',
+            })
+            assert response.status_code == HTTPStatus.CREATED
+            ids.append(response.json()['id'])
+        return ids
+
+    def test_02_refreshed_on_save(self, admin_client, client):
+        trek, wars, pigeons = self.create_titles(admin_client)
+        response = client.get(f'{self.URL_TITLES}{trek}/similar/')
+        assert response.status_code == HTTPStatus.OK
+        assert [title['id'] for title in response.json()] == [wars], (
+            'Проверьте, что произведение без рецензий получает похожие '
+            'по жанрам и описанию сразу после сохранения.'
+        )
+        assert client.get(
+            f'{self.URL_TITLES}{wars}/similar/'
+        ).json()[0]['id'] == trek
+        assert client.get(f'{self.URL_TITLES}{pigeons}/similar/').json() == []
+
+        admin_client.patch(
+            f'{self.URL_TITLES}{pigeons}/', data={'genre': ['space']}
+        )
+        response = client.get(f'{self.URL_TITLES}{pigeons}/similar/')
+        assert {title['id'] for title in response.json()} == {trek, wars}, (
+            'Проверьте, что изменение произведения обновляет похожие '
+            'произведения по содержанию.'
+        )
+
+    def test_03_rebuild(self, admin_client):
+        self.create_titles(admin_client)
+        stored = set(SimilarTitle.objects.values_list(
+            'title_id', 'similar_id', 'score'
+        ))
+        SimilarTitle.objects.all().delete()
+        call_command('content_similar_titles')
+        rebuilt = set(SimilarTitle.objects.filter(
+            source=SimilarTitle.Source.CONTENT
+        ).values_list('title_id', 'similar_id', 'score'))
+        assert {row[:2] for row in rebuilt} == {row[:2] for row in stored}, (
+            'Проверьте, что полный пересчёт совпадает '
+            'с обновлением при сохранении.'
+        )
+        assert Title.objects.count() == 3
+
+    def stored_state(self):
+        terms = set(TitleTerm.objects.values_list('title_id', 'term', 'count'))
+        frequencies = set(
+            TermFrequency.objects.values_list('term', 'documents')
+        )
+        scores = {
+            (title_id, similar_id): score
+            for title_id, similar_id, score in SimilarTitle.objects.filter(
+                source=SimilarTitle.Source.CONTENT
+            ).values_list('title_id', 'similar_id', 'score')
+        }
+        return terms, frequencies, scores
+
+    def test_04_stored_terms(self, admin_client):
+        trek, wars, pigeons = self.create_titles(admin_client)
+        admin_client.patch(
+            f'{self.URL_TITLES}{wars}/',
+            data={'description': 'Джедаи сражаются с империей.'},
+        )
+        admin_client.delete(f'{self.URL_TITLES}{pigeons}/')
+        terms, frequencies, scores = self.stored_state()
+        assert 'голуби' not in dict(frequencies)
+        assert scores
+        call_command('content_similar_titles')
+        rebuilt_terms, rebuilt_frequencies, rebuilt_scores = (
+            self.stored_state()
+        )
+        assert (terms, frequencies) == (
+            rebuilt_terms, rebuilt_frequencies
+        ), (
+            'Проверьте, что термины произведений и их частоты '
+            'обновляются при изменении и удалении произведений.'
+        )
+        assert scores == pytest.approx(rebuilt_scores), (
+            'Проверьте, что обновление при сохранении даёт ту же '
+            'близость, что и полный пересчёт.'
+        )
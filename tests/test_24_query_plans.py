@@ -0,0 +1,35 @@
+import pytest
+from django.core.management import call_command
+
+from api.v1.query_plans import find_problems
+from reviews.models import Category, Genre, Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24QueryPlans:
+
+    def test_01_find_problems(self):
+        plan = '\n'.join((
+            '3 0 0 SCAN reviews_genretitle',
+            '6 0 0 SCAN reviews_title USING INDEX title_year_name_id_idx',
+            '9 0 0 SEARCH reviews_category USING INTEGER PRIMARY KEY '
+            '(rowid=?)',
+            '12 0 0 USE TEMP B-TREE FOR ORDER BY',
+            '15 0 0 USE TEMP B-TREE FOR RIGHT PART OF ORDER BY',
+        ))
+        assert find_problems(plan) == [
+            '3 0 0 SCAN reviews_genretitle',
+            '12 0 0 USE TEMP B-TREE FOR ORDER BY',
+        ]
+        assert find_problems(plan, allow_sort=True) == [
+            '3 0 0 SCAN reviews_genretitle',
+        ]
+
+    def test_02_endpoints_use_indexes(self, admin):
+        category = Category.objects.create(name='Фильм', slug='movie')
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        title = Title.objects.create(name='Матрица', year=1999,
+                                     category=category)
+        title.genre.add(genre)
+        Review.objects.create(title=title, author=admin, text='.', score=9)
+        call_command('check_query_plans')
@@ -0,0 +1,47 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25SqliteProfile:
+
+    def test_01_pragmas(self, settings, tmp_path):
+        assert settings.DATABASES['default']['CONN_MAX_AGE'] > 0, (
+            'Проверьте, что соединения с базой данных переиспользуются '
+            'между запросами.'
+        )
+        wrapper = DatabaseWrapper(
+            {**connection.settings_dict, 'NAME': str(tmp_path / 'db.sqlite3')}
+        )
+        try:
+            with wrapper.cursor() as cursor:
+                values = {
+                    name: cursor.execute(f'PRAGMA {name}').fetchone()[0]
+                    for name in ('journal_mode', 'synchronous',
+                                 'busy_timeout', 'temp_store')
+                }
+        finally:
+            wrapper.close()
+        assert values == {
+            'journal_mode': 'wal',
+            'synchronous': 1,
+            'busy_timeout': 5000,
+            'temp_store': 2,
+        }, (
+            'Проверьте, что новые соединения с SQLite получают '
+            'настройки из `SQLITE_PRAGMAS`.'
+        )
+
+    def test_02_benchmark(self):
+        out = StringIO()
+        call_command(
+            'benchmark_sqlite', seconds=0.2, readers=1, rows=100, stdout=out
+        )
+        lines = out.getvalue().splitlines()
+        assert [line.split(':')[0] for line in lines] == [
+            'default', 'SQLITE_PRAGMAS'
+        ]
@@ -0,0 +1,78 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+
+from reviews.models import Category, Genre, Review, Title
+
+
+@pytest.mark.django_db(transaction=True, databases=['default', 'replica'])
+class Test26Replicas:
+
+    URL_TITLES = '/api/v1/titles/'
+
+    @pytest.fixture(autouse=True)
+    def replicas(self, settings):
+        settings.DATABASE_REPLICAS = ('replica',)
+
+    def names(self, client):
+        response = client.get(self.URL_TITLES)
+        assert response.status_code == HTTPStatus.OK
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_reads_from_replica(self, client):
+        Title.objects.create(name='Копия', year=2000)
+        call_command('refresh_replicas')
+        Title.objects.create(name='После копии', year=2001)
+        assert self.names(client) == ['Копия'], (
+            'Проверьте, что списки произведений читаются из реплики.'
+        )
+        assert Title.objects.using('replica').count() == 1
+        call_command('refresh_replicas')
+        assert self.names(client) == ['Копия', 'После копии'], (
+            'Проверьте, что обновление реплики сбрасывает кеш ответов, '
+            'прочитанных из неё.'
+        )
+
+    def test_02_author_sees_own_review(self, user_client, client):
+        title = Title.objects.create(name='Произведение', year=2000)
+        call_command('refresh_replicas')
+        url = f'{self.URL_TITLES}{title.id}/reviews/'
+        response = user_client.post(url, data={'text': 'Текст', 'score': 7})
+        assert response.status_code == HTTPStatus.CREATED
+        assert user_client.get(url).json()['count'] == 1, (
+            'Проверьте, что после записи пользователь читает основную '
+            'базу данных и видит свой отзыв.'
+        )
+        assert client.get(url).json()['count'] == 0
+        assert Review.objects.using('replica').count() == 0
+
+    def test_03_replica_reads_not_cached(self, admin_client, client):
+        Category.objects.create(name='Фильм', slug='movie')
+        Genre.objects.create(name='Драма', slug='drama')
+        call_command('refresh_replicas')
+        response = admin_client.post(self.URL_TITLES, data={
+            'name': 'Новое', 'year': 2000,
+            'genre': ['drama'], 'category': 'movie',
+        })
+        assert response.status_code == HTTPStatus.CREATED
+        assert self.names(client) == []
+        assert self.names(admin_client) == ['Новое'], (
+            'Проверьте, что ответы, прочитанные из реплики, '
+            'не сохраняются в кеш ответов.'
+        )
+        assert self.names(client) == ['Новое']
+
+    def test_04_sticky_in_every_process(self, user_client):
+        title = Title.objects.create(name='Произведение', year=2000)
+        call_command('refresh_replicas')
+        url = f'{self.URL_TITLES}{title.id}/reviews/'
+        response = user_client.post(url, data={'text': 'Текст', 'score': 7})
+        assert response.status_code == HTTPStatus.CREATED
+        # The next request is served by a process with its own memory.
+        cache.clear()
+        assert user_client.get(url).json()['count'] == 1, (
+            'Проверьте, что признак чтения из основной базы после записи '
+            'виден всем процессам сервера.'
+        )
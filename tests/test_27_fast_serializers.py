@@ -0,0 +1,91 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+
+from api.v1.fast_serializers import RowSerializer
+from reviews.models import Category, Comment, Genre, Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27FastSerializers:
+
+    def create_data(self, admin, user):
+        movie = Category.objects.create(name='Фильм', slug='movie')
+        genres = [
+            Genre.objects.create(name=name, slug=slug)
+            for name, slug in (('Драма', 'drama'), ('Боевик', 'action'),
+                               ('Комедия', 'comedy'))
+        ]
+        matrix = Title.objects.create(
+            name='Матрица', year=1999, category=movie,
+            description='Нео выбирает таблетку.',
+        )
+        matrix.genre.set(genres[:2])
+        Title.objects.create(name='Без категории', year=1999)
+        sequel = Title.objects.create(
+            name='Матрица: Перезагрузка', year=2003, category=movie,
+        )
+        sequel.genre.set(genres[1:])
+        for author, score in ((admin, 9), (user, 6)):
+            review = Review.objects.create(
+                title=matrix, author=author, text='Отзыв', score=score
+            )
+            Comment.objects.create(review=review, author=user, text='Да')
+        return matrix, review
+
+    def get_both(self, client, settings, url):
+        responses = []
+        for fast in (False, True):
+            settings.FAST_READ_SERIALIZERS = fast
+            cache.clear()
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            responses.append(response.content)
+        return responses
+
+    def test_01_parity(self, client, settings, admin, user):
+        title, review = self.create_data(admin, user)
+        reviews_url = f'/api/v1/titles/{title.id}/reviews/'
+        for url in (
+            '/api/v1/titles/',
+            '/api/v1/titles/?limit=2&offset=1',
+            '/api/v1/titles/?cursor=&limit=2',
+            '/api/v1/titles/?genre=action',
+            '/api/v1/titles/?category=movie&year=1999',
+            '/api/v1/titles/?search=матрица',
+            reviews_url,
+            f'{reviews_url}?cursor=&limit=1',
+            f'{reviews_url}{review.id}/comments/',
+            f'{reviews_url}{review.id}/comments/?cursor=',
+        ):
+            standard, fast = self.get_both(client, settings, url)
+            assert fast == standard, (
+                f'Проверьте, что быстрый сериализатор списка `{url}` '
+                'возвращает тот же ответ, что и обычный.'
+            )
+
+    def test_02_next_cursor(self, client, settings, admin, user):
+        self.create_data(admin, user)
+        settings.FAST_READ_SERIALIZERS = True
+        page = client.get('/api/v1/titles/?cursor=&limit=2').json()
+        names = [title['name'] for title in page['results']]
+        page = client.get(page['next']).json()
+        names += [title['name'] for title in page['results']]
+        assert names == [
+            'Без категории', 'Матрица', 'Матрица: Перезагрузка'
+        ]
+
+    def test_03_default_representation(self, admin, user):
+        title, _ = self.create_data(admin, user)
+
+        class NameRowSerializer(RowSerializer):
+            columns = ('id', 'name')
+
+        rows = NameRowSerializer.get_rows(Title.objects.order_by('id'))
+        assert NameRowSerializer(rows, many=True).data[0] == {
+            'id': title.id, 'name': 'Матрица',
+        }, (
+            'Проверьте, что сериализатор строк по умолчанию '
+            'возвращает колонки по именам.'
+        )
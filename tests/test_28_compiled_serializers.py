@@ -0,0 +1,82 @@
+import pytest
+from rest_framework import serializers
+
+from api.v1 import serializers as api_serializers
+from api.v1.compiled import CompiledModelSerializer
+from reviews.models import Category, Comment, Genre, Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28CompiledSerializers:
+
+    def create_objects(self, admin):
+        category = Category.objects.create(name='Фильм', slug='movie')
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        title = Title.objects.create(
+            name='Матрица', year=1999, category=category
+        )
+        title.genre.add(genre)
+        Title.objects.create(name='Без категории', year=2000)
+        review = Review.objects.create(
+            title=title, author=admin, text='Отзыв', score=9
+        )
+        Comment.objects.create(review=review, author=admin, text='Текст')
+        titles = list(Title.objects.all())
+        for title in titles:
+            # Annotations of the leaderboards.
+            title.weighted_rating = 7.5
+            title.similarity = 0.25
+            title.trend_log_score = 0.0
+        return {
+            Category: [category],
+            Genre: [genre],
+            Title: titles,
+            Review: [review],
+            Comment: list(Comment.objects.all()),
+            type(admin): [admin],
+        }
+
+    def test_01_parity(self, admin):
+        objects = self.create_objects(admin)
+        checked = set()
+        for serializer_class in vars(api_serializers).values():
+            if not (
+                isinstance(serializer_class, type)
+                and issubclass(serializer_class, CompiledModelSerializer)
+                and serializer_class is not CompiledModelSerializer
+                and serializer_class.Meta.model in objects
+                and 'to_representation' not in vars(serializer_class)
+            ):
+                continue
+            for instance in objects[serializer_class.Meta.model]:
+                serializer = serializer_class(instance)
+                assert serializer.to_representation(instance) == (
+                    serializers.ModelSerializer.to_representation(
+                        serializer, instance
+                    )
+                ), (
+                    f'Проверьте, что `{serializer_class.__name__}` '
+                    'представляет объекты так же, как ModelSerializer.'
+                )
+            checked.add(serializer_class.__name__)
+        assert {
+            'CategorySerializer', 'GenreSerializer', 'TitleReadSerializer',
+            'TopTitleSerializer', 'TrendingTitleSerializer',
+            'ReviewSerializer', 'CommentSerializer', 'UserYamDbSerializer',
+        } <= checked
+
+    def test_02_fields_are_copied(self, admin, monkeypatch):
+        category = Category.objects.create(name='Фильм', slug='movie')
+        first = api_serializers.CategorySerializer(category)
+        first.data
+
+        def introspect(self):
+            raise AssertionError('The fields are introspected again.')
+
+        monkeypatch.setattr(
+            serializers.ModelSerializer, 'get_fields', introspect
+        )
+        second = api_serializers.CategorySerializer(category)
+        assert second.data == first.data
+        assert second.fields['name'] is not first.fields['name']
+        assert second.fields['name'].parent is second
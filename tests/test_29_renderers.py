@@ -0,0 +1,141 @@
+import datetime
+import io
+from decimal import Decimal
+from http import HTTPStatus
+
+import msgpack
+import pytest
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api.v1.renderers import OrjsonParser, OrjsonRenderer
+from reviews.models import Category, Comment, Genre, Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29Renderers:
+
+    def create_data(self, admin, user):
+        movie = Category.objects.create(name='Фильм', slug='movie')
+        drama = Genre.objects.create(name='Драма', slug='drama')
+        title = Title.objects.create(
+            name='Матрица', year=1999, category=movie,
+            description='Нео выбирает таблетку.',
+        )
+        title.genre.set([drama])
+        review = Review.objects.create(
+            title=title, author=admin, text='Отзыв', score=9
+        )
+        Comment.objects.create(review=review, author=user, text='Да')
+        return title, review
+
+    def test_01_response_parity(self, client, admin, user):
+        title, review = self.create_data(admin, user)
+        reviews_url = f'/api/v1/titles/{title.id}/reviews/'
+        for url in (
+            '/api/v1/titles/',
+            f'/api/v1/titles/{title.id}/',
+            '/api/v1/titles/top/',
+            '/api/v1/titles/trending/',
+            '/api/v1/genres/',
+            reviews_url,
+            f'{reviews_url}{review.id}/comments/',
+        ):
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            assert isinstance(response.accepted_renderer, OrjsonRenderer)
+            assert response.content == JSONRenderer().render(
+                response.data
+            ), (
+                f'Проверьте, что ответ `{url}` не изменился '
+                'с быстрым JSON-рендерером.'
+            )
+
+    def test_02_values_parity(self):
+        aware = timezone.make_aware(datetime.datetime(2021, 5, 1, 12, 30))
+        data = {
+            'dates': [
+                aware, datetime.datetime(2021, 5, 1, 12, 30, 0, 500),
+                datetime.date(2021, 5, 1), datetime.time(12, 30),
+            ],
+            'decimals': [Decimal('9.50'), Decimal('0.00001')],
+            'floats': [
+                0.1, 1e16, 1.5e-7, 2.5e-5, -0.00003, 1e300, 123456.789,
+            ],
+            'integers': [2 ** 63 - 1, -2 ** 63, 2 ** 64, 10 ** 30],
+            'text': ['Строка  ', '\x00\x1f"\\/', gettext_lazy('Да')],
+            1: 'ключ не строка',
+        }
+        for value in (data, 2.5e-5, 1e16, [], 'строка'):
+            assert OrjsonRenderer().render(value) == JSONRenderer().render(
+                value
+            ), f'Проверьте, что `{value!r}` выводится как в DRF.'
+        for value in (
+            float('nan'), {'rating': None, 'scores': [1.5, float('inf')]},
+        ):
+            results = []
+            for renderer in (JSONRenderer(), OrjsonRenderer()):
+                try:
+                    results.append(renderer.render(value))
+                except ValueError as error:
+                    results.append(str(error))
+            assert results[0] == results[1], (
+                f'Проверьте, что `{value!r}` не выводится как null.'
+            )
+
+    def test_03_indent(self, client, admin, user):
+        self.create_data(admin, user)
+        response = client.get(
+            '/api/v1/titles/', HTTP_ACCEPT='application/json; indent=4'
+        )
+        assert response.content == JSONRenderer().render(
+            response.data, 'application/json; indent=4'
+        ), 'Проверьте, что отступы в ответе работают как в DRF.'
+
+    def test_04_parser(self, user_client, admin, user):
+        title, _ = self.create_data(admin, user)
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        response = user_client.post(
+            url, data={'text': 'Ещё отзыв', 'score': 5}, format='json'
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['text'] == 'Ещё отзыв', (
+            'Проверьте, что тело JSON разбирается быстрым парсером.'
+        )
+        response = user_client.post(
+            url, data=b'{"text": ', content_type='application/json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json()['detail'].startswith('JSON parse error')
+        for body in (
+            b'{"score": 18446744073709551616, "text": "\\u2028"}',
+            b'[1.5, 1e400, -0]', b'{"a": NaN}', b'[1,', b'\xff', b'',
+        ):
+            results = []
+            for parser in (JSONParser(), OrjsonParser()):
+                try:
+                    results.append(parser.parse(io.BytesIO(body)))
+                except Exception as error:
+                    results.append((type(error), str(error)))
+            assert repr(results[0]) == repr(results[1]), (
+                f'Проверьте, что `{body!r}` разбирается как в DRF.'
+            )
+
+    def test_05_msgpack(self, admin_client, user_client, admin, user):
+        title, _ = self.create_data(admin, user)
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        response = admin_client.get(url, HTTP_ACCEPT='application/msgpack')
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'] == 'application/msgpack'
+        assert msgpack.unpackb(response.content) == admin_client.get(
+            url
+        ).json(), 'Проверьте, что MessagePack содержит те же данные.'
+        response = user_client.post(
+            url, data=msgpack.packb({'text': 'Отзыв', 'score': 5}),
+            content_type='application/msgpack',
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что тело MessagePack разбирается.'
+        )
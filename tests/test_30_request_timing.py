@@ -0,0 +1,102 @@
+import json
+import re
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Genre, Review, Title
+
+METRIC = re.compile(r'(\w+);dur=([\d.]+)(?:;desc="(\d+) queries")?')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test30RequestTiming:
+
+    def create_data(self, admin):
+        movie = Category.objects.create(name='Фильм', slug='movie')
+        drama = Genre.objects.create(name='Драма', slug='drama')
+        title = Title.objects.create(name='Матрица', year=1999, category=movie)
+        title.genre.set([drama])
+        Review.objects.create(
+            title=title, author=admin, text='Отзыв', score=9
+        )
+        return title
+
+    def get_timing(self, client, url, caplog):
+        caplog.clear()
+        with caplog.at_level('INFO', logger='api.timing'):
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        records = [
+            record for record in caplog.records
+            if record.name == 'api.timing'
+        ]
+        assert len(records) == 1, (
+            'Проверьте, что на каждый запрос пишется одна строка журнала.'
+        )
+        return response, len(queries), json.loads(records[0].getMessage())
+
+    def test_01_header(self, client, admin, caplog, settings):
+        assert not settings.DEBUG
+        title = self.create_data(admin)
+        for url in (
+            '/api/v1/titles/',
+            f'/api/v1/titles/{title.id}/',
+            f'/api/v1/titles/{title.id}/reviews/',
+        ):
+            response, count, _ = self.get_timing(client, url, caplog)
+            metrics = {
+                name: (float(duration), queries)
+                for name, duration, queries in METRIC.findall(
+                    response['Server-Timing']
+                )
+            }
+            assert set(metrics) == {'db', 'view', 'render', 'total'}, (
+                'Проверьте, что заголовок `Server-Timing` содержит время '
+                'SQL, представления, отрисовки и всего запроса.'
+            )
+            assert metrics['db'][1] == str(count), (
+                f'Проверьте, что для `{url}` посчитаны все запросы к базе.'
+            )
+            assert metrics['total'][0] >= (
+                metrics['db'][0] + metrics['view'][0]
+                + metrics['render'][0]
+            ) - 0.01
+
+    def test_02_log_line(self, client, admin, caplog, settings):
+        self.create_data(admin)
+        _, count, record = self.get_timing(client, '/api/v1/titles/', caplog)
+        assert record['method'] == 'GET'
+        assert record['path'] == '/api/v1/titles/'
+        assert record['status'] == HTTPStatus.OK
+        assert record['queries'] == count
+        for key in ('db_ms', 'view_ms', 'render_ms', 'total_ms'):
+            assert record[key] >= 0, (
+                f'Проверьте, что строка журнала содержит `{key}`.'
+            )
+        assert 'query_list' not in record, (
+            'Проверьте, что без выборки список запросов не пишется.'
+        )
+
+    def test_03_sampling(self, client, admin, caplog, settings):
+        self.create_data(admin)
+        settings.REQUEST_TIMING_SAMPLE_RATE = 1
+        _, count, record = self.get_timing(client, '/api/v1/titles/', caplog)
+        assert len(record['query_list']) == count, (
+            'Проверьте, что в выборке пишется каждый запрос.'
+        )
+        assert all(
+            query['sql'] and query['ms'] >= 0
+            and query['database'] == 'default'
+            for query in record['query_list']
+        )
+
+    def test_04_not_found(self, client):
+        response = client.get('/api/v1/titles/0/')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        assert response['Server-Timing'].startswith('db;dur='), (
+            'Проверьте, что заголовок `Server-Timing` есть и у ошибок.'
+        )